@@ -91,6 +91,22 @@ resource "azurerm_cosmosdb_account" "main" {
   tags = local.common_tags
 }
 
+# Workflow checkpoints, one item per completed step
+resource "azurerm_cosmosdb_sql_database" "multiagent" {
+  name                = "multiagent"
+  resource_group_name = azurerm_resource_group.main.name
+  account_name        = azurerm_cosmosdb_account.main.name
+}
+
+resource "azurerm_cosmosdb_sql_container" "workflow_state" {
+  name                = "workflow-state"
+  resource_group_name = azurerm_resource_group.main.name
+  account_name        = azurerm_cosmosdb_account.main.name
+  database_name       = azurerm_cosmosdb_sql_database.multiagent.name
+  partition_key_path  = "/workflow_id"
+  default_ttl         = 604800
+}
+
 # Storage Account for Functions
 resource "azurerm_storage_account" "functions" {
   name                     = "stfunc${var.environment}${local.suffix}"
@@ -259,7 +259,7 @@ show_final_instructions() {
     echo ""
     
     echo -e "${YELLOW}3. Executar agentes individuais:${NC}"
-    echo "   cd src/agents/coordinator && python3 main.py"
+    echo "   cd src && python3 -m agents.coordinator.main"
     echo ""
     
     echo -e "${BLUE}🔗 RECURSOS ÚTEIS:${NC}"
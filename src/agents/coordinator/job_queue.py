@@ -0,0 +1,168 @@
+"""
+Job Queue
+In-process async job queue with a worker pool and backpressure
+"""
+
+import math
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+class QueueFullError(Exception):
+    """Raised when the job queue has reached its maximum depth"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+@dataclass
+class Job:
+    """A unit of work submitted to the job queue"""
+    job_id: str
+    payload: Dict[str, Any]
+    status: str = "queued"
+    result: Any = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+class JobQueue:
+    """
+    Bounded async job queue processed by a fixed pool of workers
+    """
+
+    def __init__(self,
+                 handler: JobHandler,
+                 workers: int = 4,
+                 max_depth: int = 100,
+                 max_retained: int = 1000):
+        """
+        Initialize job queue
+
+        Args:
+            handler: Coroutine function that processes a job payload
+            workers: Number of concurrent workers
+            max_depth: Maximum number of queued (not yet running) jobs
+            max_retained: Maximum number of finished jobs kept for polling
+        """
+        self.handler = handler
+        self.workers = workers
+        self.max_depth = max_depth
+        self.max_retained = max_retained
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._durations: List[float] = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self):
+        """Start the worker pool on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self.workers)
+        ]
+        logger.info("Job queue started", workers=self.workers, max_depth=self.max_depth)
+
+    async def stop(self):
+        """Cancel all workers"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._loop = None
+        self._queue = None
+
+    async def submit(self, payload: Dict[str, Any], job_id: str = None) -> Job:
+        """
+        Enqueue a job
+
+        Args:
+            payload: Job input passed to the handler
+            job_id: Optional job id, generated when omitted
+
+        Returns:
+            The queued Job
+
+        Raises:
+            QueueFullError: When the queue is at its maximum depth
+        """
+        await self.start()
+        job = Job(job_id=job_id or f"job_{uuid.uuid4().hex}", payload=payload)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(self.retry_after())
+        self.jobs[job.job_id] = job
+        self._trim()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id"""
+        return self.jobs.get(job_id)
+
+    def retry_after(self) -> int:
+        """Estimated seconds until a queue slot frees up"""
+        if not self._durations:
+            return 1
+        average = sum(self._durations) / len(self._durations)
+        return max(1, math.ceil(average * (self.depth + 1) / self.workers))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and job counts by status"""
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "jobs": counts
+        }
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.result = await self.handler(job.payload)
+                job.status = "completed"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+                logger.error("Job failed", job_id=job.job_id, worker=index, error=str(e))
+            finally:
+                job.finished_at = time.time()
+                self._durations = (self._durations + [job.finished_at - job.started_at])[-100:]
+                self._queue.task_done()
+
+    def _trim(self):
+        """Forget the oldest finished jobs beyond the retention limit"""
+        excess = len(self.jobs) - self.max_retained
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.done][:excess]:
+            del self.jobs[job_id]
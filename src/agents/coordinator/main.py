@@ -1,21 +1,236 @@
 # Agente Coordenador Principal
 
-from fastapi import FastAPI
+import os
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-app = FastAPI()
+from ..shared.agent_models import AgentRole, TaskRequest, TaskResponse, to_jsonable
+from ..shared.azure_ai_foundry_client import AzureAIFoundryClient
+from ..shared.http_transport import TransportConfig
+from ..shared.single_flight import SingleFlight
+from ..shared.telemetry import configure_telemetry
+from .job_queue import JobQueue, QueueFullError
+from .work_queue import WorkQueue, Worker, create_work_queue
+from .worker import create_handlers
+
+_client: Optional[AzureAIFoundryClient] = None
+_job_queue: Optional[JobQueue] = None
+_work_queue: Optional[WorkQueue] = None
+_embedded_worker: Optional[Worker] = None
+
+def get_client() -> AzureAIFoundryClient:
+    """Shared Azure AI Foundry client, created on first use"""
+    global _client
+    if _client is None:
+        _client = AzureAIFoundryClient(
+            transport_config=TransportConfig(
+                warm_up_connections=int(os.getenv("COORDINATOR_WARM_UP_CONNECTIONS", "0"))
+            ),
+            single_flight=SingleFlight()
+        )
+    return _client
+
+async def _run_workflow(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a multiagent workflow for a queued task"""
+    result = await get_client().orchestrate_multiagent_workflow(payload)
+    return to_jsonable(result)
+
+def get_job_queue() -> JobQueue:
+    """Shared job queue, sized from COORDINATOR_WORKERS and COORDINATOR_MAX_QUEUE_DEPTH"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(
+            _run_workflow,
+            workers=int(os.getenv("COORDINATOR_WORKERS", "4")),
+            max_depth=int(os.getenv("COORDINATOR_MAX_QUEUE_DEPTH", "100"))
+        )
+    return _job_queue
+
+def get_work_queue() -> Optional[WorkQueue]:
+    """
+    Shared work queue when WORK_QUEUE_BACKEND is set, otherwise None
+
+    With a work queue, tasks are run by worker processes (see worker.py) and
+    any number of coordinator instances can accept and report on them.
+    """
+    global _work_queue
+    if _work_queue is None and os.getenv("WORK_QUEUE_BACKEND"):
+        _work_queue = create_work_queue(
+            max_depth=int(os.getenv("COORDINATOR_MAX_QUEUE_DEPTH", "100"))
+        )
+    return _work_queue
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _embedded_worker
+    # Installed globally, so the client's default telemetry exports through it
+    telemetry = configure_telemetry(service_name="coordinator", set_global=True)
+    await get_client().warm_up()
+    await get_client().start_health_probes()
+    work_queue = get_work_queue()
+    if work_queue is None:
+        await get_job_queue().start()
+    elif int(os.getenv("COORDINATOR_EMBEDDED_WORKERS", "0")) > 0:
+        # Lets a single instance run its own jobs, e.g. with the memory backend
+        _embedded_worker = Worker(work_queue, create_handlers(get_client()),
+                                  concurrency=int(os.getenv("COORDINATOR_EMBEDDED_WORKERS")))
+        await _embedded_worker.start()
+    yield
+    if _embedded_worker is not None:
+        await _embedded_worker.stop(timeout=30.0)
+        _embedded_worker = None
+    await get_job_queue().stop()
+    if work_queue is not None:
+        await work_queue.close()
+    await get_client().close()
+    telemetry.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 class Task(BaseModel):
     description: str
+    tenant_id: Optional[str] = None
+    # e.g. {"max_cost": 0.5, "on_exhausted": "downgrade"}
+    budget: Optional[Dict[str, Any]] = None
 
-@app.post("/tasks/")
-async def process_task(task: Task):
-    # TODO: Implementar a lógica de orquestração
-    print(f"Received task: {task.description}")
-    return {"status": "Task received"}
+class StreamTask(BaseModel):
+    description: str
+    agent_role: str = AgentRole.COORDINATOR.value
+    context: Optional[Dict[str, Any]] = None
 
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _find_job(task_id: str, job_queue: JobQueue, work_queue: Optional[WorkQueue]):
+    """Job or work item for a task id, 404 when unknown"""
+    job = await work_queue.get(task_id) if work_queue is not None else job_queue.get(task_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown task: {task_id}")
+    return job
+
+@app.post("/tasks/", status_code=202)
+async def process_task(task: Task,
+                       job_queue: JobQueue = Depends(get_job_queue),
+                       work_queue: Optional[WorkQueue] = Depends(get_work_queue)):
+    # The task id doubles as workflow id so logs can be correlated
+    task_id = f"task_{uuid.uuid4().hex}"
+    payload = {
+        "workflow_id": task_id,
+        "task_description": task.description,
+        "tenant_id": task.tenant_id,
+        "budget": task.budget
+    }
+    try:
+        if work_queue is not None:
+            job = await work_queue.enqueue("workflow", payload, job_id=task_id)
+        else:
+            job = await job_queue.submit(payload, job_id=task_id)
+    except QueueFullError as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "Queue full", "detail": str(e)},
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    return {"status": "Task received", "task_id": job.job_id, "status_url": f"/tasks/{job.job_id}"}
 
+@app.get("/tasks/{task_id}")
+async def get_task_status(task_id: str,
+                          job_queue: JobQueue = Depends(get_job_queue),
+                          work_queue: Optional[WorkQueue] = Depends(get_work_queue)):
+    job = await _find_job(task_id, job_queue, work_queue)
+    return {
+        "task_id": job.job_id,
+        "status": job.status,
+        "submitted_at": job.submitted_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "error": job.error,
+        "result_url": f"/tasks/{job.job_id}/result"
+    }
 
+@app.get("/tasks/{task_id}/result")
+async def get_task_result(task_id: str,
+                          job_queue: JobQueue = Depends(get_job_queue),
+                          work_queue: Optional[WorkQueue] = Depends(get_work_queue)):
+    job = await _find_job(task_id, job_queue, work_queue)
+    if not job.done:
+        return JSONResponse(
+            status_code=202,
+            content={"task_id": job.job_id, "status": job.status},
+            headers={"Retry-After": str((work_queue or job_queue).retry_after())}
+        )
+    return {"task_id": job.job_id, "status": job.status, "result": job.result, "error": job.error}
+
+@app.get("/queue")
+async def get_queue_stats(job_queue: JobQueue = Depends(get_job_queue),
+                          work_queue: Optional[WorkQueue] = Depends(get_work_queue)):
+    if work_queue is None:
+        return job_queue.stats()
+    return dict(await work_queue.stats(), depth=await work_queue.depth())
+
+@app.get("/queue/dead-letters")
+async def get_dead_letters(limit: int = 100, work_queue: Optional[WorkQueue] = Depends(get_work_queue)):
+    if work_queue is None:
+        return []
+    return [{"task_id": item.job_id, "kind": item.kind, "attempts": item.attempts,
+             "error": item.error, "finished_at": item.finished_at}
+            for item in await work_queue.dead_letters(limit)]
+
+@app.get("/health")
+async def health(client: AzureAIFoundryClient = Depends(get_client)):
+    # Liveness: the process answers; dependency state comes from the background prober
+    return await client.health_check()
+
+@app.get("/ready")
+async def ready(client: AzureAIFoundryClient = Depends(get_client)):
+    snapshot = await client.health_check()
+    if snapshot["overall_status"] == "unhealthy":
+        return JSONResponse(status_code=503, content=snapshot)
+    return snapshot
+
+@app.get("/usage")
+async def get_usage(client: AzureAIFoundryClient = Depends(get_client)):
+    return client.cost_tracker.stats()
+
+@app.get("/usage/tenants/{tenant_id}")
+async def get_tenant_usage(tenant_id: str, client: AzureAIFoundryClient = Depends(get_client)):
+    return client.cost_tracker.tenant_summary(tenant_id).to_dict()
+
+@app.post("/tasks/stream")
+async def stream_task(task: StreamTask, client: AzureAIFoundryClient = Depends(get_client)):
+    try:
+        agent_role = AgentRole(task.agent_role)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Unknown agent role: {task.agent_role}")
+
+    task_request = TaskRequest(
+        task_id=f"task_{uuid.uuid4().hex}",
+        agent_role=agent_role,
+        input_data={"description": task.description},
+        context=task.context
+    )
+
+    async def events():
+        async for item in client.execute_agent_task_stream(task_request):
+            if isinstance(item, TaskResponse):
+                yield _sse_event("done", to_jsonable(item))
+            else:
+                yield _sse_event("delta", {"delta": item})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Relative imports need the package: run from src/ as python -m agents.coordinator.main
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8000")))
@@ -0,0 +1,789 @@
+"""
+Work Queue
+Leased workflow and task jobs shared by coordinator and worker processes
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
+from dataclasses import dataclass, field, fields, asdict
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Deque
+
+import structlog
+
+from .job_queue import QueueFullError
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+WorkHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+BACKENDS = ("memory", "sqlite", "redis")
+
+@dataclass
+class WorkItem:
+    """
+    A queued job and its lease
+
+    Status moves from "queued" to "running" while a worker holds the lease,
+    then to "completed", or to "dead_letter" once its attempts are used up.
+    """
+    job_id: str
+    kind: str
+    payload: Dict[str, Any]
+    status: str = "queued"
+    attempts: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    worker_id: Optional[str] = None
+    lease_token: Optional[str] = None
+    lease_expires: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "dead_letter")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkItem":
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+def _expired_error(attempts: int) -> str:
+    return f"Lease expired after {attempts} attempt(s)"
+
+class WorkQueue:
+    """
+    Storage interface for leased jobs
+
+    ``lease`` hands a job to one worker for ``visibility_timeout`` seconds.
+    The worker acknowledges it with its result, releases it for a retry, or
+    extends the lease while it is still busy. A lease that expires makes the
+    job visible again; a job that fails or expires ``max_attempts`` times is
+    dead-lettered instead of retried.
+    """
+
+    def __init__(self, max_attempts: int = 3, max_depth: Optional[int] = None):
+        """
+        Initialize work queue
+
+        Args:
+            max_attempts: Leases per job before it is dead-lettered
+            max_depth: Maximum number of queued jobs, unbounded when None
+        """
+        self.max_attempts = max_attempts
+        self.max_depth = max_depth
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], job_id: str = None) -> WorkItem:
+        """
+        Add a job
+
+        Args:
+            kind: Job type, used by workers to pick a handler
+            payload: Job input passed to the handler
+            job_id: Optional job id, generated when omitted
+
+        Returns:
+            The queued WorkItem
+
+        Raises:
+            QueueFullError: When the queue is at its maximum depth
+        """
+        if self.max_depth is not None and await self.depth() >= self.max_depth:
+            raise QueueFullError(self.retry_after())
+        item = WorkItem(job_id=job_id or f"job_{uuid.uuid4().hex}", kind=kind, payload=payload)
+        await self._put(item)
+        return item
+
+    async def _put(self, item: WorkItem):
+        raise NotImplementedError
+
+    async def lease(self, worker_id: str, visibility_timeout: float = 60.0) -> Optional[WorkItem]:
+        """The oldest visible job, leased to ``worker_id``, or None when there is none"""
+        raise NotImplementedError
+
+    async def extend(self, item: WorkItem, visibility_timeout: float = 60.0) -> bool:
+        """Push back the lease expiry; False when the lease was lost"""
+        raise NotImplementedError
+
+    async def ack(self, item: WorkItem, result: Any = None) -> bool:
+        """Complete a leased job; False when the lease was lost"""
+        raise NotImplementedError
+
+    async def nack(self, item: WorkItem, error: str, retry: bool = True) -> bool:
+        """
+        Release a leased job after a failure
+
+        The job is queued again unless ``retry`` is False or its attempts are
+        used up, in which case it is dead-lettered. False when the lease was lost.
+        """
+        raise NotImplementedError
+
+    async def get(self, job_id: str) -> Optional[WorkItem]:
+        """Look up a job by id"""
+        raise NotImplementedError
+
+    async def depth(self) -> int:
+        """Number of queued jobs"""
+        raise NotImplementedError
+
+    async def dead_letters(self, limit: int = 100) -> List[WorkItem]:
+        """Dead-lettered jobs, oldest first"""
+        raise NotImplementedError
+
+    async def stats(self) -> Dict[str, Any]:
+        """Job counts by status"""
+        raise NotImplementedError
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before resubmitting"""
+        return 1
+
+    async def close(self):
+        """Release connections"""
+
+class InMemoryWorkQueue(WorkQueue):
+    """
+    Process-local queue, for tests and coordinators running their own workers
+
+    Queued ids and leased items are tracked apart from the job history, so
+    leasing and depth do not depend on how many jobs have finished. Only the
+    most recent ``max_retained`` finished jobs are kept for polling.
+    """
+
+    def __init__(self, max_attempts: int = 3, max_depth: Optional[int] = None,
+                 max_retained: int = 1000):
+        """
+        Initialize in-memory work queue
+
+        Args:
+            max_attempts: Leases per job before it is dead-lettered
+            max_depth: Maximum number of queued jobs, unbounded when None
+            max_retained: Maximum number of finished jobs kept for polling
+        """
+        super().__init__(max_attempts=max_attempts, max_depth=max_depth)
+        self.max_retained = max_retained
+        self._items: Dict[str, WorkItem] = {}
+        self._ready: Deque[str] = deque()
+        self._leased: Dict[str, WorkItem] = {}
+        # Finished job ids, oldest first
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+
+    async def _put(self, item: WorkItem):
+        self._items[item.job_id] = item
+        self._ready.append(item.job_id)
+
+    def _held(self, item: WorkItem) -> Optional[WorkItem]:
+        stored = self._leased.get(item.job_id)
+        if stored is None or stored.lease_token != item.lease_token:
+            return None
+        return stored
+
+    def _settle(self, stored: WorkItem, status: str, result: Any = None, error: Optional[str] = None):
+        self._leased.pop(stored.job_id, None)
+        stored.status = status
+        stored.result = result
+        stored.error = error
+        stored.lease_token = None
+        stored.lease_expires = None
+        if status == "queued":
+            return
+        stored.finished_at = time.time()
+        self._finished[stored.job_id] = None
+        while len(self._finished) > self.max_retained:
+            job_id, _ = self._finished.popitem(last=False)
+            self._items.pop(job_id, None)
+
+    async def lease(self, worker_id: str, visibility_timeout: float = 60.0) -> Optional[WorkItem]:
+        now = time.time()
+        for stored in [stored for stored in self._leased.values() if stored.lease_expires <= now]:
+            if stored.attempts >= self.max_attempts:
+                self._settle(stored, "dead_letter", error=_expired_error(stored.attempts))
+            else:
+                self._settle(stored, "queued", error=_expired_error(stored.attempts))
+                # Abandoned jobs are older than anything queued since
+                self._ready.appendleft(stored.job_id)
+        if not self._ready:
+            return None
+        stored = self._items[self._ready.popleft()]
+        stored.status = "running"
+        stored.attempts += 1
+        stored.worker_id = worker_id
+        stored.started_at = now
+        stored.lease_token = uuid.uuid4().hex
+        stored.lease_expires = now + visibility_timeout
+        self._leased[stored.job_id] = stored
+        return WorkItem.from_dict(asdict(stored))
+
+    async def extend(self, item: WorkItem, visibility_timeout: float = 60.0) -> bool:
+        stored = self._held(item)
+        if stored is None:
+            return False
+        stored.lease_expires = item.lease_expires = time.time() + visibility_timeout
+        return True
+
+    async def ack(self, item: WorkItem, result: Any = None) -> bool:
+        stored = self._held(item)
+        if stored is None:
+            return False
+        self._settle(stored, "completed", result=result)
+        return True
+
+    async def nack(self, item: WorkItem, error: str, retry: bool = True) -> bool:
+        stored = self._held(item)
+        if stored is None:
+            return False
+        if retry and stored.attempts < self.max_attempts:
+            self._settle(stored, "queued", error=error)
+            # Retries go to the back of the queue
+            self._ready.append(stored.job_id)
+        else:
+            self._settle(stored, "dead_letter", error=error)
+        return True
+
+    async def get(self, job_id: str) -> Optional[WorkItem]:
+        stored = self._items.get(job_id)
+        return WorkItem.from_dict(asdict(stored)) if stored is not None else None
+
+    async def depth(self) -> int:
+        return len(self._ready)
+
+    async def dead_letters(self, limit: int = 100) -> List[WorkItem]:
+        dead = (self._items[job_id] for job_id in self._finished
+                if self._items[job_id].status == "dead_letter")
+        return [WorkItem.from_dict(asdict(stored)) for stored in islice(dead, limit)]
+
+    async def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {"queued": len(self._ready), "running": len(self._leased)}
+        for job_id in self._finished:
+            status = self._items[job_id].status
+            counts[status] = counts.get(status, 0) + 1
+        return {"backend": "memory", "jobs": counts}
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Queue in a SQLite database file shared by processes on one host
+
+    Leases are taken inside ``BEGIN IMMEDIATE`` transactions, so concurrent
+    workers never receive the same job. Queries run in worker threads: a
+    lease waiting on another process's lock does not stall the event loop.
+    """
+
+    _COLUMNS = [f.name for f in fields(WorkItem)]
+
+    def __init__(self, path: str = None, max_attempts: int = 3, max_depth: Optional[int] = None):
+        """
+        Initialize SQLite work queue
+
+        Args:
+            path: Database file, defaults to WORK_QUEUE_PATH
+            max_attempts: Leases per job before it is dead-lettered
+            max_depth: Maximum number of queued jobs, unbounded when None
+        """
+        super().__init__(max_attempts=max_attempts, max_depth=max_depth)
+        self.path = path or os.getenv("WORK_QUEUE_PATH", "work_queue.sqlite3")
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False,
+                                           isolation_level=None, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS work_items (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                result TEXT,
+                error TEXT,
+                submitted_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                worker_id TEXT,
+                lease_token TEXT,
+                lease_expires REAL,
+                queued_at REAL NOT NULL
+            )"""
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS work_items_visible ON work_items (status, queued_at)"
+        )
+
+    def _row_to_item(self, row) -> WorkItem:
+        data = dict(zip(self._COLUMNS, row))
+        data["payload"] = json.loads(data["payload"])
+        data["result"] = json.loads(data["result"]) if data["result"] is not None else None
+        return WorkItem(**data)
+
+    def _select(self, where: str, parameters=(), suffix: str = "") -> List[WorkItem]:
+        rows = self._connection.execute(
+            f"SELECT {', '.join(self._COLUMNS)} FROM work_items WHERE {where} {suffix}", parameters
+        ).fetchall()
+        return [self._row_to_item(row) for row in rows]
+
+    async def _put(self, item: WorkItem):
+        await asyncio.to_thread(self._insert, item)
+
+    def _insert(self, item: WorkItem):
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO work_items (job_id, kind, payload, status, attempts, submitted_at, queued_at) "
+                "VALUES (?, ?, ?, ?, 0, ?, ?)",
+                (item.job_id, item.kind, json.dumps(item.payload, default=str), item.status,
+                 item.submitted_at, item.submitted_at)
+            )
+
+    async def lease(self, worker_id: str, visibility_timeout: float = 60.0) -> Optional[WorkItem]:
+        return await asyncio.to_thread(self._lease, worker_id, visibility_timeout)
+
+    def _lease(self, worker_id: str, visibility_timeout: float) -> Optional[WorkItem]:
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                for expired in self._select("status = 'running' AND lease_expires <= ?", (now,)):
+                    status = "dead_letter" if expired.attempts >= self.max_attempts else "queued"
+                    self._connection.execute(
+                        "UPDATE work_items SET status = ?, error = ?, lease_token = NULL, "
+                        "lease_expires = NULL, finished_at = ?, queued_at = ? WHERE job_id = ?",
+                        (status, _expired_error(expired.attempts),
+                         now if status == "dead_letter" else None, now, expired.job_id)
+                    )
+                visible = self._select("status = 'queued'", suffix="ORDER BY queued_at LIMIT 1")
+                if not visible:
+                    self._connection.execute("COMMIT")
+                    return None
+                item = visible[0]
+                item.status = "running"
+                item.attempts += 1
+                item.worker_id = worker_id
+                item.started_at = now
+                item.lease_token = uuid.uuid4().hex
+                item.lease_expires = now + visibility_timeout
+                self._connection.execute(
+                    "UPDATE work_items SET status = ?, attempts = ?, worker_id = ?, started_at = ?, "
+                    "lease_token = ?, lease_expires = ? WHERE job_id = ?",
+                    (item.status, item.attempts, worker_id, now,
+                     item.lease_token, item.lease_expires, item.job_id)
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return item
+
+    def _update_held(self, item: WorkItem, assignments: str, parameters) -> bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                f"UPDATE work_items SET {assignments} "
+                "WHERE job_id = ? AND status = 'running' AND lease_token = ?",
+                (*parameters, item.job_id, item.lease_token)
+            )
+        return cursor.rowcount == 1
+
+    async def _settle(self, item: WorkItem, assignments: str, parameters) -> bool:
+        return await asyncio.to_thread(self._update_held, item, assignments, parameters)
+
+    async def extend(self, item: WorkItem, visibility_timeout: float = 60.0) -> bool:
+        expires = time.time() + visibility_timeout
+        if not await self._settle(item, "lease_expires = ?", (expires,)):
+            return False
+        item.lease_expires = expires
+        return True
+
+    async def ack(self, item: WorkItem, result: Any = None) -> bool:
+        return await self._settle(
+            item,
+            "status = 'completed', result = ?, error = NULL, finished_at = ?, "
+            "lease_token = NULL, lease_expires = NULL",
+            (json.dumps(result, default=str), time.time())
+        )
+
+    async def nack(self, item: WorkItem, error: str, retry: bool = True) -> bool:
+        now = time.time()
+        if retry and item.attempts < self.max_attempts:
+            return await self._settle(
+                item,
+                "status = 'queued', error = ?, queued_at = ?, lease_token = NULL, lease_expires = NULL",
+                (error, now)
+            )
+        return await self._settle(
+            item,
+            "status = 'dead_letter', error = ?, finished_at = ?, lease_token = NULL, lease_expires = NULL",
+            (error, now)
+        )
+
+    def _query(self, sql: str, parameters=()) -> List[Any]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def _locked_select(self, where: str, parameters=(), suffix: str = "") -> List[WorkItem]:
+        with self._lock:
+            return self._select(where, parameters, suffix)
+
+    async def get(self, job_id: str) -> Optional[WorkItem]:
+        items = await asyncio.to_thread(self._locked_select, "job_id = ?", (job_id,))
+        return items[0] if items else None
+
+    async def depth(self) -> int:
+        rows = await asyncio.to_thread(self._query, "SELECT COUNT(*) FROM work_items WHERE status = 'queued'")
+        return rows[0][0]
+
+    async def dead_letters(self, limit: int = 100) -> List[WorkItem]:
+        return await asyncio.to_thread(self._locked_select, "status = 'dead_letter'", (limit,),
+                                       "ORDER BY finished_at LIMIT ?")
+
+    async def stats(self) -> Dict[str, Any]:
+        rows = await asyncio.to_thread(self._query, "SELECT status, COUNT(*) FROM work_items GROUP BY status")
+        return {"backend": "sqlite", "jobs": dict(rows)}
+
+    async def close(self):
+        with self._lock:
+            self._connection.close()
+
+# Requeues expired leases (dead-lettering exhausted ones), then leases the
+# head of the ready list. Job hashes live at <prefix>job:<id>.
+_LEASE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], id)
+    local key = ARGV[6] .. id
+    local attempts = tonumber(redis.call('HGET', key, 'attempts') or '0')
+    local error = 'Lease expired after ' .. attempts .. ' attempt(s)'
+    if attempts >= tonumber(ARGV[5]) then
+        redis.call('HSET', key, 'status', 'dead_letter', 'error', error, 'finished_at', ARGV[1], 'lease_token', '')
+        redis.call('RPUSH', KEYS[3], id)
+    else
+        redis.call('HSET', key, 'status', 'queued', 'error', error, 'lease_token', '')
+        redis.call('LPUSH', KEYS[1], id)
+    end
+end
+local id = redis.call('LPOP', KEYS[1])
+if not id then
+    return false
+end
+local key = ARGV[6] .. id
+redis.call('HINCRBY', key, 'attempts', 1)
+redis.call('HSET', key, 'status', 'running', 'worker_id', ARGV[4], 'started_at', ARGV[1],
+           'lease_token', ARGV[3], 'lease_expires', ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[2], id)
+return redis.call('HGETALL', key)
+"""
+
+# Applies an extend, ack or nack if the caller still holds the lease
+_SETTLE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'lease_token') ~= ARGV[2] or ARGV[2] == '' then
+    return 0
+end
+local action = ARGV[3]
+if action == 'extend' then
+    redis.call('HSET', KEYS[1], 'lease_expires', ARGV[4])
+    redis.call('ZADD', KEYS[2], ARGV[4], ARGV[1])
+    return 1
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+if action == 'retry' and tonumber(redis.call('HGET', KEYS[1], 'attempts')) < tonumber(ARGV[7]) then
+    redis.call('HSET', KEYS[1], 'status', 'queued', 'error', ARGV[6], 'lease_token', '')
+    redis.call('RPUSH', KEYS[3], ARGV[1])
+    return 1
+end
+local status = 'completed'
+if action ~= 'ack' then
+    status = 'dead_letter'
+    redis.call('RPUSH', KEYS[4], ARGV[1])
+end
+redis.call('HSET', KEYS[1], 'status', status, 'result', ARGV[5], 'error', ARGV[6],
+           'finished_at', ARGV[8], 'lease_token', '')
+return 1
+"""
+
+class RedisWorkQueue(WorkQueue):
+    """
+    Queue on a Redis-protocol server (Redis, Azure Cache for Redis, Valkey)
+
+    Jobs are hashes, visible job ids a list, leases a sorted set scored by
+    expiry. Leasing and settling run as Lua scripts, so they are atomic
+    across any number of coordinator and worker processes.
+    """
+
+    def __init__(self, url: str = None, prefix: str = "work:",
+                 max_attempts: int = 3, max_depth: Optional[int] = None):
+        """
+        Initialize Redis work queue
+
+        Args:
+            url: Server URL, defaults to REDIS_URL
+            prefix: Key prefix, so several queues can share a server
+            max_attempts: Leases per job before it is dead-lettered
+            max_depth: Maximum number of queued jobs, unbounded when None
+        """
+        super().__init__(max_attempts=max_attempts, max_depth=max_depth)
+        self.url = url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.prefix = prefix
+        self._ready_key = f"{prefix}ready"
+        self._leases_key = f"{prefix}leases"
+        self._dead_key = f"{prefix}dead"
+        self._redis = None
+        self._lease_script = None
+        self._settle_script = None
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}job:{job_id}"
+
+    def _get_redis(self):
+        """Connection pool and scripts, created on first use"""
+        if self._redis is None:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(self.url, decode_responses=True)
+            self._lease_script = self._redis.register_script(_LEASE_SCRIPT)
+            self._settle_script = self._redis.register_script(_SETTLE_SCRIPT)
+        return self._redis
+
+    @staticmethod
+    def _decode(data: Dict[str, str]) -> WorkItem:
+        def number(name: str, convert=float):
+            return convert(data[name]) if data.get(name) else None
+
+        return WorkItem(
+            job_id=data["job_id"],
+            kind=data["kind"],
+            payload=json.loads(data["payload"]),
+            status=data["status"],
+            attempts=int(data.get("attempts") or 0),
+            result=json.loads(data["result"]) if data.get("result") else None,
+            error=data.get("error") or None,
+            submitted_at=float(data["submitted_at"]),
+            started_at=number("started_at"),
+            finished_at=number("finished_at"),
+            worker_id=data.get("worker_id") or None,
+            lease_token=data.get("lease_token") or None,
+            lease_expires=number("lease_expires")
+        )
+
+    async def _put(self, item: WorkItem):
+        redis = self._get_redis()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(item.job_id), mapping={
+                "job_id": item.job_id,
+                "kind": item.kind,
+                "payload": json.dumps(item.payload, default=str),
+                "status": item.status,
+                "attempts": 0,
+                "submitted_at": item.submitted_at
+            })
+            pipe.rpush(self._ready_key, item.job_id)
+            await pipe.execute()
+
+    async def lease(self, worker_id: str, visibility_timeout: float = 60.0) -> Optional[WorkItem]:
+        self._get_redis()
+        now = time.time()
+        flat = await self._lease_script(
+            keys=[self._ready_key, self._leases_key, self._dead_key],
+            args=[now, now + visibility_timeout, uuid.uuid4().hex, worker_id,
+                  self.max_attempts, f"{self.prefix}job:"]
+        )
+        if not flat:
+            return None
+        return self._decode(dict(zip(flat[::2], flat[1::2])))
+
+    async def _settle(self, item: WorkItem, action: str, result: Any = None, error: str = "",
+                      expires: float = 0.0) -> bool:
+        self._get_redis()
+        settled = await self._settle_script(
+            keys=[self._job_key(item.job_id), self._leases_key, self._ready_key, self._dead_key],
+            args=[item.job_id, item.lease_token or "", action, expires,
+                  json.dumps(result, default=str), error or "", self.max_attempts, time.time()]
+        )
+        return bool(settled)
+
+    async def extend(self, item: WorkItem, visibility_timeout: float = 60.0) -> bool:
+        expires = time.time() + visibility_timeout
+        if not await self._settle(item, "extend", expires=expires):
+            return False
+        item.lease_expires = expires
+        return True
+
+    async def ack(self, item: WorkItem, result: Any = None) -> bool:
+        return await self._settle(item, "ack", result=result)
+
+    async def nack(self, item: WorkItem, error: str, retry: bool = True) -> bool:
+        return await self._settle(item, "retry" if retry else "dead_letter", error=error)
+
+    async def get(self, job_id: str) -> Optional[WorkItem]:
+        data = await self._get_redis().hgetall(self._job_key(job_id))
+        return self._decode(data) if data else None
+
+    async def depth(self) -> int:
+        return await self._get_redis().llen(self._ready_key)
+
+    async def dead_letters(self, limit: int = 100) -> List[WorkItem]:
+        job_ids = await self._get_redis().lrange(self._dead_key, 0, limit - 1)
+        items = [await self.get(job_id) for job_id in job_ids]
+        return [item for item in items if item is not None]
+
+    async def stats(self) -> Dict[str, Any]:
+        redis = self._get_redis()
+        return {
+            "backend": "redis",
+            "jobs": {
+                "queued": await redis.llen(self._ready_key),
+                "running": await redis.zcard(self._leases_key),
+                "dead_letter": await redis.llen(self._dead_key)
+            }
+        }
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+def create_work_queue(backend: str = None, **kwargs) -> WorkQueue:
+    """
+    Work queue for a backend name
+
+    Args:
+        backend: "memory", "sqlite" or "redis"; defaults to WORK_QUEUE_BACKEND, then "memory"
+        **kwargs: Passed to the backend, e.g. path, url, max_attempts
+
+    Returns:
+        The configured WorkQueue
+    """
+    backend = backend or os.getenv("WORK_QUEUE_BACKEND") or "memory"
+    kwargs.setdefault("max_attempts", int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "3")))
+    if backend == "memory":
+        return InMemoryWorkQueue(**kwargs)
+    if backend == "sqlite":
+        return SQLiteWorkQueue(**kwargs)
+    if backend == "redis":
+        return RedisWorkQueue(**kwargs)
+    raise ValueError(f"Unknown work queue backend: {backend}")
+
+class Worker:
+    """
+    Leases jobs from a work queue and runs them with per-kind handlers
+
+    The lease is extended in the background while a handler runs, so only
+    jobs whose worker died become visible again.
+    """
+
+    def __init__(self,
+                 queue: WorkQueue,
+                 handlers: Dict[str, WorkHandler],
+                 concurrency: int = 4,
+                 visibility_timeout: float = 60.0,
+                 poll_interval: float = 0.5,
+                 worker_id: str = None):
+        """
+        Initialize worker
+
+        Args:
+            queue: Queue to lease jobs from
+            handlers: Coroutine function per job kind
+            concurrency: Jobs run at the same time
+            visibility_timeout: Lease duration in seconds, renewed every third of it
+            poll_interval: Seconds to wait when the queue is empty
+            worker_id: Identifier recorded on leased jobs
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"worker_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.processed = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def _heartbeat(self, item: WorkItem):
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            if not await self.queue.extend(item, self.visibility_timeout):
+                logger.warning("Work item lease lost", job_id=item.job_id, worker_id=self.worker_id)
+                return
+
+    async def process(self, item: WorkItem):
+        """Run a leased job and settle it"""
+        handler = self.handlers.get(item.kind)
+        if handler is None:
+            self.failed += 1
+            await self.queue.nack(item, f"No handler for job kind: {item.kind}", retry=False)
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(item))
+        try:
+            result = await handler(item.payload)
+        except Exception as e:
+            self.failed += 1
+            logger.error("Work item failed", job_id=item.job_id, kind=item.kind,
+                         attempt=item.attempts, worker_id=self.worker_id, error=str(e))
+            await self.queue.nack(item, str(e))
+        else:
+            self.processed += 1
+            if not await self.queue.ack(item, result):
+                logger.warning("Work item finished after its lease expired",
+                               job_id=item.job_id, worker_id=self.worker_id)
+        finally:
+            heartbeat.cancel()
+
+    async def run_once(self) -> bool:
+        """Lease and run one job; False when the queue had none"""
+        item = await self.queue.lease(self.worker_id, self.visibility_timeout)
+        if item is None:
+            return False
+        await self.process(item)
+        return True
+
+    async def run(self):
+        """Lease and run jobs until stopped, up to ``concurrency`` at a time"""
+        slots = asyncio.Semaphore(self.concurrency)
+        running = set()
+        self._stopping = False
+        try:
+            while not self._stopping:
+                await slots.acquire()
+                try:
+                    item = await self.queue.lease(self.worker_id, self.visibility_timeout)
+                except Exception as e:
+                    logger.error("Work queue lease failed", worker_id=self.worker_id, error=str(e))
+                    item = None
+                if item is None:
+                    slots.release()
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                task = asyncio.create_task(self.process(item))
+                running.add(task)
+                task.add_done_callback(lambda done: (running.discard(done), slots.release()))
+        finally:
+            # Let leased jobs finish; anything interrupted is retried after its lease expires
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def start(self):
+        """Run in the background on the running event loop"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self.run())
+        logger.info("Worker started", worker_id=self.worker_id, concurrency=self.concurrency)
+
+    async def stop(self, timeout: float = None):
+        """Stop leasing and wait up to ``timeout`` seconds for running jobs"""
+        if self._task is None:
+            return
+        self._stopping = True
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"worker_id": self.worker_id, "processed": self.processed, "failed": self.failed}
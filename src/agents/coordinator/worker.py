@@ -0,0 +1,107 @@
+"""
+Worker
+Worker processes that drain the shared work queue
+
+Run ``python -m src.agents.coordinator.worker --processes 4`` next to one or
+more coordinators configured with the same WORK_QUEUE_BACKEND.
+"""
+
+import os
+import signal
+import asyncio
+import argparse
+import multiprocessing
+from typing import Dict, List, Optional
+
+import structlog
+
+from ..shared.agent_models import AgentRole, TaskRequest, to_jsonable
+from ..shared.azure_ai_foundry_client import AzureAIFoundryClient
+from ..shared.single_flight import SingleFlight
+from .work_queue import BACKENDS, Worker, WorkHandler, create_work_queue
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+class JobFailedError(Exception):
+    """Raised by a handler whose workflow or task reported a failure"""
+
+def create_handlers(client: AzureAIFoundryClient) -> Dict[str, WorkHandler]:
+    """
+    Job handlers backed by a client
+
+    "workflow" payloads are workflow requests; "task" payloads are TaskRequest
+    fields with ``agent_role`` as its value string. The client reports failures
+    in its results rather than raising, so the handlers raise JobFailedError
+    for them and the queue retries, then dead-letters, the job. With a state
+    store, a retried workflow resumes from its first incomplete step.
+    """
+    async def run_workflow(payload):
+        result = await client.orchestrate_multiagent_workflow(payload)
+        if result.get("status") == "failed":
+            raise JobFailedError(result.get("error")
+                                 or f"Workflow steps failed: {', '.join(result.get('failed_steps', []))}")
+        return to_jsonable(result)
+
+    async def run_task(payload):
+        task_request = TaskRequest(**dict(payload, agent_role=AgentRole(payload["agent_role"])))
+        response = await client.execute_agent_task(task_request)
+        if response.status == "error":
+            raise JobFailedError(response.error or f"Task {task_request.task_id} failed")
+        return to_jsonable(response)
+
+    return {"workflow": run_workflow, "task": run_task}
+
+async def serve(concurrency: int, visibility_timeout: float, backend: Optional[str] = None):
+    """Run one worker until SIGTERM or SIGINT"""
+    queue = create_work_queue(backend)
+    client = AzureAIFoundryClient(single_flight=SingleFlight())
+    worker = Worker(queue, create_handlers(client), concurrency=concurrency,
+                    visibility_timeout=visibility_timeout)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopped.set)
+
+    await worker.start()
+    await stopped.wait()
+    logger.info("Worker stopping", **worker.stats())
+    await worker.stop(timeout=visibility_timeout)
+    await client.close()
+    await queue.close()
+
+def _run_process(concurrency: int, visibility_timeout: float, backend: Optional[str]):
+    asyncio.run(serve(concurrency, visibility_timeout, backend))
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run work queue worker processes")
+    parser.add_argument("--processes", type=int,
+                        default=int(os.getenv("WORKER_PROCESSES", str(os.cpu_count() or 1))))
+    parser.add_argument("--concurrency", type=int,
+                        default=int(os.getenv("WORKER_CONCURRENCY", "4")))
+    parser.add_argument("--visibility-timeout", type=float,
+                        default=float(os.getenv("WORK_QUEUE_VISIBILITY_TIMEOUT", "60")))
+    parser.add_argument("--backend", choices=BACKENDS, default=None)
+    args = parser.parse_args(argv)
+
+    if args.processes <= 1:
+        _run_process(args.concurrency, args.visibility_timeout, args.backend)
+        return
+
+    # One event loop per process, so workers use every core
+    processes = [
+        multiprocessing.Process(target=_run_process,
+                                args=(args.concurrency, args.visibility_timeout, args.backend))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    # Forward SIGTERM so each worker finishes its leased jobs
+    signal.signal(signal.SIGTERM, lambda signum, frame: [process.terminate() for process in processes])
+    logger.info("Worker processes started", processes=args.processes, concurrency=args.concurrency)
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main()
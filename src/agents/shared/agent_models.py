@@ -0,0 +1,76 @@
+"""
+Agent Models
+Shared data structures for agents, task requests and task responses
+"""
+
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+
+class AgentRole(Enum):
+    """Agent roles in the multiagent system"""
+    COORDINATOR = "coordinator"
+    ANALYST = "analyst"
+    GENERATOR = "generator"
+    VALIDATOR = "validator"
+
+@dataclass
+class AgentConfig:
+    """Configuration for an AI agent"""
+    role: AgentRole
+    model: str = "gpt-4"
+    temperature: float = 0.7
+    max_tokens: int = 2000
+    system_prompt: str = ""
+    capabilities: List[str] = None
+
+@dataclass
+class TaskRequest:
+    """Request structure for agent tasks"""
+    task_id: str
+    agent_role: AgentRole
+    input_data: Dict[str, Any]
+    context: Optional[Dict[str, Any]] = None
+    priority: int = 1
+    timeout: int = 300
+    # Cost attribution and budget enforcement
+    workflow_id: Optional[str] = None
+    tenant_id: Optional[str] = None
+    model_override: Optional[str] = None
+
+@dataclass
+class TaskResponse:
+    """Response structure from agent tasks"""
+    task_id: str
+    agent_role: AgentRole
+    status: str
+    result: Dict[str, Any]
+    metadata: Dict[str, Any]
+    execution_time: float
+    error: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskResponse":
+        """Rebuild a response from its to_jsonable form"""
+        return cls(**dict(data, agent_role=AgentRole(data["agent_role"])))
+
+@dataclass
+class BatchTaskResult:
+    """Results and timing of a batch of agent tasks"""
+    responses: List[TaskResponse]
+    wall_time: float
+    max_concurrency: int
+    queue_delay_avg: float = 0.0
+    queue_delay_max: float = 0.0
+
+def to_jsonable(value: Any) -> Any:
+    """Convert dataclasses and enums into JSON-serializable structures"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return {f.name: to_jsonable(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    return value
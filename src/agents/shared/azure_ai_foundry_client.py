@@ -4,59 +4,55 @@ Advanced client for Azure AI Foundry integration with multiagent orchestration
 """
 
 import os
+import uuid
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass
-from enum import Enum
+from contextlib import nullcontext, AsyncExitStack
+from dataclasses import replace
+from functools import cached_property, partial
+from typing import Dict, List, Any, Optional, Union, AsyncIterator, Tuple, Set, Callable, Awaitable, TYPE_CHECKING
 
-from azure.identity import DefaultAzureCredential, ClientSecretCredential
-from azure.ai.ml import MLClient
-from azure.ai.textanalytics import TextAnalyticsClient
-import openai
-from openai import AsyncOpenAI
+# Azure SDK and openai imports are deferred to first use: they dominate cold-start time
 import structlog
 
+from .agent_models import AgentRole, AgentConfig, TaskRequest, TaskResponse, BatchTaskResult
+from .workflow_engine import WorkflowEngine, WorkflowNode, COMPLETED_STATUSES
+from .response_cache import ResponseCache, make_cache_key
+from .rate_limiter import RateLimiterRegistry, Reservation, parse_retry_after
+from .retry_policy import RetryPolicy, HedgingPolicy, LatencyTracker, classify_error
+from .http_transport import TransportConfig, SharedHTTPTransport
+from .context_builder import ContextBuilder
+from .prompt_renderer import PromptRenderer
+from .model_router import ModelRouter
+from .state_store import StateStore
+from .telemetry import AgentTelemetry
+from .health_prober import HealthProber, NotConfigured
+from .single_flight import SingleFlight
+from .pipeline import PipelinedWorkflow
+from .structured_output import (
+    StructuredOutput, IncrementalJSONParser, parse_role_output, coerce_fields,
+    forwarded_result, assigned_steps
+)
+from .cost_tracker import CostTracker, TokenUsage, WorkflowBudget
+
+if TYPE_CHECKING:
+    # Only callers that configure a semantic cache pay for importing numpy
+    from .semantic_cache import SemanticCache
+
 # Configure structured logging
 logger = structlog.get_logger(__name__)
 
-class AgentRole(Enum):
-    """Agent roles in the multiagent system"""
-    COORDINATOR = "coordinator"
-    ANALYST = "analyst"
-    GENERATOR = "generator"
-    VALIDATOR = "validator"
-
-@dataclass
-class AgentConfig:
-    """Configuration for an AI agent"""
-    role: AgentRole
-    model: str = "gpt-4"
-    temperature: float = 0.7
-    max_tokens: int = 2000
-    system_prompt: str = ""
-    capabilities: List[str] = None
+# One attempt at a chat completion: (task_request, agent_config, messages, call_stats) -> (response, reservation)
+CompletionSender = Callable[[TaskRequest, AgentConfig, List[Dict[str, str]], Dict[str, Any]],
+                            Awaitable[Tuple[Any, Optional[Reservation]]]]
 
-@dataclass
-class TaskRequest:
-    """Request structure for agent tasks"""
-    task_id: str
-    agent_role: AgentRole
-    input_data: Dict[str, Any]
-    context: Optional[Dict[str, Any]] = None
-    priority: int = 1
-    timeout: int = 300
+# Azure OpenAI API version, and the first one that accepts stream_options
+AZURE_OPENAI_API_VERSION = "2024-02-15-preview"
+STREAM_USAGE_API_VERSION = "2024-09-01-preview"
 
-@dataclass
-class TaskResponse:
-    """Response structure from agent tasks"""
-    task_id: str
-    agent_role: AgentRole
-    status: str
-    result: Dict[str, Any]
-    metadata: Dict[str, Any]
-    execution_time: float
-    error: Optional[str] = None
+# Token scope and API version of the Text Analytics health probe
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+TEXT_ANALYTICS_API_VERSION = "2023-04-01"
 
 class AzureAIFoundryClient:
     """
@@ -68,7 +64,23 @@ class AzureAIFoundryClient:
                  resource_group: str = None,
                  workspace_name: str = None,
                  openai_endpoint: str = None,
-                 openai_api_key: str = None):
+                 openai_api_key: str = None,
+                 openai_base_url: str = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiterRegistry] = None,
+                 retry_policies: Optional[Dict[AgentRole, RetryPolicy]] = None,
+                 hedging_policies: Optional[Dict[AgentRole, HedgingPolicy]] = None,
+                 transport_config: Optional[TransportConfig] = None,
+                 context_builder: Optional[ContextBuilder] = None,
+                 cost_tracker: Optional[CostTracker] = None,
+                 prompt_renderer: Optional[PromptRenderer] = None,
+                 model_router: Optional[ModelRouter] = None,
+                 semantic_cache: Optional["SemanticCache"] = None,
+                 state_store: Optional[StateStore] = None,
+                 telemetry: Optional[AgentTelemetry] = None,
+                 structured_output: Optional[StructuredOutput] = None,
+                 health_prober: Optional[HealthProber] = None,
+                 single_flight: Optional[SingleFlight] = None):
         """
         Initialize Azure AI Foundry client
         
@@ -78,42 +90,115 @@ class AzureAIFoundryClient:
             workspace_name: ML workspace name
             openai_endpoint: Azure OpenAI endpoint
             openai_api_key: Azure OpenAI API key
+            openai_base_url: OpenAI-compatible base URL, e.g. the stand-in server in tests/local_openai_server.py
+            response_cache: Optional cache for repeated low-temperature requests
+            rate_limiter: Optional client-side rate limiting per deployment and model
+            retry_policies: Retry policy per role; defaults to RetryPolicy() for every role
+            hedging_policies: Optional request hedging policy per role
+            transport_config: Connection pool settings shared by all sub-clients
+            context_builder: Compacts context and input to each role's prompt budget
+            cost_tracker: Token and cost accounting per workflow and tenant
+            prompt_renderer: Deterministic prompt rendering for prefix caching
+            model_router: Optional routing of tasks across tiered deployments
+            semantic_cache: Optional cache serving responses to similar requests
+            state_store: Optional workflow checkpoint store for resuming workflows
+            telemetry: OpenTelemetry spans and metrics; the global providers by default
+            structured_output: Optional JSON mode with a schema per role
+            health_prober: Background dependency prober behind health_check();
+                probes every HEALTH_PROBE_INTERVAL seconds by default
+            single_flight: Optional coalescing of identical in-flight requests
         """
         self.subscription_id = subscription_id or os.getenv("AZURE_SUBSCRIPTION_ID")
         self.resource_group = resource_group or os.getenv("AZURE_RESOURCE_GROUP")
         self.workspace_name = workspace_name or os.getenv("AZURE_ML_WORKSPACE_NAME")
         
-        # Initialize credentials
-        self.credential = self._get_credential()
+        # Credentials and sub-clients are created on first access
+        self.openai_endpoint = openai_endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
+        self._openai_api_key = openai_api_key
+        self.openai_base_url = openai_base_url or os.getenv("OPENAI_BASE_URL")
+        self.openai_api_version = os.getenv("AZURE_OPENAI_API_VERSION", AZURE_OPENAI_API_VERSION)
         
-        # Initialize ML client
-        try:
-            self.ml_client = MLClient(
-                credential=self.credential,
-                subscription_id=self.subscription_id,
-                resource_group_name=self.resource_group,
-                workspace_name=self.workspace_name
-            )
-        except Exception as e:
-            logger.warning("ML Client initialization failed", error=str(e))
-            self.ml_client = None
+        # Agent configurations, with JSON output instructions when enabled
+        self.structured_output = structured_output
+        self.agent_configs = self._load_agent_configurations()
+        if structured_output:
+            self.agent_configs = {role: structured_output.apply(config)
+                                  for role, config in self.agent_configs.items()}
         
-        # Initialize OpenAI client
-        self.openai_client = self._initialize_openai_client(openai_endpoint, openai_api_key)
+        # Optional response cache in front of chat completions
+        self.response_cache = response_cache
         
-        # Initialize Text Analytics client
-        self.text_analytics_client = self._initialize_text_analytics_client()
+        # Optional client-side rate limiting per deployment and model
+        self.rate_limiter = rate_limiter
         
-        # Agent configurations
-        self.agent_configs = self._load_agent_configurations()
+        # Retries and request hedging per role
+        if retry_policies is None:
+            retry_policies = {role: RetryPolicy() for role in AgentRole}
+        self.retry_policies = retry_policies
+        self.hedging_policies = hedging_policies or {}
+        self.latency_tracker = LatencyTracker()
+        
+        # One pooled transport shared by every sub-client
+        self.transport = SharedHTTPTransport(transport_config,
+                                             max_connections_hint=self._pool_size_hint())
+        
+        # Token-budget-aware compaction of chained agent prompts
+        self.context_builder = context_builder or ContextBuilder()
+        self.prompt_renderer = prompt_renderer or PromptRenderer()
+        
+        # Token and cost accounting
+        self.cost_tracker = cost_tracker or CostTracker()
+        
+        # Optional per-task choice of deployment tier
+        self.model_router = model_router
+        
+        # Optional similarity-based cache behind the exact-match response cache
+        self.semantic_cache = semantic_cache
+        
+        # Optional step-level checkpoints of workflows
+        self.state_store = state_store
+        
+        # Spans per workflow and task, latency and token histograms
+        self.telemetry = telemetry or AgentTelemetry()
+        
+        # Optional sharing of one upstream call among identical concurrent requests
+        self.single_flight = single_flight
+        
+        # Dependency health is probed in the background and served from a snapshot
+        self.health_prober = health_prober or HealthProber(
+            self._health_probes(),
+            interval=float(os.getenv("HEALTH_PROBE_INTERVAL", "30"))
+        )
         
         logger.info("Azure AI Foundry client initialized", 
                    subscription_id=self.subscription_id,
                    resource_group=self.resource_group,
                    workspace_name=self.workspace_name)
     
+    @cached_property
+    def credential(self):
+        """Azure credential, created on first use"""
+        return self._get_credential()
+    
+    @cached_property
+    def ml_client(self):
+        """Azure ML client, created on first use"""
+        return self._initialize_ml_client()
+    
+    @cached_property
+    def openai_client(self):
+        """OpenAI client, created on first use"""
+        return self._initialize_openai_client(self.openai_endpoint, self._openai_api_key)
+    
+    @cached_property
+    def text_analytics_client(self):
+        """Text Analytics client, created on first use"""
+        return self._initialize_text_analytics_client()
+    
     def _get_credential(self):
         """Get Azure credential based on environment"""
+        from azure.identity import DefaultAzureCredential, ClientSecretCredential
+        
         client_id = os.getenv("AZURE_CLIENT_ID")
         client_secret = os.getenv("AZURE_CLIENT_SECRET")
         tenant_id = os.getenv("AZURE_TENANT_ID")
@@ -127,22 +212,51 @@ class AzureAIFoundryClient:
         else:
             return DefaultAzureCredential()
     
+    def _initialize_ml_client(self):
+        """Initialize Azure ML client"""
+        try:
+            from azure.ai.ml import MLClient
+            
+            return MLClient(
+                credential=self.credential,
+                subscription_id=self.subscription_id,
+                resource_group_name=self.resource_group,
+                workspace_name=self.workspace_name,
+                transport=self.transport.azure_transport()
+            )
+        except Exception as e:
+            logger.warning("ML Client initialization failed", error=str(e))
+            return None
+    
     def _initialize_openai_client(self, endpoint: str = None, api_key: str = None):
         """Initialize Azure OpenAI client"""
         endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
         api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
         
+        # Retries are handled by the role's RetryPolicy, so the SDK must not retry on its own
         if endpoint and api_key:
-            return AsyncOpenAI(
+            from openai import AsyncAzureOpenAI
+            
+            return AsyncAzureOpenAI(
                 api_key=api_key,
-                base_url=f"{endpoint}/openai/deployments",
-                api_version="2024-02-15-preview"
+                azure_endpoint=endpoint,
+                api_version=self.openai_api_version,
+                http_client=self.transport.async_client,
+                max_retries=0
             )
         else:
-            # Fallback to standard OpenAI
+            # Fallback to standard OpenAI or an OpenAI-compatible server
             api_key = os.getenv("OPENAI_API_KEY")
-            if api_key:
-                return AsyncOpenAI(api_key=api_key)
+            if api_key or self.openai_base_url:
+                from openai import AsyncOpenAI
+                
+                return AsyncOpenAI(
+                    # A local server accepts any key, but the SDK requires one
+                    api_key=api_key or "local",
+                    base_url=self.openai_base_url,
+                    http_client=self.transport.async_client,
+                    max_retries=0
+                )
             else:
                 logger.warning("No OpenAI API key found")
                 return None
@@ -152,14 +266,59 @@ class AzureAIFoundryClient:
         endpoint = os.getenv("AZURE_TEXT_ANALYTICS_ENDPOINT")
         if endpoint:
             try:
+                from azure.ai.textanalytics import TextAnalyticsClient
+                
                 return TextAnalyticsClient(
                     endpoint=endpoint,
-                    credential=self.credential
+                    credential=self.credential,
+                    transport=self.transport.azure_transport()
                 )
             except Exception as e:
                 logger.warning("Text Analytics client initialization failed", error=str(e))
         return None
     
+    def _pool_size_hint(self) -> Optional[int]:
+        """Connection pool size matching the rate limiter's concurrency, plus hedged duplicates"""
+        if self.rate_limiter is None:
+            return None
+        max_hedges = max((policy.max_hedges for policy in self.hedging_policies.values()
+                          if policy.enabled), default=0)
+        return self.rate_limiter.max_concurrency() * (1 + max_hedges)
+    
+    async def warm_up(self, connections: int = None) -> int:
+        """
+        Open connections to the OpenAI endpoint ahead of traffic
+        
+        Args:
+            connections: Number of connections, defaults to TransportConfig.warm_up_connections
+            
+        Returns:
+            Number of connections opened
+        """
+        if not self.openai_client:
+            return 0
+        return await self.transport.warm_up(str(self.openai_client.base_url), connections)
+    
+    def transport_metrics(self) -> Dict[str, Any]:
+        """Connection pool size, pool wait time and new-connection counts"""
+        return self.transport.stats()
+    
+    def _completion_endpoint(self) -> Optional[str]:
+        """Base URL of the OpenAI client, the target of dependency spans"""
+        base_url = getattr(self.openai_client, "base_url", None)
+        return str(base_url) if base_url else None
+    
+    async def close(self):
+        """Close the shared connection pools, persist the semantic cache and flush telemetry"""
+        if self.semantic_cache:
+            self.semantic_cache.flush()
+        await self.health_prober.stop()
+        self.telemetry.shutdown()
+        await self.transport.aclose()
+        # Sub-clients bound to the closed pools are rebuilt on next use
+        for name in ("openai_client", "ml_client", "text_analytics_client"):
+            self.__dict__.pop(name, None)
+    
     def _load_agent_configurations(self) -> Dict[AgentRole, AgentConfig]:
         """Load agent configurations"""
         return {
@@ -216,7 +375,15 @@ class AzureAIFoundryClient:
         Returns:
             TaskResponse with results and metadata
         """
+        with self.telemetry.task_span(task_request) as span:
+            response = await self._execute_agent_task(task_request)
+            self.telemetry.finish_task(span, response)
+            return response
+    
+    async def _execute_agent_task(self, task_request: TaskRequest) -> TaskResponse:
+        """Execute a task within the task span"""
         start_time = asyncio.get_event_loop().time()
+        call_stats = {"attempts": 0, "retries": 0, "hedged": False, "hedge_won": False}
         
         try:
             logger.info("Executing agent task", 
@@ -224,34 +391,88 @@ class AzureAIFoundryClient:
                        agent_role=task_request.agent_role.value)
             
             # Get agent configuration
-            agent_config = self.agent_configs[task_request.agent_role]
+            agent_config = self._agent_config_for(task_request)
             
             # Prepare messages for OpenAI
-            messages = [
-                {"role": "system", "content": agent_config.system_prompt}
-            ]
-            
-            # Add context if provided
-            if task_request.context:
-                context_msg = f"Context: {task_request.context}"
-                messages.append({"role": "user", "content": context_msg})
-            
-            # Add main task input
-            task_content = self._format_task_input(task_request.input_data)
-            messages.append({"role": "user", "content": task_content})
+            with self.telemetry.span("prompt-render", agent_id=task_request.agent_role.value):
+                messages = self._build_messages(task_request, agent_config)
             
             # Execute with OpenAI
             if self.openai_client:
-                response = await self.openai_client.chat.completions.create(
-                    model=agent_config.model,
-                    messages=messages,
-                    temperature=agent_config.temperature,
-                    max_tokens=agent_config.max_tokens,
-                    timeout=task_request.timeout
-                )
+                # Serve repeated low-temperature requests from the response cache
+                cache_key = None
+                if self.response_cache and self.response_cache.is_cacheable(agent_config):
+                    cache_key = make_cache_key(agent_config, messages)
+                    cached = self.response_cache.get(cache_key)
+                    if cached is not None:
+                        execution_time = asyncio.get_event_loop().time() - start_time
+                        
+                        logger.info("Agent task served from cache",
+                                   task_id=task_request.task_id,
+                                   agent_role=task_request.agent_role.value)
+                        
+                        metadata = dict(cached["metadata"], tokens_used=0)
+                        metadata.update(self._record_usage(task_request, agent_config.model, TokenUsage()))
+                        metadata["cache"] = dict(self.response_cache.stats(), hit=True)
+                        return TaskResponse(
+                            task_id=task_request.task_id,
+                            agent_role=task_request.agent_role,
+                            status="success",
+                            result=cached["result"],
+                            metadata=metadata,
+                            execution_time=execution_time
+                        )
+                
+                # Serve paraphrases of earlier requests from the semantic cache
+                semantic_scope = None
+                if self.semantic_cache and self.semantic_cache.enabled_for(task_request.agent_role):
+                    semantic_scope = make_cache_key(agent_config, [])
+                    semantic_text = messages[-1]["content"]
+                    match = self.semantic_cache.lookup(semantic_scope, task_request.agent_role, semantic_text)
+                    if match is not None:
+                        cached, similarity = match
+                        execution_time = asyncio.get_event_loop().time() - start_time
+                        
+                        logger.info("Agent task served from semantic cache",
+                                   task_id=task_request.task_id,
+                                   agent_role=task_request.agent_role.value,
+                                   similarity=similarity)
+                        
+                        metadata = dict(cached["metadata"], tokens_used=0)
+                        metadata.update(self._record_usage(task_request, agent_config.model, TokenUsage()))
+                        metadata["semantic_cache"] = dict(self.semantic_cache.stats(), hit=True,
+                                                          similarity=similarity)
+                        return TaskResponse(
+                            task_id=task_request.task_id,
+                            agent_role=task_request.agent_role,
+                            status="success",
+                            result=cached["result"],
+                            metadata=metadata,
+                            execution_time=execution_time
+                        )
+                
+                with self.telemetry.dependency_span(task_request, agent_config,
+                                                    self._completion_endpoint()) as dependency:
+                    call = partial(self._complete_routed, task_request, agent_config, messages, call_stats)
+                    coalesced = False
+                    if self.single_flight and self.single_flight.is_coalescable(agent_config):
+                        # Identical requests already in flight share their upstream call
+                        flight_key = cache_key or make_cache_key(agent_config, messages)
+                        (response, reservation, agent_config), coalesced = await self.single_flight.run(
+                            flight_key, call
+                        )
+                    else:
+                        response, reservation, agent_config = await call()
+                    dependency.set_attributes({
+                        "model_used": agent_config.model,
+                        "tokens_used": response.usage.total_tokens if response.usage else 0,
+                        "attempts": call_stats["attempts"],
+                        "coalesced": coalesced
+                    })
                 
                 # Process response
-                result = self._process_agent_response(response, task_request.agent_role)
+                with self.telemetry.span("response-process", agent_id=task_request.agent_role.value):
+                    result = self._process_agent_response(response, task_request.agent_role)
                 
                 execution_time = asyncio.get_event_loop().time() - start_time
                 
@@ -260,17 +481,42 @@ class AzureAIFoundryClient:
                            agent_role=task_request.agent_role.value,
                            execution_time=execution_time)
                 
+                metadata = {
+                    "model": agent_config.model,
+                    "temperature": agent_config.temperature,
+                    "tokens_used": response.usage.total_tokens if response.usage else 0,
+                    "capabilities": agent_config.capabilities
+                }
+                
+                if coalesced:
+                    # The call that served this task was paid for by the task that started it
+                    metadata["tokens_used"] = 0
+                    metadata.update(self._record_usage(task_request, agent_config.model, TokenUsage()))
+                else:
+                    metadata.update(self._record_usage(task_request, agent_config.model,
+                                                       TokenUsage.from_openai(response.usage)))
+                    metadata.update(call_stats)
+                    if reservation:
+                        metadata["rate_limit_wait"] = reservation.wait_time
+                if self.single_flight:
+                    metadata["single_flight"] = dict(self.single_flight.stats(), coalesced=coalesced)
+                
+                if semantic_scope:
+                    self.semantic_cache.store(semantic_scope, semantic_text,
+                                              {"result": result, "metadata": dict(metadata)})
+                    metadata["semantic_cache"] = dict(self.semantic_cache.stats(), hit=False)
+                
+                if cache_key:
+                    self.response_cache.set(cache_key, task_request.agent_role,
+                                            {"result": result, "metadata": metadata})
+                    metadata["cache"] = dict(self.response_cache.stats(), hit=False)
+                
                 return TaskResponse(
                     task_id=task_request.task_id,
                     agent_role=task_request.agent_role,
                     status="success",
                     result=result,
-                    metadata={
-                        "model": agent_config.model,
-                        "temperature": agent_config.temperature,
-                        "tokens_used": response.usage.total_tokens if response.usage else 0,
-                        "capabilities": agent_config.capabilities
-                    },
+                    metadata=metadata,
                     execution_time=execution_time
                 )
             else:
@@ -278,15 +524,21 @@ class AzureAIFoundryClient:
                 result = self._simulate_agent_response(task_request.agent_role, task_request.input_data)
                 execution_time = asyncio.get_event_loop().time() - start_time
                 
+                usage = self._estimate_usage(messages, result["content"])
+                metadata = {
+                    "model": "simulation",
+                    "tokens_used": usage.total_tokens,
+                    "usage_estimated": True,
+                    "capabilities": agent_config.capabilities
+                }
+                metadata.update(self._record_usage(task_request, "simulation", usage))
+                
                 return TaskResponse(
                     task_id=task_request.task_id,
                     agent_role=task_request.agent_role,
                     status="simulated",
                     result=result,
-                    metadata={
-                        "model": "simulation",
-                        "capabilities": agent_config.capabilities
-                    },
+                    metadata=metadata,
                     execution_time=execution_time
                 )
             
@@ -304,25 +556,551 @@ class AzureAIFoundryClient:
                 agent_role=task_request.agent_role,
                 status="error",
                 result={},
-                metadata={},
+                metadata=dict(call_stats) if call_stats["attempts"] else {},
                 execution_time=execution_time,
                 error=str(e)
             )
     
-    def _format_task_input(self, input_data: Dict[str, Any]) -> str:
-        """Format task input data for agent processing"""
-        if isinstance(input_data, dict):
-            formatted_parts = []
-            for key, value in input_data.items():
-                formatted_parts.append(f"{key}: {value}")
-            return "\n".join(formatted_parts)
-        else:
-            return str(input_data)
+    async def execute_agent_task_stream(
+            self, task_request: TaskRequest) -> AsyncIterator[Union[str, TaskResponse]]:
+        """
+        Execute a task and stream the completion while it is generated
+        
+        Opening the stream is retried and falls back through model tiers like
+        a regular completion, but is never hedged. A failure after the first
+        delta ends the task with an error response, since deltas already
+        yielded cannot be taken back.
+        
+        Args:
+            task_request: Task request with agent role and input data
+            
+        Yields:
+            Text deltas as they arrive, then a final TaskResponse with usage
+            and timing (including time-to-first-token)
+        """
+        # The span is not made current: a context cannot stay attached across yields
+        span = self.telemetry.start_task_span(task_request)
+        try:
+            async for item in self._execute_agent_task_stream(task_request):
+                if isinstance(item, TaskResponse):
+                    self.telemetry.finish_task(span, item)
+                yield item
+        finally:
+            span.end()
+    
+    async def _execute_agent_task_stream(
+            self, task_request: TaskRequest) -> AsyncIterator[Union[str, TaskResponse]]:
+        """Stream a task within the task span"""
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        first_token_time = None
+        call_stats = {"attempts": 0, "retries": 0, "hedged": False, "hedge_won": False}
+        
+        try:
+            logger.info("Streaming agent task",
+                       task_id=task_request.task_id,
+                       agent_role=task_request.agent_role.value)
+            
+            agent_config = self._agent_config_for(task_request)
+            messages = self._build_messages(task_request, agent_config)
+            
+            if self.openai_client:
+                # Opening the stream is retried and falls back through tiers like a
+                # completion; once the first delta is out, a failure ends the task
+                (stream, stream_scope), reservation, agent_config = await self._complete_routed(
+                    task_request, agent_config, messages, call_stats, send=self._open_stream
+                )
+                
+                deltas = []
+                usage = None
+                parser = IncrementalJSONParser() if self.structured_output else None
+                first_field_time = None
+                async with stream_scope:
+                    async for chunk in stream:
+                        if getattr(chunk, "usage", None):
+                            usage = chunk.usage
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            if first_token_time is None:
+                                first_token_time = loop.time()
+                            deltas.append(delta)
+                            if parser is not None and parser.feed(delta) and first_field_time is None:
+                                first_field_time = loop.time()
+                            yield delta
+                    
+                    if reservation and usage:
+                        reservation.actual_tokens = usage.total_tokens
+                
+                result = self._process_agent_content(
+                    "".join(deltas), task_request.agent_role,
+                    parser.fields if parser is not None and parser.complete else None
+                )
+                status = "success"
+                if usage:
+                    token_usage = TokenUsage.from_openai(usage)
+                else:
+                    # Without a usage chunk, each content chunk counts as one token
+                    token_usage = self._estimate_usage(messages, None)
+                    token_usage.completion_tokens = len(deltas)
+                metadata = {
+                    "model": agent_config.model,
+                    "temperature": agent_config.temperature,
+                    "tokens_used": token_usage.total_tokens,
+                    "usage_estimated": usage is None,
+                    "capabilities": agent_config.capabilities
+                }
+                metadata.update(self._record_usage(task_request, agent_config.model, token_usage))
+                metadata.update(call_stats)
+                if reservation:
+                    metadata["rate_limit_wait"] = reservation.wait_time
+                if first_field_time is not None:
+                    metadata["time_to_first_field"] = first_field_time - start_time
+            else:
+                # Fallback simulation streams the simulated content word by word
+                result = self._simulate_agent_response(task_request.agent_role, task_request.input_data)
+                words = result["content"].split(" ")
+                for index, word in enumerate(words):
+                    if first_token_time is None:
+                        first_token_time = loop.time()
+                    yield word if index == len(words) - 1 else f"{word} "
+                status = "simulated"
+                usage = self._estimate_usage(messages, result["content"])
+                metadata = {
+                    "model": "simulation",
+                    "tokens_used": usage.total_tokens,
+                    "usage_estimated": True,
+                    "capabilities": agent_config.capabilities
+                }
+                metadata.update(self._record_usage(task_request, "simulation", usage))
+            
+            execution_time = loop.time() - start_time
+            metadata["streamed"] = True
+            metadata["time_to_first_token"] = (
+                first_token_time - start_time if first_token_time is not None else None
+            )
+            
+            logger.info("Streamed agent task completed",
+                       task_id=task_request.task_id,
+                       agent_role=task_request.agent_role.value,
+                       time_to_first_token=metadata["time_to_first_token"],
+                       execution_time=execution_time)
+            
+            yield TaskResponse(
+                task_id=task_request.task_id,
+                agent_role=task_request.agent_role,
+                status=status,
+                result=result,
+                metadata=metadata,
+                execution_time=execution_time
+            )
+            
+        except Exception as e:
+            execution_time = loop.time() - start_time
+            
+            logger.error("Streamed agent task failed",
+                        task_id=task_request.task_id,
+                        agent_role=task_request.agent_role.value,
+                        error=str(e),
+                        execution_time=execution_time)
+            
+            yield TaskResponse(
+                task_id=task_request.task_id,
+                agent_role=task_request.agent_role,
+                status="error",
+                result={},
+                metadata=dict(call_stats) if call_stats["attempts"] else {},
+                execution_time=execution_time,
+                error=str(e)
+            )
+    
+    async def execute_agent_tasks(self,
+                                  task_requests: List[TaskRequest],
+                                  max_concurrency: int = 8) -> BatchTaskResult:
+        """
+        Execute a batch of tasks with bounded concurrency
+        
+        Tasks are dispatched in priority order (lower ``priority`` first), but
+        responses are returned in input order.
+        
+        Args:
+            task_requests: Tasks to execute
+            max_concurrency: Maximum number of tasks in flight at once
+            
+        Returns:
+            BatchTaskResult with responses, wall time and queueing delay
+        """
+        start_time = asyncio.get_event_loop().time()
+        responses: List[Optional[TaskResponse]] = [None] * len(task_requests)
+        
+        async for index, response in self._dispatch_by_priority(task_requests, max_concurrency):
+            responses[index] = response
+        
+        wall_time = asyncio.get_event_loop().time() - start_time
+        queue_delays = [response.metadata.get("queue_delay", 0.0) for response in responses]
+        
+        result = BatchTaskResult(
+            responses=responses,
+            wall_time=wall_time,
+            max_concurrency=max_concurrency,
+            queue_delay_avg=sum(queue_delays) / len(queue_delays) if queue_delays else 0.0,
+            queue_delay_max=max(queue_delays, default=0.0)
+        )
+        
+        logger.info("Agent task batch completed",
+                   tasks=len(task_requests),
+                   max_concurrency=max_concurrency,
+                   wall_time=wall_time,
+                   queue_delay_avg=result.queue_delay_avg,
+                   queue_delay_max=result.queue_delay_max)
+        
+        return result
+    
+    async def execute_agent_tasks_as_completed(
+            self,
+            task_requests: List[TaskRequest],
+            max_concurrency: int = 8,
+            semaphore: Optional[asyncio.Semaphore] = None) -> AsyncIterator[Tuple[int, TaskResponse]]:
+        """
+        Execute a batch of tasks with bounded concurrency, yielding responses as they complete
+        
+        Args:
+            task_requests: Tasks to execute
+            max_concurrency: Maximum number of tasks in flight at once
+            semaphore: Optional limit shared with other batches, used instead
+                of max_concurrency
+            
+        Yields:
+            (index in task_requests, TaskResponse) pairs in completion order;
+            the index tells apart tasks that share a task_id
+        """
+        async for index, response in self._dispatch_by_priority(task_requests, max_concurrency, semaphore):
+            yield index, response
+    
+    async def _dispatch_by_priority(self,
+                                    task_requests: List[TaskRequest],
+                                    max_concurrency: int,
+                                    semaphore: Optional[asyncio.Semaphore] = None) -> AsyncIterator[Tuple[int, TaskResponse]]:
+        """Dispatch tasks from a priority queue through a semaphore, yielding (index, response)"""
+        if semaphore is None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        loop = asyncio.get_event_loop()
+        submitted_at = loop.time()
+        
+        pending: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        for index, task_request in enumerate(task_requests):
+            pending.put_nowait((task_request.priority, index, task_request))
+        
+        semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+        completed: asyncio.Queue = asyncio.Queue()
+        
+        async def run(index: int, task_request: TaskRequest):
+            queue_delay = loop.time() - submitted_at
+            response = await self.execute_agent_task(task_request)
+            response.metadata["queue_delay"] = queue_delay
+            await completed.put((index, response))
+        
+        async def dispatch():
+            while not pending.empty():
+                await semaphore.acquire()
+                _, index, task_request = pending.get_nowait()
+                task = asyncio.create_task(run(index, task_request))
+                # Released on completion or cancellation, even before the task starts,
+                # so a shared semaphore never leaks a slot
+                task.add_done_callback(lambda _: semaphore.release())
+                in_flight.append(task)
+        
+        in_flight: List[asyncio.Task] = []
+        dispatcher = asyncio.create_task(dispatch())
+        
+        try:
+            for _ in range(len(task_requests)):
+                yield await completed.get()
+        finally:
+            dispatcher.cancel()
+            for task in in_flight:
+                task.cancel()
+    
+    async def _complete_routed(self,
+                               task_request: TaskRequest,
+                               agent_config: AgentConfig,
+                               messages: List[Dict[str, str]],
+                               call_stats: Dict[str, Any],
+                               send: Optional[CompletionSender] = None) -> Tuple[Any, Optional[Reservation], AgentConfig]:
+        """
+        Send a chat completion on the tier chosen by the model router
+        
+        Throttled tiers fall back to the next candidate immediately; other
+        transient errors are retried per the retry policy before falling back.
+        ``send`` makes one attempt, a hedged completion by default.
+        
+        Returns:
+            Response, rate limiter reservation and the agent configuration actually used
+        """
+        if self.model_router is None or task_request.model_override:
+            response, reservation = await self._complete_with_retries(
+                task_request, agent_config, messages, call_stats, send=send
+            )
+            return response, reservation, agent_config
+        
+        loop = asyncio.get_event_loop()
+        prompt_tokens = self._estimate_usage(messages, None).prompt_tokens
+        candidates = self.model_router.route(task_request.agent_role, prompt_tokens)
+        call_stats["fallbacks"] = 0
+        
+        for index, tier in enumerate(candidates):
+            routed_config = replace(agent_config, model=tier.model)
+            has_fallback = index < len(candidates) - 1
+            start = loop.time()
+            try:
+                response, reservation = await self._complete_with_retries(
+                    task_request, routed_config, messages, call_stats,
+                    fail_fast={"rate_limit"} if has_fallback else None, send=send
+                )
+            except Exception as e:
+                error_class = classify_error(e)
+                if not has_fallback or error_class == "client":
+                    raise
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                self.model_router.record_failure(tier, error_class, parse_retry_after(headers))
+                call_stats["fallbacks"] += 1
+                continue
+            
+            self.model_router.record_success(tier, loop.time() - start)
+            call_stats["tier"] = tier.name
+            return response, reservation, routed_config
+    
+    async def _complete_with_retries(self,
+                                     task_request: TaskRequest,
+                                     agent_config: AgentConfig,
+                                     messages: List[Dict[str, str]],
+                                     call_stats: Dict[str, Any],
+                                     fail_fast: Optional[Set[str]] = None,
+                                     send: Optional[CompletionSender] = None) -> Tuple[Any, Optional[Reservation]]:
+        """
+        Send a chat completion, retrying transient failures per the role's retry policy
+        
+        Error classes in ``fail_fast`` are raised without retrying, e.g. when a
+        fallback deployment can take the request instead.
+        """
+        policy = self.retry_policies.get(task_request.agent_role)
+        send = send or self._hedged_completion
+        
+        attempt = 0
+        while True:
+            attempt += 1
+            call_stats["attempts"] += 1
+            try:
+                return await send(task_request, agent_config, messages, call_stats)
+            except Exception as e:
+                error_class = classify_error(e)
+                if fail_fast and error_class in fail_fast:
+                    raise
+                if policy is None or attempt >= policy.attempts_for(error_class):
+                    raise
+                
+                delay = policy.backoff(attempt, e)
+                call_stats["retries"] += 1
+                
+                logger.warning("Retrying agent task",
+                              task_id=task_request.task_id,
+                              agent_role=task_request.agent_role.value,
+                              error_class=error_class,
+                              attempt=attempt,
+                              delay=delay)
+                
+                await asyncio.sleep(delay)
+    
+    async def _hedged_completion(self,
+                                 task_request: TaskRequest,
+                                 agent_config: AgentConfig,
+                                 messages: List[Dict[str, str]],
+                                 call_stats: Dict[str, Any]) -> Tuple[Any, Optional[Reservation]]:
+        """Send a chat completion, hedging with duplicates once it runs past the role's latency quantile"""
+        loop = asyncio.get_event_loop()
+        role = task_request.agent_role.value
+        policy = self.hedging_policies.get(task_request.agent_role)
+        
+        hedge_after = None
+        if policy and policy.enabled:
+            hedge_after = self.latency_tracker.quantile(role, policy.quantile, policy.min_samples)
+        
+        start = loop.time()
+        if hedge_after is None:
+            result = await self._create_chat_completion(agent_config, messages, task_request.timeout)
+            self.latency_tracker.record(role, loop.time() - start)
+            return result
+        
+        def attempt() -> asyncio.Task:
+            return asyncio.create_task(
+                self._create_chat_completion(agent_config, messages, task_request.timeout)
+            )
+        
+        primary = attempt()
+        pending = {primary}
+        error = None
+        try:
+            for _ in range(policy.max_hedges):
+                done, pending = await asyncio.wait(pending, timeout=max(hedge_after, policy.min_delay),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if done:
+                    pending |= done
+                    break
+                call_stats["hedged"] = True
+                pending.add(attempt())
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        call_stats["hedge_won"] = task is not primary
+                        self.latency_tracker.record(role, loop.time() - start)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _open_stream(self,
+                           task_request: TaskRequest,
+                           agent_config: AgentConfig,
+                           messages: List[Dict[str, str]],
+                           call_stats: Dict[str, Any]) -> Tuple[Tuple[Any, AsyncExitStack], Optional[Reservation]]:
+        """
+        Open a chat completion stream
+        
+        Streams are not hedged: a duplicate would bill a second completion for
+        the whole response. Rate limiter capacity is held until the returned
+        exit stack is closed, after the stream has been consumed.
+        
+        Returns:
+            (stream, exit stack) and the rate limiter reservation
+        """
+        async with AsyncExitStack() as scope:
+            reservation = await scope.enter_async_context(self._reserve_capacity(agent_config, messages))
+            stream = await self.openai_client.chat.completions.create(
+                model=agent_config.model,
+                messages=messages,
+                temperature=agent_config.temperature,
+                max_tokens=agent_config.max_tokens,
+                timeout=task_request.timeout,
+                stream=True,
+                **self._stream_options(),
+                **self._request_options()
+            )
+            return (stream, scope.pop_all()), reservation
+    
+    def _agent_config_for(self, task_request: TaskRequest) -> AgentConfig:
+        """Agent configuration for a task, with the task's model override applied"""
+        agent_config = self.agent_configs[task_request.agent_role]
+        if task_request.model_override:
+            agent_config = replace(agent_config, model=task_request.model_override)
+        return agent_config
+    
+    def _estimate_usage(self, messages: List[Dict[str, str]], content: Optional[str]) -> TokenUsage:
+        """Token usage counted locally when the API reports none"""
+        counter = self.context_builder.counter
+        return TokenUsage(
+            prompt_tokens=sum(counter.count(message["content"]) for message in messages),
+            completion_tokens=counter.count(content or "")
+        )
+    
+    def _record_usage(self, task_request: TaskRequest, model: str, usage: TokenUsage) -> Dict[str, Any]:
+        """Record a task's usage with the cost tracker and return it as response metadata"""
+        cost = self.cost_tracker.record(model, usage,
+                                        workflow_id=task_request.workflow_id,
+                                        tenant_id=task_request.tenant_id)
+        return {"usage": usage.to_dict(), "cost": cost}
+    
+    def _request_options(self) -> Dict[str, Any]:
+        """Extra chat completion arguments, e.g. JSON mode"""
+        return self.structured_output.request_options() if self.structured_output else {}
+    
+    def _stream_options(self) -> Dict[str, Any]:
+        """
+        Stream arguments asking for a final usage chunk
+        
+        Azure rejects stream_options before STREAM_USAGE_API_VERSION, so those
+        streams fall back to estimated usage.
+        """
+        from openai import AsyncAzureOpenAI
+        
+        if (isinstance(self.openai_client, AsyncAzureOpenAI)
+                and self.openai_api_version[:10] < STREAM_USAGE_API_VERSION[:10]):
+            return {}
+        # openai 1.6 has no stream_options argument
+        return {"extra_body": {"stream_options": {"include_usage": True}}}
+    
+    def _reserve_capacity(self, agent_config: AgentConfig, messages: List[Dict[str, str]]):
+        """Rate limiter reservation for a request, or a no-op without a limiter"""
+        if self.rate_limiter is None:
+            return nullcontext(None)
+        limiter = self.rate_limiter.get(self.openai_endpoint or "openai", agent_config.model)
+        return limiter.reserve(limiter.estimate_tokens(messages, agent_config.max_tokens))
+    
+    async def _create_chat_completion(self,
+                                      agent_config: AgentConfig,
+                                      messages: List[Dict[str, str]],
+                                      timeout: int) -> Tuple[Any, Optional[Reservation]]:
+        """Send a chat completion, waiting for rate limiter capacity when configured"""
+        async with self._reserve_capacity(agent_config, messages) as reservation:
+            if reservation is None:
+                response = await self.openai_client.chat.completions.create(
+                    model=agent_config.model,
+                    messages=messages,
+                    temperature=agent_config.temperature,
+                    max_tokens=agent_config.max_tokens,
+                    timeout=timeout,
+                    **self._request_options()
+                )
+                return response, None
+            
+            # The raw response exposes the x-ratelimit-* headers
+            raw_response = await self.openai_client.chat.completions.with_raw_response.create(
+                model=agent_config.model,
+                messages=messages,
+                temperature=agent_config.temperature,
+                max_tokens=agent_config.max_tokens,
+                timeout=timeout,
+                **self._request_options()
+            )
+            reservation.headers = raw_response.headers
+            response = raw_response.parse()
+            if response.usage:
+                reservation.actual_tokens = response.usage.total_tokens
+            return response, reservation
+    
+    def _build_messages(self, task_request: TaskRequest,
+                        agent_config: AgentConfig) -> List[Dict[str, str]]:
+        """Build the chat messages for a task"""
+        # Drop bookkeeping fields and fit context and input to the role's budget
+        context, input_data = self.context_builder.build(
+            task_request.agent_role,
+            agent_config.system_prompt,
+            task_request.context,
+            task_request.input_data
+        )
+        
+        # System prompt first, then context and task input in one user message
+        return self.prompt_renderer.render(agent_config, context, input_data)
     
     def _process_agent_response(self, response, agent_role: AgentRole) -> Dict[str, Any]:
         """Process and structure agent response"""
-        content = response.choices[0].message.content
+        return self._process_agent_content(response.choices[0].message.content, agent_role)
+    
+    def _process_agent_content(self, content: str, agent_role: AgentRole,
+                               fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Structure the completion text of an agent
         
+        Args:
+            content: Completion text
+            agent_role: Role that produced it
+            fields: Members already parsed from the text while streaming
+        """
         # Basic response structure
         result = {
             "content": content,
@@ -332,13 +1110,13 @@ class AzureAIFoundryClient:
         
         # Role-specific processing
         if agent_role == AgentRole.COORDINATOR:
-            result.update(self._process_coordinator_response(content))
+            result.update(self._process_coordinator_response(content, fields))
         elif agent_role == AgentRole.ANALYST:
-            result.update(self._process_analyst_response(content))
+            result.update(self._process_analyst_response(content, fields))
         elif agent_role == AgentRole.GENERATOR:
-            result.update(self._process_generator_response(content))
+            result.update(self._process_generator_response(content, fields))
         elif agent_role == AgentRole.VALIDATOR:
-            result.update(self._process_validator_response(content))
+            result.update(self._process_validator_response(content, fields))
         
         return result
     
@@ -379,48 +1157,127 @@ class AzureAIFoundryClient:
         
         return base_result
     
-    def _process_coordinator_response(self, content: str) -> Dict[str, Any]:
+    def _role_fields(self, agent_role: AgentRole, content: str,
+                     fields: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Schema-checked role fields from parsed members or the completion text"""
+        if fields is None:
+            return parse_role_output(agent_role, content)
+        return dict(coerce_fields(agent_role, fields), structured=True)
+    
+    def _process_coordinator_response(self, content: str,
+                                      fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process coordinator agent response"""
-        return {
-            "task_assignments": [],
-            "workflow_steps": [],
-            "priority_order": [],
-            "estimated_completion": None
-        }
+        return self._role_fields(AgentRole.COORDINATOR, content, fields)
     
-    def _process_analyst_response(self, content: str) -> Dict[str, Any]:
+    def _process_analyst_response(self, content: str,
+                                  fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process analyst agent response"""
-        return {
-            "insights": [],
-            "patterns": [],
-            "recommendations": [],
-            "confidence_score": 0.0
-        }
+        return self._role_fields(AgentRole.ANALYST, content, fields)
     
-    def _process_generator_response(self, content: str) -> Dict[str, Any]:
+    def _process_generator_response(self, content: str,
+                                    fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process generator agent response"""
-        return {
-            "generated_content": content,
-            "content_type": "text",
-            "quality_metrics": {},
-            "alternatives": []
-        }
+        result = self._role_fields(AgentRole.GENERATOR, content, fields)
+        # Free-form output is the generated content itself
+        result.setdefault("generated_content", content)
+        return result
     
-    def _process_validator_response(self, content: str) -> Dict[str, Any]:
+    def _process_validator_response(self, content: str,
+                                    fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process validator agent response"""
-        return {
-            "validation_status": "pending",
-            "compliance_checks": [],
-            "quality_score": 0.0,
-            "issues_found": [],
-            "approved": False
-        }
+        return self._role_fields(AgentRole.VALIDATOR, content, fields)
+    
+    def _build_workflow_graph(self,
+                              workflow_request: Dict[str, Any],
+                              plan: Dict[str, Any]) -> List[WorkflowNode]:
+        """
+        Build the specialist task graph for a workflow
+        
+        The default graph follows the data flow analyst -> generator -> validator.
+        ``step_dependencies`` in the workflow request (or ``dependencies`` in the
+        coordinator plan) overrides it, e.g. ``{"validator": ["analyst"]}``.
+        ``analysis_shards`` fans out one analyst task per shard into the generator.
+        A structured plan's ``task_assignments`` selects the specialists unless
+        the request sets ``require_*`` explicitly.
+        """
+        nodes: List[WorkflowNode] = []
+        step_nodes: Dict[str, List[str]] = {}
+        
+        # A structured plan selects the specialists the request does not pin down
+        assigned = assigned_steps(plan)
+        context = forwarded_result(plan)
+        
+        def required(flag: str, step: str) -> bool:
+            return workflow_request.get(flag, assigned is None or step in assigned)
+        
+        if required("require_analysis", "analyst"):
+            shards = workflow_request.get("analysis_shards")
+            if shards:
+                shard_inputs = [(f"analyst_{index}", shard) for index, shard in enumerate(shards)]
+            else:
+                shard_inputs = [("analyst", workflow_request.get("analysis_data", {}))]
+            for node_id, shard in shard_inputs:
+                nodes.append(WorkflowNode(
+                    node_id=node_id,
+                    agent_role=AgentRole.ANALYST,
+                    input_data=shard,
+                    context=context,
+                    priority=2
+                ))
+            step_nodes["analyst"] = [node_id for node_id, _ in shard_inputs]
+        
+        if required("require_generation", "generator"):
+            nodes.append(WorkflowNode(
+                node_id="generator",
+                agent_role=AgentRole.GENERATOR,
+                input_data=workflow_request.get("generation_data", {}),
+                context=context,
+                priority=3
+            ))
+            step_nodes["generator"] = ["generator"]
+        
+        if required("require_validation", "validator"):
+            nodes.append(WorkflowNode(
+                node_id="validator",
+                agent_role=AgentRole.VALIDATOR,
+                input_data=workflow_request.get("validation_criteria", {}),
+                context=context,
+                priority=4
+            ))
+            step_nodes["validator"] = ["validator"]
+        
+        dependencies = {"generator": ["analyst"], "validator": ["generator"]}
+        dependencies.update(
+            workflow_request.get("step_dependencies") or plan.get("dependencies") or {}
+        )
+        
+        for node in nodes:
+            step = "analyst" if node.agent_role == AgentRole.ANALYST else node.node_id
+            for upstream in dependencies.get(step, []):
+                upstream_ids = step_nodes.get(upstream, [])
+                if not upstream_ids:
+                    continue
+                if step == "generator" and upstream == "analyst":
+                    # Sharded analysis is always passed on as a list of results
+                    sharded = bool(workflow_request.get("analysis_shards"))
+                    node.inputs["analysis_results"] = upstream_ids if sharded else upstream_ids[0]
+                elif step == "validator" and upstream == "generator":
+                    node.inputs["content_to_validate"] = upstream_ids[0]
+                else:
+                    node.depends_on.extend(upstream_ids)
+        
+        return nodes
     
     async def orchestrate_multiagent_workflow(self, 
                                             workflow_request: Dict[str, Any]) -> Dict[str, Any]:
         """
         Orchestrate a complex workflow involving multiple agents
         
+        With a state store, every step is checkpointed as it completes and
+        calling again with the same ``workflow_id`` resumes from the first
+        incomplete step. ``execution_mode: "pipelined"`` overlaps the analyst,
+        generator and validator stages of the default graph.
+        
         Args:
             workflow_request: Workflow configuration and input data
             
@@ -428,10 +1285,38 @@ class AzureAIFoundryClient:
             Workflow results with all agent outputs
         """
         workflow_id = workflow_request.get("workflow_id", "default")
+        tenant_id = workflow_request.get("tenant_id")
         
+        with self.telemetry.workflow_span(workflow_id, tenant_id) as span:
+            workflow_results = await self._orchestrate_multiagent_workflow(
+                workflow_request, workflow_id, tenant_id
+            )
+            self.telemetry.finish_workflow(span, workflow_results)
+            return workflow_results
+    
+    async def _orchestrate_multiagent_workflow(self,
+                                               workflow_request: Dict[str, Any],
+                                               workflow_id: str,
+                                               tenant_id: Optional[str]) -> Dict[str, Any]:
+        """Run a workflow within the workflow span"""
         logger.info("Starting multiagent workflow", workflow_id=workflow_id)
         
         try:
+            budget = WorkflowBudget.from_dict(workflow_request.get("budget"))
+            
+            async def execute(task_request: TaskRequest) -> TaskResponse:
+                task_request = replace(task_request, workflow_id=workflow_id, tenant_id=tenant_id)
+                return await self._execute_within_budget(task_request, budget)
+            
+            def stream(task_request: TaskRequest) -> AsyncIterator[Union[str, TaskResponse]]:
+                task_request = replace(task_request, workflow_id=workflow_id, tenant_id=tenant_id)
+                return self._stream_within_budget(task_request, budget)
+            
+            async def checkpoint(step: str, response: TaskResponse):
+                await self._checkpoint(workflow_id, step, response)
+            
+            completed = await self.state_store.load_steps(workflow_id) if self.state_store else {}
+            
             # Step 1: Coordinator plans the workflow
             coordinator_task = TaskRequest(
                 task_id=f"{workflow_id}_coordinator",
@@ -440,12 +1325,17 @@ class AzureAIFoundryClient:
                 priority=1
             )
             
-            coordinator_response = await self.execute_agent_task(coordinator_task)
+            coordinator_response = completed.get("coordinator")
+            if coordinator_response is None or coordinator_response.status not in COMPLETED_STATUSES:
+                # A new plan invalidates every downstream checkpoint
+                completed = {}
+                coordinator_response = await execute(coordinator_task)
+                await checkpoint("coordinator", coordinator_response)
             
-            if coordinator_response.status not in ["success", "simulated"]:
+            if coordinator_response.status not in COMPLETED_STATUSES:
                 raise Exception(f"Coordinator failed: {coordinator_response.error}")
             
-            # Step 2: Execute planned tasks in sequence
+            # Step 2: Execute planned tasks as a dependency graph
             workflow_results = {
                 "workflow_id": workflow_id,
                 "coordinator_plan": coordinator_response.result,
@@ -454,55 +1344,51 @@ class AzureAIFoundryClient:
                 "start_time": asyncio.get_event_loop().time()
             }
             
-            # Execute analyst task
-            if workflow_request.get("require_analysis", True):
-                analyst_task = TaskRequest(
-                    task_id=f"{workflow_id}_analyst",
-                    agent_role=AgentRole.ANALYST,
-                    input_data=workflow_request.get("analysis_data", {}),
-                    context=coordinator_response.result,
-                    priority=2
-                )
-                
-                analyst_response = await self.execute_agent_task(analyst_task)
-                workflow_results["agent_results"]["analyst"] = analyst_response
-            
-            # Execute generator task
-            if workflow_request.get("require_generation", True):
-                generator_input = workflow_request.get("generation_data", {})
-                if "analyst" in workflow_results["agent_results"]:
-                    generator_input["analysis_results"] = workflow_results["agent_results"]["analyst"].result
-                
-                generator_task = TaskRequest(
-                    task_id=f"{workflow_id}_generator",
-                    agent_role=AgentRole.GENERATOR,
-                    input_data=generator_input,
-                    context=coordinator_response.result,
-                    priority=3
+            nodes = self._build_workflow_graph(workflow_request, coordinator_response.result)
+            forward = lambda response: forwarded_result(response.result)
+            if (workflow_request.get("execution_mode") == "pipelined"
+                    and PipelinedWorkflow.supports(nodes)):
+                # Overlap the stages: generation starts on the analysis prefix,
+                # validation on each finished section
+                pipeline = PipelinedWorkflow(stream, execute, forward=forward)
+                workflow_results["agent_results"], workflow_results["pipeline"] = await pipeline.run(
+                    nodes, workflow_id=workflow_id, completed=completed, on_complete=checkpoint
                 )
-                
-                generator_response = await self.execute_agent_task(generator_task)
-                workflow_results["agent_results"]["generator"] = generator_response
-            
-            # Execute validator task
-            if workflow_request.get("require_validation", True):
-                validator_input = workflow_request.get("validation_criteria", {})
-                if "generator" in workflow_results["agent_results"]:
-                    validator_input["content_to_validate"] = workflow_results["agent_results"]["generator"].result
-                
-                validator_task = TaskRequest(
-                    task_id=f"{workflow_id}_validator",
-                    agent_role=AgentRole.VALIDATOR,
-                    input_data=validator_input,
-                    context=coordinator_response.result,
-                    priority=4
+                workflow_results["execution_mode"] = "pipelined"
+            else:
+                engine = WorkflowEngine(execute, forward=forward)
+                workflow_results["agent_results"] = await engine.run(
+                    nodes, workflow_id=workflow_id, completed=completed, on_complete=checkpoint
                 )
-                
-                validator_response = await self.execute_agent_task(validator_task)
-                workflow_results["agent_results"]["validator"] = validator_response
+                workflow_results["execution_mode"] = "graph"
+            workflow_results["resumed_steps"] = [
+                step for step, response in dict(
+                    workflow_results["agent_results"], coordinator=coordinator_response
+                ).items()
+                if completed.get(step) is response
+            ]
+            
+            if self.model_router:
+                self._record_quality_signals(workflow_results["agent_results"])
             
             # Finalize workflow
-            workflow_results["status"] = "completed"
+            statuses = [response.status for response in workflow_results["agent_results"].values()]
+            if "error" in statuses:
+                workflow_results["status"] = "failed"
+                workflow_results["failed_steps"] = [
+                    step for step, response in workflow_results["agent_results"].items()
+                    if response.status == "error"
+                ]
+            elif "skipped" in statuses:
+                workflow_results["status"] = "budget_exhausted"
+            elif self._rejected(workflow_results["agent_results"].get("validator")):
+                workflow_results["status"] = "rejected"
+                workflow_results["issues_found"] = (
+                    workflow_results["agent_results"]["validator"].result.get("issues_found", [])
+                )
+            else:
+                workflow_results["status"] = "completed"
+            workflow_results["usage"] = self.cost_tracker.workflow_summary(workflow_id).to_dict()
             workflow_results["end_time"] = asyncio.get_event_loop().time()
             workflow_results["total_execution_time"] = (
                 workflow_results["end_time"] - workflow_results["start_time"]
@@ -526,55 +1412,149 @@ class AzureAIFoundryClient:
                 "end_time": asyncio.get_event_loop().time()
             }
     
-    async def health_check(self) -> Dict[str, Any]:
-        """Perform health check on all AI services"""
-        health_status = {
-            "timestamp": asyncio.get_event_loop().time(),
-            "services": {}
-        }
-        
-        # Check OpenAI connection
+    @staticmethod
+    def _rejected(validator_response: Optional[TaskResponse]) -> bool:
+        """Whether a structured validator result explicitly disapproved the output"""
+        if validator_response is None or not isinstance(validator_response.result, dict):
+            return False
+        result = validator_response.result
+        return bool(result.get("structured")) and result.get("approved") is False
+    
+    async def _checkpoint(self, workflow_id: str, step: str, response: TaskResponse):
+        """Persist a step response; checkpoint failures never fail the workflow"""
+        if self.state_store is None:
+            return
         try:
-            if self.openai_client:
-                test_response = await self.openai_client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": "Health check"}],
-                    max_tokens=10
-                )
-                health_status["services"]["openai"] = "healthy"
-            else:
-                health_status["services"]["openai"] = "not_configured"
+            await self.state_store.save_step(workflow_id, step, response)
         except Exception as e:
-            health_status["services"]["openai"] = f"unhealthy: {str(e)}"
+            logger.warning("Workflow checkpoint failed",
+                          workflow_id=workflow_id,
+                          step=step,
+                          error=str(e))
+    
+    def _record_quality_signals(self, agent_results: Dict[str, TaskResponse]):
+        """Feed the validator's quality score back to the router for the generator's model"""
+        generator = agent_results.get("generator")
+        validator = agent_results.get("validator")
+        if not generator or not validator:
+            return
+        if generator.status != "success" or validator.status != "success":
+            return
+        score = validator.result.get("quality_score")
+        if isinstance(score, (int, float)):
+            self.model_router.record_quality(generator.metadata["model"], AgentRole.GENERATOR, score)
+    
+    async def _execute_within_budget(self,
+                                     task_request: TaskRequest,
+                                     budget: Optional[WorkflowBudget]) -> TaskResponse:
+        """
+        Execute a workflow task unless the workflow budget is spent
         
-        # Check ML workspace connection
-        try:
-            if self.ml_client:
-                # Simple test call
-                health_status["services"]["ml_workspace"] = "healthy"
-            else:
-                health_status["services"]["ml_workspace"] = "not_configured"
-        except Exception as e:
-            health_status["services"]["ml_workspace"] = f"unhealthy: {str(e)}"
+        The budget is checked before each task starts, so tasks already running
+        in parallel may overshoot it.
+        """
+        if not self._budget_exhausted(task_request, budget):
+            return await self.execute_agent_task(task_request)
         
-        # Check Text Analytics
-        if self.text_analytics_client:
-            try:
-                # Simple test call
-                health_status["services"]["text_analytics"] = "healthy"
-            except Exception as e:
-                health_status["services"]["text_analytics"] = f"unhealthy: {str(e)}"
-        else:
-            health_status["services"]["text_analytics"] = "not_configured"
+        if budget.on_exhausted == "downgrade":
+            response = await self.execute_agent_task(
+                replace(task_request, model_override=budget.downgrade_model)
+            )
+            response.metadata["budget_downgraded"] = True
+            return response
+        
+        return self._budget_skipped(task_request)
+    
+    async def _stream_within_budget(
+            self,
+            task_request: TaskRequest,
+            budget: Optional[WorkflowBudget]) -> AsyncIterator[Union[str, TaskResponse]]:
+        """Stream a workflow task unless the workflow budget is spent"""
+        downgraded = False
+        if self._budget_exhausted(task_request, budget):
+            if budget.on_exhausted != "downgrade":
+                yield self._budget_skipped(task_request)
+                return
+            task_request = replace(task_request, model_override=budget.downgrade_model)
+            downgraded = True
+        
+        async for item in self.execute_agent_task_stream(task_request):
+            if downgraded and isinstance(item, TaskResponse):
+                item.metadata["budget_downgraded"] = True
+            yield item
+    
+    def _budget_exhausted(self, task_request: TaskRequest, budget: Optional[WorkflowBudget]) -> bool:
+        """Whether the task's workflow has spent its budget"""
+        if budget is None or not budget.exhausted(
+                self.cost_tracker.workflow_summary(task_request.workflow_id)):
+            return False
+        
+        logger.warning("Workflow budget exhausted",
+                      workflow_id=task_request.workflow_id,
+                      task_id=task_request.task_id,
+                      action=budget.on_exhausted)
+        return True
+    
+    def _budget_skipped(self, task_request: TaskRequest) -> TaskResponse:
+        """Response for a task skipped because the workflow budget is spent"""
+        return TaskResponse(
+            task_id=task_request.task_id,
+            agent_role=task_request.agent_role,
+            status="skipped",
+            result={},
+            metadata={"budget_exhausted": True},
+            execution_time=0.0,
+            error="Workflow budget exhausted"
+        )
+    
+    def _health_probes(self) -> Dict[str, Any]:
+        """Cheapest real call per dependency; none of them spends tokens"""
+        async def openai_probe():
+            if not self.openai_client:
+                raise NotConfigured()
+            await self.openai_client.models.list()
         
-        # Overall health
-        unhealthy_services = [
-            service for service, status in health_status["services"].items()
-            if status.startswith("unhealthy")
-        ]
+        async def ml_workspace_probe():
+            if not self.workspace_name:
+                raise NotConfigured()
+            # Building an Azure SDK client can read config files and fetch metadata
+            ml_client = await asyncio.to_thread(lambda: self.ml_client)
+            if not ml_client:
+                raise NotConfigured()
+            await asyncio.to_thread(ml_client.workspaces.get, self.workspace_name)
         
-        health_status["overall_status"] = "healthy" if not unhealthy_services else "degraded"
-        health_status["unhealthy_services"] = unhealthy_services
+        async def text_analytics_probe():
+            endpoint = os.getenv("AZURE_TEXT_ANALYTICS_ENDPOINT")
+            if not endpoint or not await asyncio.to_thread(lambda: self.text_analytics_client):
+                raise NotConfigured()
+            # Polling an analysis job that does not exist is authenticated but not billed;
+            # a 404 proves the endpoint is up and accepts the credential
+            token = await asyncio.to_thread(self.credential.get_token, COGNITIVE_SERVICES_SCOPE)
+            response = await self.transport.async_client.get(
+                f"{endpoint.rstrip('/')}/language/analyze-text/jobs/{uuid.uuid4()}",
+                params={"api-version": TEXT_ANALYTICS_API_VERSION},
+                headers={"Authorization": f"Bearer {token.token}"}
+            )
+            if response.status_code != 404:
+                response.raise_for_status()
         
-        return health_status
+        return {
+            "openai": openai_probe,
+            "ml_workspace": ml_workspace_probe,
+            "text_analytics": text_analytics_probe
+        }
+    
+    async def start_health_probes(self):
+        """Start probing dependencies in the background"""
+        await self.health_prober.start()
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """
+        Health of all AI services as of the last background probe
+        
+        Probes once if no probe round has run yet.
+        """
+        if self.health_prober.rounds == 0:
+            return await self.health_prober.probe_once()
+        return self.health_prober.snapshot()
 
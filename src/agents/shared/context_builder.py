@@ -0,0 +1,245 @@
+"""
+Context Builder
+Token-budget-aware compaction of the context and inputs passed between agents
+"""
+
+import heapq
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+import structlog
+
+from .agent_models import AgentRole
+from .prompt_renderer import render_value
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+# Bookkeeping fields that carry no information for the next agent
+DEFAULT_DROP_KEYS = frozenset({"timestamp", "agent_role", "simulated"})
+
+# Fields dropped when they repeat the value of the more specific sibling field
+ECHOED_FIELDS = {"content": "generated_content"}
+
+# Prompt token budget per role, covering system prompt, context and task input
+DEFAULT_ROLE_BUDGETS = {
+    AgentRole.COORDINATOR: 3000,
+    AgentRole.ANALYST: 3000,
+    AgentRole.GENERATOR: 4000,
+    AgentRole.VALIDATOR: 3000
+}
+
+# Fallback when tiktoken or its encoding files are unavailable
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = " …[truncated] … "
+
+class TokenCounter:
+    """Counts tokens with tiktoken, falling back to a character heuristic"""
+
+    def __init__(self, model: str = "gpt-4"):
+        self.model = model
+        self._encoding = None
+        self._loaded = False
+
+    @property
+    def encoding(self):
+        """tiktoken encoding for the model, or None when tiktoken cannot be used"""
+        if not self._loaded:
+            self._loaded = True
+            try:
+                import tiktoken
+
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning("tiktoken unavailable, estimating tokens from length", error=str(e))
+                self._encoding = None
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        """Number of tokens in a text"""
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+    def truncate(self, text: str, max_tokens: int, tokens: Optional[int] = None) -> str:
+        """Shorten a text to about ``max_tokens``, keeping its beginning and end; ``tokens`` is its known count"""
+        if (self.count(text) if tokens is None else tokens) <= max_tokens:
+            return text
+        max_tokens = max(1, max_tokens - self.count(TRUNCATION_MARKER))
+        head_tokens = max(1, (max_tokens * 2) // 3)
+        tail_tokens = max(0, max_tokens - head_tokens)
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            head = self.encoding.decode(tokens[:head_tokens])
+            tail = self.encoding.decode(tokens[-tail_tokens:]) if tail_tokens else ""
+        else:
+            head = text[:head_tokens * CHARS_PER_TOKEN]
+            tail = text[-tail_tokens * CHARS_PER_TOKEN:] if tail_tokens else ""
+        return f"{head}{TRUNCATION_MARKER}{tail}"
+
+class ContextBuilder:
+    """
+    Builds compact, budget-bounded context and input for agent prompts
+    """
+
+    def __init__(self,
+                 role_budgets: Dict[AgentRole, int] = None,
+                 drop_keys: Iterable[str] = DEFAULT_DROP_KEYS,
+                 counter: TokenCounter = None,
+                 min_field_tokens: int = 32):
+        """
+        Initialize context builder
+
+        Args:
+            role_budgets: Prompt token budget per role
+            drop_keys: Keys removed from context and upstream results
+            counter: Token counter, tiktoken-based by default
+            min_field_tokens: Fields are never truncated below this size
+        """
+        self.role_budgets = {**DEFAULT_ROLE_BUDGETS, **(role_budgets or {})}
+        self.drop_keys = frozenset(drop_keys)
+        self.counter = counter or TokenCounter()
+        self.min_field_tokens = min_field_tokens
+
+    def compact(self, value: Any) -> Any:
+        """
+        Remove noise from a value
+
+        Drops bookkeeping keys, empty placeholders (None, "", [], {}) and a
+        ``content`` field that only echoes its ``generated_content`` sibling.
+        """
+        if isinstance(value, dict):
+            compacted = {}
+            for key, item in value.items():
+                if key in self.drop_keys:
+                    continue
+                item = self.compact(item)
+                if item is None or item == "" or item == [] or item == {}:
+                    continue
+                compacted[key] = item
+            for key, source in ECHOED_FIELDS.items():
+                if key in compacted and compacted[key] == compacted.get(source):
+                    del compacted[key]
+            return compacted
+        if isinstance(value, (list, tuple)):
+            return [self.compact(item) for item in value]
+        return value
+
+    def count(self, value: Any) -> int:
+        """Tokens of a value as rendered into a prompt"""
+        return self.counter.count(render_value(value))
+
+    def fit(self, value: Any, budget: int) -> Any:
+        """
+        Shrink a value to at most ``budget`` tokens
+
+        The largest string fields are truncated first; if that is not enough,
+        list tails are dropped, and as a last resort the whole rendered value
+        is truncated to a string. Field sizes are counted once and the value
+        is only re-rendered after each phase.
+        """
+        tokens = self.count(value)
+        if tokens <= budget:
+            return value
+
+        # Max-heap of string fields by token size; the index breaks ties between paths
+        leaves = [(-self.counter.count(text), index, path, text)
+                  for index, (path, text) in enumerate(self._string_leaves(value))]
+        heapq.heapify(leaves)
+        while tokens > budget and leaves:
+            negative_tokens, index, path, text = heapq.heappop(leaves)
+            leaf_tokens = -negative_tokens
+            if leaf_tokens <= self.min_field_tokens:
+                break
+            target = max(self.min_field_tokens, leaf_tokens - (tokens - budget))
+            truncated = self.counter.truncate(text, target, tokens=leaf_tokens)
+            truncated_tokens = self.counter.count(truncated)
+            if truncated_tokens >= leaf_tokens:
+                continue
+            value = self._replace(value, path, truncated)
+            tokens -= leaf_tokens - truncated_tokens
+            heapq.heappush(leaves, (-truncated_tokens, index, path, truncated))
+        # Field counts ignore JSON quoting and escapes, so measure the result once
+        tokens = self.count(value)
+
+        while tokens > budget:
+            dropped = self._trim_longest_list(value)
+            if dropped is None:
+                break
+            tokens -= dropped
+        tokens = self.count(value)
+
+        if tokens > budget:
+            return self.counter.truncate(render_value(value), budget)
+        return value
+
+    def build(self,
+              role: AgentRole,
+              system_prompt: str,
+              context: Optional[Dict[str, Any]],
+              input_data: Any) -> Tuple[Optional[Any], Any]:
+        """
+        Compact context and task input to fit the role's prompt budget
+
+        The task input is kept whole when possible; context gets what is left.
+
+        Returns:
+            (context, input_data) ready to be rendered into the prompt
+        """
+        budget = self.role_budgets.get(role)
+        # Top-level input keys come from the caller; only nested upstream results lose bookkeeping keys
+        if isinstance(input_data, dict):
+            input_data = {key: self.compact(item) for key, item in input_data.items()}
+        else:
+            input_data = self.compact(input_data)
+        context = self.compact(context) if context else context
+
+        if budget is None:
+            return context, input_data
+
+        available = max(0, budget - self.counter.count(system_prompt))
+        input_budget = available if not context else max(available // 2, available - self.count(context))
+        input_data = self.fit(input_data, input_budget)
+        if context:
+            context = self.fit(context, max(0, available - self.count(input_data)))
+        return context, input_data
+
+    def _string_leaves(self, value: Any, path: Tuple = ()) -> List[Tuple[Tuple, str]]:
+        if isinstance(value, str):
+            return [(path, value)]
+        if isinstance(value, dict):
+            return [leaf for key, item in value.items() for leaf in self._string_leaves(item, path + (key,))]
+        if isinstance(value, list):
+            return [leaf for index, item in enumerate(value) for leaf in self._string_leaves(item, path + (index,))]
+        return []
+
+    def _replace(self, value: Any, path: Tuple, new: Any) -> Any:
+        if not path:
+            return new
+        value[path[0]] = self._replace(value[path[0]], path[1:], new)
+        return value
+
+    def _trim_longest_list(self, value: Any) -> Optional[int]:
+        """Drop the last element of the longest list; its tokens, or None when nothing can be trimmed"""
+        lists = []
+
+        def collect(item):
+            if isinstance(item, list):
+                lists.append(item)
+                for child in item:
+                    collect(child)
+            elif isinstance(item, dict):
+                for child in item.values():
+                    collect(child)
+
+        collect(value)
+        lists = [item for item in lists if len(item) > 1]
+        if not lists:
+            return None
+        # At least one token for the separator, so every drop makes progress
+        return max(1, self.count(max(lists, key=len).pop()))
@@ -0,0 +1,215 @@
+"""
+Cost Tracker
+Token and cost accounting per task, workflow and tenant with workflow budgets
+"""
+
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional
+
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+@dataclass
+class ModelPrice:
+    """Price in USD per 1K tokens"""
+    prompt: float
+    completion: float
+    # Cached prompt tokens are billed at a discount; None bills them as prompt tokens
+    cached_prompt: Optional[float] = None
+
+# List prices per 1K tokens; override through PriceTable for negotiated rates
+DEFAULT_PRICES = {
+    "gpt-4": ModelPrice(prompt=0.03, completion=0.06),
+    "gpt-4-32k": ModelPrice(prompt=0.06, completion=0.12),
+    "gpt-4-turbo": ModelPrice(prompt=0.01, completion=0.03),
+    "gpt-4o": ModelPrice(prompt=0.005, completion=0.015, cached_prompt=0.0025),
+    "gpt-4o-mini": ModelPrice(prompt=0.00015, completion=0.0006, cached_prompt=0.000075),
+    "gpt-35-turbo": ModelPrice(prompt=0.0005, completion=0.0015),
+    "gpt-3.5-turbo": ModelPrice(prompt=0.0005, completion=0.0015),
+    "simulation": ModelPrice(prompt=0.0, completion=0.0)
+}
+
+@dataclass
+class TokenUsage:
+    """Prompt, completion and cached prompt tokens of one or more calls"""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @classmethod
+    def from_openai(cls, usage) -> "TokenUsage":
+        """Read an OpenAI usage object; cached tokens are reported only by newer API versions"""
+        if usage is None:
+            return cls()
+        details = getattr(usage, "prompt_tokens_details", None)
+        if isinstance(details, dict):
+            cached = details.get("cached_tokens")
+        else:
+            cached = getattr(details, "cached_tokens", None)
+        return cls(
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            cached_tokens=cached or 0
+        )
+
+    def add(self, other: "TokenUsage"):
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(asdict(self), total_tokens=self.total_tokens)
+
+class PriceTable:
+    """Model prices with lookup by deployment or model name"""
+
+    def __init__(self, prices: Dict[str, ModelPrice] = None):
+        self.prices = dict(DEFAULT_PRICES, **(prices or {}))
+
+    @classmethod
+    def from_file(cls, path: str) -> "PriceTable":
+        """
+        Load prices from a JSON file
+
+        The file maps model names to ``{"prompt": ..., "completion": ..., "cached_prompt": ...}``.
+        """
+        with open(path) as price_file:
+            raw = json.load(price_file)
+        return cls({model: ModelPrice(**price) for model, price in raw.items()})
+
+    def price(self, model: str) -> Optional[ModelPrice]:
+        """Price of a model; versioned names such as ``gpt-4-0613`` fall back to their base model"""
+        if model in self.prices:
+            return self.prices[model]
+        matches = [name for name in self.prices if model.startswith(f"{name}-")]
+        if matches:
+            return self.prices[max(matches, key=len)]
+        return None
+
+    def cost(self, model: str, usage: TokenUsage) -> float:
+        """Cost in USD of the given usage; unknown models cost 0 and are logged"""
+        price = self.price(model)
+        if price is None:
+            logger.warning("No price configured for model", model=model)
+            return 0.0
+        cached_price = price.prompt if price.cached_prompt is None else price.cached_prompt
+        uncached = max(0, usage.prompt_tokens - usage.cached_tokens)
+        return (
+            uncached * price.prompt
+            + usage.cached_tokens * cached_price
+            + usage.completion_tokens * price.completion
+        ) / 1000
+
+@dataclass
+class UsageSummary:
+    """Accumulated usage and cost"""
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    cost: float = 0.0
+    tasks: int = 0
+    by_model: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, model: str, usage: TokenUsage, cost: float):
+        self.usage.add(usage)
+        self.cost += cost
+        self.tasks += 1
+        self.by_model[model] = self.by_model.get(model, 0.0) + cost
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.usage.to_dict(), cost=self.cost, tasks=self.tasks, cost_by_model=dict(self.by_model))
+
+@dataclass
+class WorkflowBudget:
+    """Token or cost limit of a workflow and what to do once it is spent"""
+    max_tokens: Optional[int] = None
+    max_cost: Optional[float] = None
+    # "stop" skips remaining tasks, "downgrade" runs them on downgrade_model
+    on_exhausted: str = "stop"
+    downgrade_model: str = "gpt-35-turbo"
+
+    @classmethod
+    def from_dict(cls, raw: Optional[Dict[str, Any]]) -> Optional["WorkflowBudget"]:
+        if not raw:
+            return None
+        budget = cls(**raw)
+        if budget.on_exhausted not in ("stop", "downgrade"):
+            raise ValueError(f"Unknown budget action: {budget.on_exhausted}")
+        return budget
+
+    def exhausted(self, summary: UsageSummary) -> bool:
+        """Whether the spent tokens or cost have reached the budget"""
+        if self.max_tokens is not None and summary.usage.total_tokens >= self.max_tokens:
+            return True
+        if self.max_cost is not None and summary.cost >= self.max_cost:
+            return True
+        return False
+
+class CostTracker:
+    """
+    Rolls up token usage and cost per workflow and per tenant
+    """
+
+    def __init__(self, price_table: PriceTable = None, max_workflows: int = 1000):
+        """
+        Initialize cost tracker
+
+        Args:
+            price_table: Model prices
+            max_workflows: Number of most recent workflows whose summaries are kept
+        """
+        self.price_table = price_table or PriceTable()
+        self.max_workflows = max_workflows
+        self.total = UsageSummary()
+        self.workflows: "OrderedDict[str, UsageSummary]" = OrderedDict()
+        self.tenants: Dict[str, UsageSummary] = {}
+
+    def record(self,
+               model: str,
+               usage: TokenUsage,
+               workflow_id: Optional[str] = None,
+               tenant_id: Optional[str] = None) -> float:
+        """
+        Record the usage of one task
+
+        Returns:
+            Cost of the task in USD
+        """
+        cost = self.price_table.cost(model, usage)
+        self.total.add(model, usage, cost)
+
+        if workflow_id is not None:
+            summary = self.workflows.get(workflow_id)
+            if summary is None:
+                summary = self.workflows[workflow_id] = UsageSummary()
+                while len(self.workflows) > self.max_workflows:
+                    self.workflows.popitem(last=False)
+            else:
+                self.workflows.move_to_end(workflow_id)
+            summary.add(model, usage, cost)
+
+        if tenant_id is not None:
+            self.tenants.setdefault(tenant_id, UsageSummary()).add(model, usage, cost)
+
+        return cost
+
+    def workflow_summary(self, workflow_id: str) -> UsageSummary:
+        """Usage of a workflow so far"""
+        return self.workflows.get(workflow_id) or UsageSummary()
+
+    def tenant_summary(self, tenant_id: str) -> UsageSummary:
+        """Usage of a tenant so far"""
+        return self.tenants.get(tenant_id) or UsageSummary()
+
+    def stats(self) -> Dict[str, Any]:
+        """Total and per-tenant usage"""
+        return {
+            "total": self.total.to_dict(),
+            "tenants": {tenant: summary.to_dict() for tenant, summary in self.tenants.items()}
+        }
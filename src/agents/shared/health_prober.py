@@ -0,0 +1,177 @@
+"""
+Health Prober
+Background dependency probes with a cached health snapshot
+"""
+
+import time
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, Awaitable, Deque
+
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+Probe = Callable[[], Awaitable[None]]
+
+class NotConfigured(Exception):
+    """Raised by a probe whose dependency is not configured"""
+
+@dataclass
+class DependencyHealth:
+    """Probe history of one dependency"""
+    name: str
+    status: str = "unknown"
+    checks: int = 0
+    consecutive_failures: int = 0
+    last_checked: Optional[float] = None
+    last_latency: Optional[float] = None
+    last_error: Optional[str] = None
+    # (succeeded, latency) of the most recent probes
+    recent: Deque = field(default_factory=lambda: deque(maxlen=20))
+
+    def error_rate(self) -> float:
+        if not self.recent:
+            return 0.0
+        return sum(1 for succeeded, _ in self.recent if not succeeded) / len(self.recent)
+
+    def avg_latency(self) -> Optional[float]:
+        latencies = [latency for succeeded, latency in self.recent if succeeded]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "checks": self.checks,
+            "last_checked": self.last_checked,
+            "last_latency": self.last_latency,
+            "avg_latency": self.avg_latency(),
+            "error_rate": self.error_rate(),
+            "last_error": self.last_error
+        }
+
+class HealthProber:
+    """
+    Probes dependencies on an interval and serves the last result
+
+    Readers get a prebuilt snapshot, so health endpoints cost nothing beyond
+    a dictionary lookup no matter how often they are polled.
+    """
+
+    def __init__(self,
+                 probes: Dict[str, Probe],
+                 interval: float = 30.0,
+                 timeout: float = 5.0,
+                 unhealthy_after: int = 2,
+                 window: int = 20):
+        """
+        Initialize health prober
+
+        Args:
+            probes: Coroutine function per dependency; raises on failure,
+                NotConfigured when the dependency is not set up
+            interval: Seconds between probe rounds
+            timeout: Seconds before a probe counts as failed
+            unhealthy_after: Consecutive failures before a dependency is unhealthy
+            window: Number of recent probes behind error rate and average latency
+        """
+        self.probes = probes
+        self.interval = interval
+        self.timeout = timeout
+        self.unhealthy_after = unhealthy_after
+        self.dependencies = {
+            name: DependencyHealth(name=name, recent=deque(maxlen=window)) for name in probes
+        }
+        self.rounds = 0
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot = self._build_snapshot()
+
+    async def _probe(self, name: str):
+        dependency = self.dependencies[name]
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.probes[name](), timeout=self.timeout)
+        except NotConfigured:
+            dependency.status = "not_configured"
+            dependency.last_error = None
+        except Exception as e:
+            latency = time.perf_counter() - start
+            dependency.consecutive_failures += 1
+            dependency.last_error = str(e) or type(e).__name__
+            dependency.last_latency = latency
+            dependency.recent.append((False, latency))
+            if dependency.consecutive_failures >= self.unhealthy_after:
+                dependency.status = "unhealthy"
+            else:
+                dependency.status = "degraded"
+            logger.warning("Health probe failed", dependency=name, error=dependency.last_error)
+        else:
+            latency = time.perf_counter() - start
+            dependency.consecutive_failures = 0
+            dependency.last_error = None
+            dependency.last_latency = latency
+            dependency.recent.append((True, latency))
+            dependency.status = "healthy"
+        dependency.checks += 1
+        dependency.last_checked = time.time()
+
+    async def probe_once(self) -> Dict[str, Any]:
+        """Run every probe concurrently and refresh the snapshot"""
+        await asyncio.gather(*(self._probe(name) for name in self.probes))
+        self.rounds += 1
+        self._snapshot = self._build_snapshot()
+        return self._snapshot
+
+    def _build_snapshot(self) -> Dict[str, Any]:
+        unhealthy = [name for name, dependency in self.dependencies.items()
+                     if dependency.status == "unhealthy"]
+        degraded = [name for name, dependency in self.dependencies.items()
+                    if dependency.status == "degraded"]
+        if unhealthy:
+            overall = "unhealthy"
+        elif degraded:
+            overall = "degraded"
+        elif self.rounds == 0:
+            overall = "unknown"
+        else:
+            overall = "healthy"
+        return {
+            "timestamp": time.time(),
+            "services": {name: dependency.status for name, dependency in self.dependencies.items()},
+            "details": {name: dependency.to_dict() for name, dependency in self.dependencies.items()},
+            "overall_status": overall,
+            "unhealthy_services": unhealthy
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Health as of the last probe round"""
+        return self._snapshot
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error("Health probe round failed", error=str(e))
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        """Probe in the background on the running event loop"""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("Health prober started", interval=self.interval, dependencies=list(self.probes))
+
+    async def stop(self):
+        """Cancel background probing"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
@@ -0,0 +1,219 @@
+"""
+HTTP Transport
+Shared pooled HTTP transport with keep-alive, connection warm-up and pool metrics
+"""
+
+import time
+import asyncio
+import importlib.util
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+import structlog
+
+# httpx and requests are imported on first use to keep client startup fast
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+
+@dataclass
+class TransportConfig:
+    """Connection pool settings shared by all sub-clients"""
+    max_connections: Optional[int] = None
+    max_keepalive_connections: Optional[int] = None
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    connect_timeout: float = 10.0
+    read_timeout: float = 600.0
+    warm_up_connections: int = 0
+
+@dataclass
+class TransportMetrics:
+    """Connection pool counters"""
+    requests: int = 0
+    new_connections: int = 0
+    pool_wait_total: float = 0.0
+    pool_wait_max: float = 0.0
+
+    def record_pool_wait(self, seconds: float):
+        self.requests += 1
+        self.pool_wait_total += seconds
+        self.pool_wait_max = max(self.pool_wait_max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "pool_wait_total": self.pool_wait_total,
+            "pool_wait_avg": self.pool_wait_total / self.requests if self.requests else 0.0,
+            "pool_wait_max": self.pool_wait_max
+        }
+
+class InstrumentedTransport:
+    """
+    httpx async transport wrapper that measures pool wait time and new connections
+
+    Pool wait is the time from handing the request to the pool until the first
+    connection-level trace event, i.e. until a connection was acquired.
+    """
+
+    def __init__(self, transport, metrics: TransportMetrics):
+        self._transport = transport
+        self.metrics = metrics
+
+    async def handle_async_request(self, request):
+        start = time.perf_counter()
+        acquired = []
+        upstream_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            if not acquired:
+                acquired.append(time.perf_counter())
+            if event_name == "connection.connect_tcp.complete":
+                self.metrics.new_connections += 1
+            if upstream_trace is not None:
+                await upstream_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            end = acquired[0] if acquired else time.perf_counter()
+            self.metrics.record_pool_wait(end - start)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+    async def __aenter__(self):
+        await self._transport.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        await self._transport.__aexit__(*args)
+
+class SharedHTTPTransport:
+    """
+    Owns the connection pools used by every sub-client of AzureAIFoundryClient
+
+    The async httpx pool serves the OpenAI client; the Azure SDK clients are
+    synchronous, so they share one pooled requests session sized from the same config.
+    """
+
+    def __init__(self, config: TransportConfig = None, max_connections_hint: int = None):
+        """
+        Initialize shared transport
+
+        Args:
+            config: Pool settings
+            max_connections_hint: Pool size to use when the config does not set one,
+                e.g. the rate limiter's maximum concurrency
+        """
+        self.config = config or TransportConfig()
+        self.max_connections = (
+            self.config.max_connections or max_connections_hint or DEFAULT_MAX_CONNECTIONS
+        )
+        self.max_keepalive_connections = (
+            self.config.max_keepalive_connections or self.max_connections
+        )
+        self.metrics = TransportMetrics()
+        self._async_client = None
+        self._session = None
+
+    @property
+    def http2(self) -> bool:
+        """HTTP/2 is used only when requested and the h2 package is installed"""
+        if not self.config.http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+            return False
+        return True
+
+    @property
+    def async_client(self):
+        """Pooled httpx.AsyncClient, created on first use"""
+        if self._async_client is None:
+            import httpx
+
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry
+            )
+            transport = InstrumentedTransport(
+                httpx.AsyncHTTPTransport(limits=limits, http2=self.http2),
+                self.metrics
+            )
+            self._async_client = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(self.config.read_timeout, connect=self.config.connect_timeout)
+            )
+        return self._async_client
+
+    @property
+    def session(self):
+        """Pooled requests.Session shared by the Azure SDK clients"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_connections,
+                                  pool_maxsize=self.max_connections)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        return self._session
+
+    def azure_transport(self):
+        """azure-core transport over the shared session"""
+        from azure.core.pipeline.transport import RequestsTransport
+
+        return RequestsTransport(session=self.session, session_owner=False)
+
+    async def warm_up(self, url: str, connections: int = None) -> int:
+        """
+        Open connections ahead of traffic
+
+        Args:
+            url: Any URL on the target host; the response status is ignored
+            connections: Number of concurrent connections to open
+
+        Returns:
+            Number of connections that completed a round trip
+        """
+        connections = connections or self.config.warm_up_connections
+        if connections <= 0:
+            return 0
+        connections = min(connections, self.max_connections)
+
+        async def touch() -> bool:
+            try:
+                await self.async_client.request("HEAD", url)
+                return True
+            except Exception as e:
+                logger.warning("Connection warm-up failed", url=url, error=str(e))
+                return False
+
+        results = await asyncio.gather(*(touch() for _ in range(connections)))
+        warmed = sum(results)
+        logger.info("Connections warmed up", url=url, connections=warmed)
+        return warmed
+
+    async def aclose(self):
+        """Close all pools"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration and metrics"""
+        return dict(
+            self.metrics.snapshot(),
+            max_connections=self.max_connections,
+            http2=self.config.http2
+        )
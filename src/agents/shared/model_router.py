@@ -0,0 +1,175 @@
+"""
+Model Router
+Cost- and latency-aware routing of agent tasks across tiered model deployments
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+import structlog
+
+from .agent_models import AgentRole
+from .retry_policy import LatencyTracker
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+@dataclass
+class ModelTier:
+    """One deployment tier, ordered from cheapest to most capable"""
+    name: str
+    model: str
+    # Prompts larger than this are routed to a larger tier; None means unbounded
+    max_prompt_tokens: Optional[int] = None
+    # p95 latency in seconds above which the tier is avoided while alternatives exist
+    latency_slo: Optional[float] = None
+
+DEFAULT_TIERS = [
+    ModelTier(name="small", model="gpt-35-turbo", max_prompt_tokens=2000),
+    ModelTier(name="medium", model="gpt-4o-mini", max_prompt_tokens=8000),
+    ModelTier(name="large", model="gpt-4")
+]
+
+# Validation is mostly pass/fail output; planning and generation need the large model
+DEFAULT_ROLE_TIERS = {
+    AgentRole.COORDINATOR: "large",
+    AgentRole.ANALYST: "medium",
+    AgentRole.GENERATOR: "large",
+    AgentRole.VALIDATOR: "small"
+}
+
+class ModelRouter:
+    """
+    Picks the deployment tier for each task and the order of fallback tiers
+
+    Routing starts at the role's tier and moves up when the prompt exceeds the
+    tier's size limit or its observed quality for the role is too low. Tiers
+    that are throttled or slower than their latency SLO are moved to the end
+    of the candidate list, so they are only used when nothing else is left.
+    """
+
+    def __init__(self,
+                 tiers: List[ModelTier] = None,
+                 role_tiers: Dict[AgentRole, str] = None,
+                 min_quality: float = 0.7,
+                 quality_min_samples: int = 5,
+                 quality_alpha: float = 0.2,
+                 latency_min_samples: int = 20,
+                 throttle_cooldown: float = 10.0):
+        """
+        Initialize model router
+
+        Args:
+            tiers: Deployment tiers from cheapest to most capable
+            role_tiers: Starting tier name per role
+            min_quality: Quality score below which a role moves to the next tier
+            quality_min_samples: Quality signals needed before quality affects routing
+            quality_alpha: Weight of the newest quality signal in the moving average
+            latency_min_samples: Latency samples needed before latency SLOs apply
+            throttle_cooldown: Seconds a throttled tier is avoided when the response
+                carries no retry-after
+        """
+        self.tiers = list(tiers or DEFAULT_TIERS)
+        if not self.tiers:
+            raise ValueError("Model router needs at least one tier")
+        self.role_tiers = {**DEFAULT_ROLE_TIERS, **(role_tiers or {})}
+        self.min_quality = min_quality
+        self.quality_min_samples = quality_min_samples
+        self.quality_alpha = quality_alpha
+        self.latency_min_samples = latency_min_samples
+        self.throttle_cooldown = throttle_cooldown
+        self.latency_tracker = LatencyTracker()
+        self._quality: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self._throttled_until: Dict[str, float] = {}
+        self._routed: Dict[str, int] = {tier.name: 0 for tier in self.tiers}
+        self._fallbacks: Dict[str, int] = {tier.name: 0 for tier in self.tiers}
+
+    def _tier_index(self, name: str) -> int:
+        for index, tier in enumerate(self.tiers):
+            if tier.name == name:
+                return index
+        return len(self.tiers) - 1
+
+    def _fits(self, tier: ModelTier, prompt_tokens: int) -> bool:
+        return tier.max_prompt_tokens is None or prompt_tokens <= tier.max_prompt_tokens
+
+    def _throttled(self, tier: ModelTier) -> bool:
+        return self._throttled_until.get(tier.model, 0.0) > time.monotonic()
+
+    def _slow(self, tier: ModelTier) -> bool:
+        if tier.latency_slo is None:
+            return False
+        p95 = self.latency_tracker.quantile(tier.model, 0.95, self.latency_min_samples)
+        return p95 is not None and p95 > tier.latency_slo
+
+    def quality(self, model: str, role: AgentRole) -> Optional[float]:
+        """Moving average of quality signals, or None until enough were recorded"""
+        score, samples = self._quality.get((model, role.value), (0.0, 0))
+        return score if samples >= self.quality_min_samples else None
+
+    def route(self, role: AgentRole, prompt_tokens: int = 0) -> List[ModelTier]:
+        """
+        Candidate tiers for a task, best first
+
+        Args:
+            role: Agent role of the task
+            prompt_tokens: Size of the rendered prompt
+
+        Returns:
+            The tier to use followed by its fallbacks
+        """
+        start = self._tier_index(self.role_tiers.get(role, self.tiers[-1].name))
+        while start < len(self.tiers) - 1:
+            tier = self.tiers[start]
+            quality = self.quality(tier.model, role)
+            if self._fits(tier, prompt_tokens) and (quality is None or quality >= self.min_quality):
+                break
+            start += 1
+
+        # Escalate first, then fall back to cheaper tiers that can still hold the prompt
+        ordered = self.tiers[start:] + list(reversed(self.tiers[:start]))
+        fitting = [tier for tier in ordered if self._fits(tier, prompt_tokens)] or ordered
+        healthy = [tier for tier in fitting if not self._throttled(tier) and not self._slow(tier)]
+        degraded = [tier for tier in fitting if tier not in healthy]
+        candidates = healthy + degraded
+
+        self._routed[candidates[0].name] += 1
+        return candidates
+
+    def record_success(self, tier: ModelTier, latency: float):
+        """Record the latency of a successful call"""
+        self.latency_tracker.record(tier.model, latency)
+
+    def record_failure(self, tier: ModelTier, error_class: str, retry_after: Optional[float] = None):
+        """Record a failed call; throttled tiers are avoided for a cooldown period"""
+        self._fallbacks[tier.name] += 1
+        if error_class == "rate_limit":
+            cooldown = retry_after if retry_after is not None else self.throttle_cooldown
+            self._throttled_until[tier.model] = time.monotonic() + cooldown
+        logger.warning("Model tier failed, falling back",
+                      tier=tier.name,
+                      model=tier.model,
+                      error_class=error_class)
+
+    def record_quality(self, model: str, role: AgentRole, score: float):
+        """Record a quality signal in [0, 1] for output of a model in a role"""
+        key = (model, role.value)
+        previous, samples = self._quality.get(key, (score, 0))
+        self._quality[key] = (
+            (1 - self.quality_alpha) * previous + self.quality_alpha * score,
+            samples + 1
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Routing counts, fallbacks, latency and throttling per tier"""
+        return {
+            tier.name: {
+                "model": tier.model,
+                "routed": self._routed[tier.name],
+                "fallbacks": self._fallbacks[tier.name],
+                "p95": self.latency_tracker.quantile(tier.model, 0.95),
+                "throttled": self._throttled(tier)
+            }
+            for tier in self.tiers
+        }
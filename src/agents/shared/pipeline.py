@@ -0,0 +1,397 @@
+"""
+Pipeline
+Overlapped execution of the analyst, generator and validator stages
+"""
+
+import re
+import asyncio
+from typing import Dict, List, Any, Optional, Callable, AsyncIterator, Union, Tuple
+
+import structlog
+
+from .agent_models import AgentRole, TaskRequest, TaskResponse
+from .workflow_engine import (
+    WorkflowNode, TaskExecutor, CompletionCallback, ResultForwarder, COMPLETED_STATUSES
+)
+from .structured_output import IncrementalJSONParser
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+StreamExecutor = Callable[[TaskRequest], AsyncIterator[Union[str, TaskResponse]]]
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+class StreamingTextField:
+    """
+    Text of one string member of a streamed JSON object, as it arrives
+
+    Streams that do not start with a JSON object (or a code fence around
+    one) are passed through unchanged.
+    """
+
+    def __init__(self, key: str):
+        self._opening = re.compile(r'"%s"\s*:\s*"' % re.escape(key))
+        self._mode: Optional[str] = None
+        self._pending = ""
+        self._in_value = False
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add streamed text and return the newly decoded field text"""
+        if self._mode is None:
+            stripped = (self._pending + chunk).lstrip()
+            if not stripped:
+                self._pending += chunk
+                return ""
+            self._mode = "json" if stripped[0] in "{`" else "text"
+            chunk, self._pending = self._pending + chunk, ""
+        if self._mode == "text":
+            return chunk
+        if self._done:
+            return ""
+
+        text = self._pending + chunk
+        self._pending = ""
+        if not self._in_value:
+            match = self._opening.search(text)
+            if match is None:
+                # Keep a tail in case the key is split across chunks
+                self._pending = text[-64:]
+                return ""
+            self._in_value = True
+            text = text[match.end():]
+        return self._decode(text)
+
+    def _decode(self, text: str) -> str:
+        output = []
+        index = 0
+        while index < len(text):
+            char = text[index]
+            if char == '"':
+                self._done = True
+                break
+            if char != "\\":
+                output.append(char)
+                index += 1
+                continue
+            if index + 1 >= len(text):
+                self._pending = text[index:]
+                break
+            escape = text[index + 1]
+            if escape == "u":
+                if index + 6 > len(text):
+                    self._pending = text[index:]
+                    break
+                output.append(chr(int(text[index + 2:index + 6], 16)))
+                index += 6
+            else:
+                output.append(_ESCAPES.get(escape, escape))
+                index += 2
+        return "".join(output)
+
+class SectionSplitter:
+    """
+    Splits streamed text into sections at blank lines
+
+    Paragraphs are grouped until a section holds at least ``min_chars``
+    characters, so validation calls are not spent on single lines.
+    """
+
+    def __init__(self, min_chars: int = 400):
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._section: List[str] = []
+        self._section_chars = 0
+
+    def feed(self, text: str) -> List[str]:
+        """Add text and return the sections it completed"""
+        self._buffer += text
+        sections = []
+        while True:
+            boundary = self._buffer.find("\n\n")
+            if boundary < 0:
+                break
+            paragraph = self._buffer[:boundary].strip()
+            self._buffer = self._buffer[boundary + 2:]
+            if not paragraph:
+                continue
+            self._section.append(paragraph)
+            self._section_chars += len(paragraph)
+            if self._section_chars >= self.min_chars:
+                sections.append("\n\n".join(self._section))
+                self._section, self._section_chars = [], 0
+        return sections
+
+    def flush(self) -> List[str]:
+        """The remaining text as a final section, if any"""
+        if self._buffer.strip():
+            self._section.append(self._buffer.strip())
+        self._buffer = ""
+        sections = ["\n\n".join(self._section)] if self._section else []
+        self._section, self._section_chars = [], 0
+        return sections
+
+def merge_validations(task_id: str,
+                      responses: List[TaskResponse],
+                      execution_time: float) -> TaskResponse:
+    """Combine per-section validator responses into one validator response"""
+    results = [response.result if isinstance(response.result, dict) else {} for response in responses]
+    statuses = [response.status for response in responses]
+    if "error" in statuses:
+        status = "error"
+    elif all(status == "skipped" for status in statuses):
+        status = "skipped"
+    elif all(status == "simulated" for status in statuses):
+        status = "simulated"
+    else:
+        status = "success"
+
+    validation_statuses = [result.get("validation_status") for result in results]
+    if "failed" in validation_statuses:
+        validation_status = "failed"
+    elif validation_statuses and all(value == "passed" for value in validation_statuses):
+        validation_status = "passed"
+    else:
+        validation_status = "needs_review"
+
+    scores = [result["quality_score"] for result in results
+              if isinstance(result.get("quality_score"), (int, float))]
+    result = {
+        "agent_role": AgentRole.VALIDATOR.value,
+        "content": "\n\n".join(result.get("content", "") for result in results),
+        "validation_status": validation_status,
+        "approved": bool(results) and all(result.get("approved") is True for result in results),
+        "quality_score": sum(scores) / len(scores) if scores else 0.0,
+        "issues_found": [issue for result in results for issue in result.get("issues_found", [])],
+        "compliance_checks": [check for result in results for check in result.get("compliance_checks", [])],
+        "structured": bool(results) and all(result.get("structured") for result in results),
+        "sections": len(responses),
+        "section_results": results
+    }
+    errors = [response.error for response in responses if response.error]
+    return TaskResponse(
+        task_id=task_id,
+        agent_role=AgentRole.VALIDATOR,
+        status=status,
+        result=result,
+        metadata={
+            "pipelined": True,
+            "sections": len(responses),
+            "tokens_used": sum(response.metadata.get("tokens_used", 0) for response in responses),
+            "cost": sum(response.metadata.get("cost", 0.0) for response in responses)
+        },
+        execution_time=execution_time,
+        error="; ".join(errors) if errors else None
+    )
+
+class PipelinedWorkflow:
+    """
+    Runs analyst -> generator -> validator with overlapping stages
+
+    The generator starts as soon as the streamed analysis contains the
+    ``ready_fields`` (the insights list by default), and each generated
+    section is validated while generation continues. Streamed stages are
+    retried only until their first delta; a later failure fails the stage.
+    """
+
+    def __init__(self,
+                 stream_executor: StreamExecutor,
+                 executor: TaskExecutor,
+                 forward: Optional[ResultForwarder] = None,
+                 ready_fields: Tuple[str, ...] = ("insights",),
+                 min_section_chars: int = 400):
+        """
+        Initialize pipelined workflow
+
+        Args:
+            stream_executor: Async generator function streaming one TaskRequest
+            executor: Coroutine function executing one TaskRequest, used for validation
+            forward: Maps an upstream response to the value injected downstream
+            ready_fields: Analysis members the generator needs before it starts
+            min_section_chars: Minimum size of a validated section
+        """
+        self.stream_executor = stream_executor
+        self.executor = executor
+        self.forward = forward or (lambda response: response.result)
+        self.ready_fields = ready_fields
+        self.min_section_chars = min_section_chars
+
+    @staticmethod
+    def supports(nodes: List[WorkflowNode]) -> bool:
+        """Whether the graph is the plain analyst -> generator -> validator chain"""
+        by_id = {node.node_id: node for node in nodes}
+        if set(by_id) != {"analyst", "generator", "validator"}:
+            return False
+        return (by_id["generator"].inputs == {"analysis_results": "analyst"}
+                and by_id["validator"].inputs == {"content_to_validate": "generator"}
+                and not any(node.depends_on for node in nodes))
+
+    @staticmethod
+    def _request(workflow_id: str, node: WorkflowNode, task_suffix: str,
+                 input_data: Dict[str, Any]) -> TaskRequest:
+        return TaskRequest(
+            task_id=f"{workflow_id}_{task_suffix}",
+            agent_role=node.agent_role,
+            input_data=input_data,
+            context=node.context,
+            priority=node.priority,
+            timeout=node.timeout
+        )
+
+    async def _stream(self, task_request: TaskRequest,
+                      on_delta: Callable[[str], None]) -> TaskResponse:
+        response = None
+        async for item in self.stream_executor(task_request):
+            if isinstance(item, TaskResponse):
+                response = item
+            else:
+                on_delta(item)
+        return response
+
+    async def run(self,
+                  nodes: List[WorkflowNode],
+                  workflow_id: str = "default",
+                  completed: Optional[Dict[str, TaskResponse]] = None,
+                  on_complete: Optional[CompletionCallback] = None) -> Tuple[Dict[str, TaskResponse], Dict[str, float]]:
+        """
+        Execute the three stages with overlap
+
+        Args:
+            nodes: The analyst, generator and validator nodes
+            workflow_id: Prefix for generated task ids
+            completed: Responses of a previous run, reused like WorkflowEngine.run
+            on_complete: Awaited with (node_id, response) after each executed stage
+
+        Returns:
+            Mapping of node id to its TaskResponse, and the stage timeline in
+            seconds since the start
+        """
+        by_id = {node.node_id: node for node in nodes}
+        completed = completed or {}
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        timeline: Dict[str, float] = {}
+        analysis_ready = loop.create_future()
+
+        def mark(event: str):
+            timeline.setdefault(event, loop.time() - start)
+
+        def reusable(node_id: str) -> Optional[TaskResponse]:
+            previous = completed.get(node_id)
+            return previous if previous is not None and previous.status in COMPLETED_STATUSES else None
+
+        async def finish(node_id: str, response: TaskResponse, reused: bool) -> TaskResponse:
+            mark(f"{node_id}_done")
+            if not reused and on_complete is not None:
+                await on_complete(node_id, response)
+            return response
+
+        async def analyst() -> TaskResponse:
+            node = by_id["analyst"]
+            previous = reusable("analyst")
+            if previous is not None:
+                analysis_ready.set_result(self.forward(previous))
+                return await finish("analyst", previous, True)
+
+            parser = IncrementalJSONParser()
+
+            def on_delta(delta: str):
+                if analysis_ready.done() or not parser.feed(delta):
+                    return
+                if all(field in parser.fields for field in self.ready_fields):
+                    mark("analysis_ready")
+                    analysis_ready.set_result(dict(parser.fields, partial=True))
+
+            try:
+                response = await self._stream(
+                    self._request(workflow_id, node, node.node_id, dict(node.input_data)), on_delta
+                )
+            except BaseException:
+                if not analysis_ready.done():
+                    analysis_ready.cancel()
+                raise
+            if not analysis_ready.done():
+                mark("analysis_ready")
+                analysis_ready.set_result(self.forward(response))
+            return await finish("analyst", response, False)
+
+        async def generator_and_validator(analyst_reused: bool) -> Tuple[TaskResponse, TaskResponse]:
+            analysis = await analysis_ready
+            node = by_id["generator"]
+            validator_node = by_id["validator"]
+            validations: List[asyncio.Task] = []
+
+            def validate(section: str):
+                mark("validation_started")
+                index = len(validations)
+                input_data = dict(validator_node.input_data,
+                                  content_to_validate={"generated_content": section, "section": index})
+                validations.append(asyncio.create_task(self.executor(
+                    self._request(workflow_id, validator_node, f"validator_{index}", input_data)
+                )))
+
+            previous = reusable("generator") if analyst_reused else None
+            splitter = SectionSplitter(self.min_section_chars)
+            if previous is not None:
+                generator = await finish("generator", previous, True)
+                sections = splitter.feed(str(previous.result.get("generated_content", "")))
+            else:
+                mark("generator_started")
+                text_field = StreamingTextField("generated_content")
+
+                def on_delta(delta: str):
+                    for section in splitter.feed(text_field.feed(delta)):
+                        validate(section)
+
+                generator = await self._stream(
+                    self._request(workflow_id, node, node.node_id,
+                                  dict(node.input_data, analysis_results=analysis)),
+                    on_delta
+                )
+                generator = await finish("generator", generator, False)
+                sections = []
+
+            previous_validation = reusable("validator") if previous is not None else None
+            if previous_validation is not None:
+                return generator, await finish("validator", previous_validation, True)
+
+            for section in sections:
+                validate(section)
+            if generator.status in COMPLETED_STATUSES:
+                for section in splitter.flush():
+                    validate(section)
+            if not validations:
+                # Nothing to split, e.g. a failed generator: validate its result as a whole
+                input_data = dict(validator_node.input_data, content_to_validate=self.forward(generator))
+                validations.append(asyncio.create_task(self.executor(
+                    self._request(workflow_id, validator_node, "validator", input_data)
+                )))
+
+            validation_start = loop.time()
+            responses = await asyncio.gather(*validations)
+            validator = merge_validations(f"{workflow_id}_validator", list(responses),
+                                          loop.time() - validation_start)
+            return generator, await finish("validator", validator, False)
+
+        # Downstream stages wait on the analysis prefix, not on the analyst task
+        analyst_task = asyncio.create_task(analyst())
+        downstream = asyncio.create_task(generator_and_validator(reusable("analyst") is not None))
+        try:
+            analyst_response, (generator_response, validator_response) = await asyncio.gather(
+                analyst_task, downstream
+            )
+        except BaseException:
+            analyst_task.cancel()
+            downstream.cancel()
+            raise
+
+        logger.info("Pipelined workflow completed",
+                    workflow_id=workflow_id,
+                    timeline=timeline)
+
+        return {
+            "analyst": analyst_response,
+            "generator": generator_response,
+            "validator": validator_response
+        }, timeline
@@ -0,0 +1,129 @@
+"""
+Prompt Renderer
+Deterministic, prefix-cache-friendly rendering of agent prompts
+"""
+
+import json
+from enum import Enum
+from functools import lru_cache
+from dataclasses import dataclass, asdict, is_dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+from .agent_models import AgentConfig
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+def canonical_json(value: Any) -> str:
+    """Compact JSON with sorted keys; equal values always render to identical text"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"),
+                      ensure_ascii=False, default=_json_default)
+
+def render_value(value: Any) -> str:
+    """Prompt text of a value: strings as-is, everything else as canonical JSON"""
+    if isinstance(value, str):
+        return value
+    return canonical_json(value)
+
+def config_fingerprint(agent_config: AgentConfig) -> Tuple:
+    """Hashable identity of an agent configuration"""
+    return (
+        agent_config.role.value,
+        agent_config.model,
+        agent_config.temperature,
+        agent_config.max_tokens,
+        agent_config.system_prompt,
+        tuple(agent_config.capabilities or ())
+    )
+
+@lru_cache(maxsize=256)
+def _canonical_config(fingerprint: Tuple) -> bytes:
+    role, model, temperature, max_tokens, system_prompt, capabilities = fingerprint
+    return canonical_json({
+        "role": role,
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "system_prompt": system_prompt,
+        "capabilities": list(capabilities)
+    }).encode("utf-8")
+
+def canonical_config(agent_config: AgentConfig) -> bytes:
+    """Canonical bytes of an agent configuration, computed once per distinct configuration"""
+    return _canonical_config(config_fingerprint(agent_config))
+
+def canonical_messages(messages: List[Dict[str, str]]) -> bytes:
+    """Canonical bytes of a message list"""
+    return canonical_json(messages).encode("utf-8")
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """Static part of an agent's prompt, rendered once per AgentConfig"""
+    system_prompt: str
+
+    def system_message(self) -> Dict[str, str]:
+        return {"role": "system", "content": self.system_prompt}
+
+class PromptRenderer:
+    """
+    Renders agent prompts so identical requests produce byte-identical messages
+
+    The system prompt comes first and is the same for every task of a role,
+    followed by a single user message holding the context and then the task
+    input, i.e. static content first and volatile data last. This keeps the
+    shared prefix long enough for provider-side prompt caching.
+    """
+
+    def __init__(self, max_templates: int = 256):
+        """
+        Initialize prompt renderer
+
+        Args:
+            max_templates: Maximum number of memoized templates
+        """
+        self.max_templates = max_templates
+        self._templates: Dict[Tuple, PromptTemplate] = {}
+
+    def template(self, agent_config: AgentConfig) -> PromptTemplate:
+        """Memoized template for an agent configuration"""
+        fingerprint = config_fingerprint(agent_config)
+        template = self._templates.get(fingerprint)
+        if template is None:
+            if len(self._templates) >= self.max_templates:
+                self._templates.clear()
+            template = PromptTemplate(system_prompt=agent_config.system_prompt)
+            self._templates[fingerprint] = template
+        return template
+
+    def render_input(self, input_data: Any) -> str:
+        """Task input as ``key: value`` lines in sorted key order"""
+        if isinstance(input_data, dict):
+            return "\n".join(
+                f"{key}: {render_value(input_data[key])}" for key in sorted(input_data, key=str)
+            )
+        return render_value(input_data)
+
+    def render(self,
+               agent_config: AgentConfig,
+               context: Optional[Any],
+               input_data: Any) -> List[Dict[str, str]]:
+        """
+        Render the chat messages for a task
+
+        Returns:
+            System message followed by one user message with context and input
+        """
+        template = self.template(agent_config)
+        task_content = self.render_input(input_data)
+        if context:
+            task_content = f"Context: {render_value(context)}\n\n{task_content}"
+        return [
+            template.system_message(),
+            {"role": "user", "content": task_content}
+        ]
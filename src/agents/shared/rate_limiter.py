@@ -0,0 +1,288 @@
+"""
+Rate Limiter
+Client-side token-bucket rate limiting with adaptive (AIMD) concurrency per model deployment
+"""
+
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, AsyncIterator, Mapping
+
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+# Rough token estimate used before the real usage is known
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+@dataclass
+class RateLimitConfig:
+    """Quota and concurrency settings for a model deployment"""
+    tokens_per_minute: int = 80000
+    requests_per_minute: int = 480
+    initial_concurrency: int = 8
+    min_concurrency: int = 1
+    max_concurrency: int = 64
+    additive_increase: float = 1.0
+    multiplicative_decrease: float = 0.5
+    decrease_cooldown: float = 1.0
+
+@dataclass
+class Reservation:
+    """Capacity reserved for one request; filled in by the caller as the request completes"""
+    estimated_tokens: int
+    actual_tokens: Optional[int] = None
+    headers: Optional[Mapping[str, str]] = None
+    throttled: bool = False
+    wait_time: float = 0.0
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Seconds to wait according to retry-after-ms / retry-after headers"""
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue
+    return None
+
+class TokenBucket:
+    """Token bucket refilled continuously up to its capacity"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    async def acquire(self, amount: float) -> float:
+        """
+        Wait until ``amount`` tokens are available and take them
+
+        Requests larger than the bucket only wait for a full bucket.
+
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # The lock keeps waiters first-come, first-served
+        async with self._lock:
+            while True:
+                self._refill()
+                now = time.monotonic()
+                if self.blocked_until > now:
+                    delay = self.blocked_until - now
+                elif self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                else:
+                    delay = (amount - self.tokens) / self.refill_per_second
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def adjust(self, delta: float):
+        """Return (positive) or charge (negative) tokens after the real cost is known"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+    def cap(self, remaining: float):
+        """Never believe there are more tokens left than the server reports"""
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+
+    def block_for(self, seconds: float):
+        """Stop handing out tokens for a while"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit adjusted by additive increase, multiplicative decrease"""
+
+    def __init__(self,
+                 initial: int = 8,
+                 minimum: int = 1,
+                 maximum: int = 64,
+                 additive_increase: float = 1.0,
+                 multiplicative_decrease: float = 0.5,
+                 decrease_cooldown: float = 1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.decrease_cooldown = decrease_cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait for a free concurrency slot"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self):
+        """Free a concurrency slot"""
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        """Grow the limit by ``additive_increase`` per full window of successes"""
+        self.limit = min(self.maximum, self.limit + self.additive_increase / self.limit)
+
+    def on_throttle(self):
+        """Shrink the limit, at most once per cooldown so a burst of 429s counts once"""
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * self.multiplicative_decrease)
+
+class DeploymentRateLimiter:
+    """
+    Token, request and concurrency limits for one model deployment
+    """
+
+    def __init__(self, config: RateLimitConfig = None):
+        self.config = config or RateLimitConfig()
+        self.tokens = TokenBucket(self.config.tokens_per_minute, self.config.tokens_per_minute / 60.0)
+        self.requests = TokenBucket(self.config.requests_per_minute, self.config.requests_per_minute / 60.0)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial=self.config.initial_concurrency,
+            minimum=self.config.min_concurrency,
+            maximum=self.config.max_concurrency,
+            additive_increase=self.config.additive_increase,
+            multiplicative_decrease=self.config.multiplicative_decrease,
+            decrease_cooldown=self.config.decrease_cooldown
+        )
+        self.throttled_count = 0
+
+    @staticmethod
+    def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Estimate the quota cost of a request from its prompt size and max_tokens"""
+        prompt_chars = sum(len(message.get("content") or "") for message in messages)
+        prompt_tokens = prompt_chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS * len(messages)
+        return prompt_tokens + (max_tokens or 0)
+
+    @asynccontextmanager
+    async def reserve(self, estimated_tokens: int) -> AsyncIterator[Reservation]:
+        """
+        Hold request, token and concurrency capacity for the duration of a request
+
+        Set ``actual_tokens`` and ``headers`` on the yielded reservation when the
+        response arrives; exceptions with ``status_code == 429`` count as throttling.
+        """
+        start = time.monotonic()
+        await self.concurrency.acquire()
+        reservation = Reservation(estimated_tokens=estimated_tokens)
+        succeeded = False
+        try:
+            await self.requests.acquire(1)
+            await self.tokens.acquire(estimated_tokens)
+            reservation.wait_time = time.monotonic() - start
+            yield reservation
+            succeeded = True
+        except Exception as e:
+            if getattr(e, "status_code", None) == 429:
+                reservation.throttled = True
+            if reservation.headers is None:
+                reservation.headers = getattr(getattr(e, "response", None), "headers", None)
+            raise
+        finally:
+            self._settle(reservation, succeeded)
+            await self.concurrency.release()
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]):
+        """Align local buckets with x-ratelimit-remaining-* response headers"""
+        if not headers:
+            return
+        for name, bucket in (("x-ratelimit-remaining-tokens", self.tokens),
+                             ("x-ratelimit-remaining-requests", self.requests)):
+            value = headers.get(name)
+            if value is None:
+                continue
+            try:
+                bucket.cap(float(value))
+            except ValueError:
+                continue
+
+    def _settle(self, reservation: Reservation, succeeded: bool):
+        if reservation.actual_tokens is not None:
+            self.tokens.adjust(reservation.estimated_tokens - reservation.actual_tokens)
+        self.update_from_headers(reservation.headers)
+
+        if reservation.throttled:
+            self.throttled_count += 1
+            self.concurrency.on_throttle()
+            retry_after = parse_retry_after(reservation.headers)
+            if retry_after:
+                self.tokens.block_for(retry_after)
+            logger.warning("Deployment throttled, reducing concurrency",
+                          concurrency_limit=self.concurrency.limit,
+                          retry_after=retry_after)
+        elif succeeded:
+            self.concurrency.on_success()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limiter state"""
+        return {
+            "concurrency_limit": self.concurrency.limit,
+            "in_flight": self.concurrency.in_flight,
+            "available_tokens": self.tokens.tokens,
+            "available_requests": self.requests.tokens,
+            "throttled_count": self.throttled_count
+        }
+
+class RateLimiterRegistry:
+    """
+    Rate limiters keyed by deployment endpoint and model
+    """
+
+    def __init__(self,
+                 model_configs: Dict[str, RateLimitConfig] = None,
+                 default_config: RateLimitConfig = None):
+        """
+        Initialize rate limiter registry
+
+        Args:
+            model_configs: Quota settings per model (deployment) name
+            default_config: Settings for models without an explicit entry
+        """
+        self.model_configs = model_configs or {}
+        self.default_config = default_config or RateLimitConfig()
+        self._limiters: Dict[Tuple[str, str], DeploymentRateLimiter] = {}
+
+    def get(self, deployment: str, model: str) -> DeploymentRateLimiter:
+        """Limiter for a deployment and model, created on first use"""
+        key = (deployment, model)
+        if key not in self._limiters:
+            config = self.model_configs.get(model, self.default_config)
+            self._limiters[key] = DeploymentRateLimiter(config)
+        return self._limiters[key]
+
+    def max_concurrency(self) -> int:
+        """Upper bound on concurrent requests across all configured models"""
+        configs = list(self.model_configs.values()) or [self.default_config]
+        return sum(config.max_concurrency for config in configs)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """State of every limiter, keyed by 'deployment/model'"""
+        return {
+            f"{deployment}/{model}": limiter.stats()
+            for (deployment, model), limiter in self._limiters.items()
+        }
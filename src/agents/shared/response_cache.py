@@ -0,0 +1,272 @@
+"""
+Response Cache
+Bounded-memory LRU/TTL cache for agent task responses
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+import structlog
+
+from .agent_models import AgentRole, AgentConfig
+from .prompt_renderer import canonical_config, canonical_messages
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+def make_cache_key(agent_config: AgentConfig, messages: List[Dict[str, str]]) -> str:
+    """Hash of the canonical bytes of (role, agent configuration, messages)"""
+    digest = hashlib.sha256(canonical_config(agent_config))
+    digest.update(b"\n")
+    digest.update(canonical_messages(messages))
+    return digest.hexdigest()
+
+class CacheBackend:
+    """Storage backend interface for the response cache"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored value, or None when missing or expired"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        """Store a value with an optional time-to-live in seconds"""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove all entries"""
+        raise NotImplementedError
+
+class InMemoryCacheBackend(CacheBackend):
+    """In-process LRU cache bounded by total value size in bytes"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if len(value) > self.max_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, expires_at)
+            self.current_bytes += len(value)
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= len(entry[0])
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    On-disk LRU cache stored in a SQLite database
+
+    Reads do not write: last-access times are kept in memory and written in
+    one statement before the next eviction or on close, so a cache hit costs
+    a single SELECT.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path or os.getenv("AGENT_CACHE_PATH", "agent_response_cache.sqlite3")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> last access time not yet written
+        self._accessed: Dict[str, float] = {}
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_response_cache_access ON response_cache (last_access)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                # Deleted by the next eviction
+                return None
+            self._accessed[key] = now
+            return bytes(value)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), expires_at, now)
+            )
+            self._accessed.pop(key, None)
+            self._evict(now)
+            self._connection.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._connection.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            self._connection.commit()
+
+    def clear(self):
+        with self._lock:
+            self._accessed.clear()
+            self._connection.execute("DELETE FROM response_cache")
+            self._connection.commit()
+
+    def close(self):
+        """Write pending last-access times and close the underlying database connection"""
+        with self._lock:
+            self._write_accessed()
+            self._connection.commit()
+            self._connection.close()
+
+    def _write_accessed(self):
+        if self._accessed:
+            self._connection.executemany(
+                "UPDATE response_cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones until under the size limit"""
+        self._write_accessed()
+        self._connection.execute(
+            "DELETE FROM response_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        total = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM response_cache"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._connection.execute(
+            "SELECT key, size FROM response_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._connection.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            total -= size
+
+class ResponseCache:
+    """
+    Caching policy for agent task responses on top of a pluggable backend
+    """
+
+    def __init__(self,
+                 backend: CacheBackend = None,
+                 default_ttl: Optional[float] = 3600.0,
+                 role_ttls: Dict[AgentRole, Optional[float]] = None,
+                 max_temperature: float = 0.3):
+        """
+        Initialize response cache
+
+        Args:
+            backend: Storage backend, in-memory LRU by default
+            default_ttl: Time-to-live in seconds for roles without an explicit TTL
+            role_ttls: Per-role TTLs; a TTL of 0 disables caching for that role
+            max_temperature: Responses above this temperature are never cached
+        """
+        self.backend = backend or InMemoryCacheBackend()
+        self.default_ttl = default_ttl
+        self.role_ttls = role_ttls or {}
+        self.max_temperature = max_temperature
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, role: AgentRole) -> Optional[float]:
+        """Time-to-live for a role"""
+        return self.role_ttls.get(role, self.default_ttl)
+
+    def is_cacheable(self, agent_config: AgentConfig) -> bool:
+        """Whether responses for this configuration may be cached"""
+        if agent_config.temperature > self.max_temperature:
+            return False
+        return self.ttl_for(agent_config.role) != 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response payload and record the hit or miss"""
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning("Response cache lookup failed", error=str(e))
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(value.decode("utf-8"))
+
+    def set(self, key: str, role: AgentRole, payload: Dict[str, Any]):
+        """Store a response payload for a role"""
+        try:
+            value = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+            self.backend.set(key, value, self.ttl_for(role))
+        except Exception as e:
+            logger.warning("Response cache store failed", error=str(e))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
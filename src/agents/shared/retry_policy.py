@@ -0,0 +1,110 @@
+"""
+Retry Policy
+Retries with exponential backoff and hedged requests for tail-latency control
+"""
+
+import random
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Deque
+
+from .rate_limiter import parse_retry_after
+
+RETRYABLE_STATUS_CLASSES = {408: "timeout", 429: "rate_limit"}
+
+def classify_error(error: Exception) -> str:
+    """
+    Map an exception to an error class
+
+    Returns:
+        One of "rate_limit", "timeout", "server", "connection" or "client";
+        "client" errors are never retried
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code in RETRYABLE_STATUS_CLASSES:
+        return RETRYABLE_STATUS_CLASSES[status_code]
+    if status_code is not None and status_code >= 500:
+        return "server"
+    if status_code is not None:
+        return "client"
+
+    # openai raises APITimeoutError / APIConnectionError without a status code
+    name = type(error).__name__
+    if isinstance(error, asyncio.TimeoutError) or "Timeout" in name:
+        return "timeout"
+    if isinstance(error, ConnectionError) or "Connection" in name:
+        return "connection"
+    return "client"
+
+def _default_max_attempts() -> Dict[str, int]:
+    return {"rate_limit": 5, "server": 3, "timeout": 2, "connection": 3}
+
+@dataclass
+class RetryPolicy:
+    """Retry budget per error class with exponential backoff and jitter"""
+    max_attempts: Dict[str, int] = field(default_factory=_default_max_attempts)
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    jitter: float = 1.0
+    respect_retry_after: bool = True
+
+    def attempts_for(self, error_class: str) -> int:
+        """Total attempts allowed for an error class, including the first"""
+        return self.max_attempts.get(error_class, 1)
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """
+        Delay before the next attempt
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+            error: The exception raised by that attempt
+        """
+        if self.respect_retry_after:
+            headers = getattr(getattr(error, "response", None), "headers", None)
+            retry_after = parse_retry_after(headers)
+            if retry_after is not None:
+                return min(retry_after, self.max_delay)
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * random.uniform(1.0 - self.jitter, 1.0)
+
+@dataclass
+class HedgingPolicy:
+    """Send a duplicate request when the first one is slower than usual"""
+    enabled: bool = True
+    quantile: float = 0.95
+    min_samples: int = 20
+    min_delay: float = 0.05
+    max_hedges: int = 1
+
+class LatencyTracker:
+    """Sliding window of successful request latencies per key"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float):
+        """Add a latency sample"""
+        self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def quantile(self, key: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """Latency quantile, or None until enough samples were recorded"""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Sample count, p50 and p95 per key"""
+        return {
+            key: {
+                "samples": len(samples),
+                "p50": self.quantile(key, 0.5),
+                "p95": self.quantile(key, 0.95)
+            }
+            for key, samples in self._samples.items()
+        }
@@ -0,0 +1,292 @@
+"""
+Semantic Cache
+Similarity-based response cache over a local NumPy vector index
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import copy
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from .agent_models import AgentRole
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+class HashingEmbedder:
+    """
+    Local text embedding by feature hashing of word unigrams and bigrams
+
+    Needs no model or network call; paraphrases that share most of their
+    vocabulary land close together, reworded ones do not.
+    """
+
+    def __init__(self, dim: int = 512, bigram_weight: float = 0.5):
+        self.dim = dim
+        self.bigram_weight = bigram_weight
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        sign = 1.0 if digest & 0x80000000 else -1.0
+        return digest % self.dim, sign
+
+    def embed(self, text: str) -> np.ndarray:
+        """Unit-length float32 vector of a text"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        words = TOKEN_PATTERN.findall(text.lower())
+        for word in words:
+            index, sign = self._bucket(word)
+            vector[index] += sign
+        for first, second in zip(words, words[1:]):
+            index, sign = self._bucket(f"{first} {second}")
+            vector[index] += sign * self.bigram_weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+@dataclass
+class SemanticEntry:
+    """Payload and bookkeeping of one index slot"""
+    scope: str
+    payload: Dict[str, Any]
+    created_at: float
+    last_access: float
+    expires_at: Optional[float] = None
+
+class VectorIndex:
+    """
+    Fixed-capacity vector index with brute-force top-k cosine search
+
+    Vectors live in one preallocated in-memory matrix. With a directory,
+    ``flush()`` writes them to a new ``vectors-<generation>.npy`` and then
+    replaces ``entries.json``, which names that file: a crash at any point
+    leaves the previous vectors and entries paired. When full, the least
+    recently used slot is reused.
+    """
+
+    def __init__(self, dim: int, capacity: int = 10000, directory: Optional[str] = None):
+        """
+        Initialize vector index
+
+        Args:
+            dim: Vector dimension
+            capacity: Maximum number of entries
+            directory: Persist the index here; in-memory only when None
+        """
+        self.dim = dim
+        self.capacity = capacity
+        self.directory = directory
+        self.entries: List[Optional[SemanticEntry]] = [None] * capacity
+        self._scope_codes: Dict[str, int] = {}
+        # Scope code per slot, -1 for empty slots
+        self._scopes = np.full(capacity, -1, dtype=np.int32)
+        # Expiry time per slot, inf for entries without a TTL and empty slots
+        self._expires = np.full(capacity, np.inf)
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._generation = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._scopes >= 0))
+
+    def _scope_code(self, scope: str) -> int:
+        if scope not in self._scope_codes:
+            self._scope_codes[scope] = len(self._scope_codes)
+        return self._scope_codes[scope]
+
+    def _free_slot(self) -> int:
+        empty = np.flatnonzero(self._scopes < 0)
+        if empty.size:
+            return int(empty[0])
+        slot = min(range(self.capacity), key=lambda index: self.entries[index].last_access)
+        return slot
+
+    def add(self, scope: str, vector: np.ndarray, payload: Dict[str, Any], ttl: Optional[float] = None):
+        """Insert a vector with its payload, evicting the least recently used entry if full"""
+        now = time.time()
+        slot = self._free_slot()
+        self.vectors[slot] = vector
+        self._scopes[slot] = self._scope_code(scope)
+        self._expires[slot] = now + ttl if ttl is not None else np.inf
+        self.entries[slot] = SemanticEntry(
+            scope=scope,
+            payload=payload,
+            created_at=now,
+            last_access=now,
+            expires_at=now + ttl if ttl is not None else None
+        )
+
+    def remove(self, slot: int):
+        self._scopes[slot] = -1
+        self._expires[slot] = np.inf
+        self.entries[slot] = None
+        self.vectors[slot] = 0.0
+
+    def search(self, scope: str, vector: np.ndarray, k: int = 1) -> List[Tuple[int, float]]:
+        """
+        Top-k most similar live entries within a scope
+
+        Expired entries in the scope are removed before ranking, so they never
+        take the place of a live match.
+
+        Returns:
+            (slot, cosine similarity) pairs, most similar first
+        """
+        code = self._scope_codes.get(scope)
+        if code is None:
+            return []
+        candidates = np.flatnonzero(self._scopes == code)
+        expired = self._expires[candidates] <= time.time()
+        for slot in candidates[expired]:
+            self.remove(int(slot))
+        candidates = candidates[~expired]
+        if not candidates.size:
+            return []
+        # Vectors are unit length, so the dot product is the cosine similarity
+        scores = self.vectors[candidates] @ vector
+        k = min(k, candidates.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(candidates[position]), float(scores[position])) for position in top]
+
+    def flush(self):
+        """Persist vectors and entry metadata"""
+        if not self.directory:
+            return
+        generation = self._generation + 1
+        vectors_name = f"vectors-{generation}.npy"
+        np.save(os.path.join(self.directory, vectors_name), self.vectors)
+        entries = {
+            str(slot): {
+                "scope": entry.scope,
+                "payload": entry.payload,
+                "created_at": entry.created_at,
+                "last_access": entry.last_access,
+                "expires_at": entry.expires_at
+            }
+            for slot, entry in enumerate(self.entries) if entry is not None
+        }
+        path = os.path.join(self.directory, "entries.json")
+        with open(f"{path}.tmp", "w") as entries_file:
+            json.dump({"generation": generation, "vectors": vectors_name, "entries": entries},
+                      entries_file, separators=(",", ":"), default=str)
+        # Replacing entries.json commits the new vectors file
+        os.replace(f"{path}.tmp", path)
+        previous = os.path.join(self.directory, f"vectors-{self._generation}.npy")
+        if os.path.exists(previous):
+            os.remove(previous)
+        self._generation = generation
+
+    def _load(self):
+        path = os.path.join(self.directory, "entries.json")
+        if not os.path.exists(path):
+            return
+        with open(path) as entries_file:
+            raw = json.load(entries_file)
+        vectors = np.load(os.path.join(self.directory, raw["vectors"]))
+        if vectors.shape != (self.capacity, self.dim):
+            raise ValueError(f"Persisted index has shape {vectors.shape}, "
+                             f"expected {(self.capacity, self.dim)}")
+        self.vectors = vectors.astype(np.float32, copy=False)
+        self._generation = raw["generation"]
+        for slot, entry in raw["entries"].items():
+            slot = int(slot)
+            self.entries[slot] = SemanticEntry(**entry)
+            self._scopes[slot] = self._scope_code(entry["scope"])
+            if entry["expires_at"] is not None:
+                self._expires[slot] = entry["expires_at"]
+
+class SemanticCache:
+    """
+    Serves responses for requests similar to earlier ones
+    """
+
+    def __init__(self,
+                 embedder: HashingEmbedder = None,
+                 index: VectorIndex = None,
+                 thresholds: Dict[AgentRole, float] = None,
+                 default_threshold: float = 0.92,
+                 roles: Optional[List[AgentRole]] = None,
+                 ttl: Optional[float] = 24 * 3600.0):
+        """
+        Initialize semantic cache
+
+        Args:
+            embedder: Text embedder with an ``embed(text) -> np.ndarray`` method
+            index: Vector index, in-memory by default
+            thresholds: Minimum cosine similarity per role for a hit
+            default_threshold: Threshold for roles without an explicit one
+            roles: Roles served from the cache; analyst and validator by default
+            ttl: Time-to-live of entries in seconds
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.index = index or VectorIndex(dim=self.embedder.dim)
+        self.thresholds = thresholds or {}
+        self.default_threshold = default_threshold
+        self.roles = set(roles if roles is not None else [AgentRole.ANALYST, AgentRole.VALIDATOR])
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._hit_similarity_total = 0.0
+
+    def enabled_for(self, role: AgentRole) -> bool:
+        return role in self.roles
+
+    def threshold_for(self, role: AgentRole) -> float:
+        return self.thresholds.get(role, self.default_threshold)
+
+    def lookup(self, scope: str, role: AgentRole, text: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Find a stored response for a similar request
+
+        Args:
+            scope: Partition of the index, e.g. role and agent configuration
+            role: Agent role, selects the similarity threshold
+            text: Rendered task input
+
+        Returns:
+            (payload, similarity), or None on a miss
+        """
+        matches = self.index.search(scope, self.embedder.embed(text))
+        if not matches or matches[0][1] < self.threshold_for(role):
+            self.misses += 1
+            return None
+        slot, similarity = matches[0]
+        entry = self.index.entries[slot]
+        entry.last_access = time.time()
+        self.hits += 1
+        self._hit_similarity_total += similarity
+        return copy.deepcopy(entry.payload), similarity
+
+    def store(self, scope: str, text: str, payload: Dict[str, Any]):
+        """Add a response for a request; the payload is copied, so callers may keep mutating theirs"""
+        try:
+            self.index.add(scope, self.embedder.embed(text), copy.deepcopy(payload), self.ttl)
+        except Exception as e:
+            logger.warning("Semantic cache store failed", error=str(e))
+
+    def flush(self):
+        """Persist the index when it is backed by a directory"""
+        self.index.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, average hit similarity and size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "avg_hit_similarity": self._hit_similarity_total / self.hits if self.hits else None,
+            "entries": len(self.index)
+        }
@@ -0,0 +1,86 @@
+"""
+Single Flight
+Coalescing of identical in-flight agent requests into one upstream call
+"""
+
+import asyncio
+from typing import Dict, Any, Callable, Awaitable, Tuple, Set, Optional
+
+import structlog
+
+from .agent_models import AgentRole, AgentConfig
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+class SingleFlight:
+    """
+    Shares one upstream call among concurrent identical requests
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same task. The call runs as its own task, so a
+    cancelled caller does not cancel it for the others.
+    """
+
+    def __init__(self,
+                 max_temperature: float = 0.3,
+                 roles: Optional[Set[AgentRole]] = None):
+        """
+        Initialize single flight
+
+        Args:
+            max_temperature: Requests above this temperature are sampled
+                independently and never coalesced
+            roles: Roles that may be coalesced, all by default
+        """
+        self.max_temperature = max_temperature
+        self.roles = roles
+        self.leaders = 0
+        self.followers = 0
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    def is_coalescable(self, agent_config: AgentConfig) -> bool:
+        """Whether requests for this configuration may share a call"""
+        if self.roles is not None and agent_config.role not in self.roles:
+            return False
+        return agent_config.temperature <= self.max_temperature
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await the in-flight call for a key, starting it if there is none
+
+        Args:
+            key: Canonical hash of the request
+            call: Coroutine function performing the upstream call
+
+        Returns:
+            (result, coalesced) where coalesced is True for callers that
+            joined a call started by another caller
+        """
+        task = self._in_flight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.followers += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return await asyncio.shield(task), coalesced
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved even when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Upstream calls, coalesced callers and the coalescing ratio"""
+        requests = self.leaders + self.followers
+        return {
+            "in_flight": len(self._in_flight),
+            "upstream_calls": self.leaders,
+            "coalesced": self.followers,
+            "coalescing_ratio": self.followers / requests if requests else 0.0
+        }
@@ -0,0 +1,190 @@
+"""
+State Store
+Step-level workflow checkpoints for resumable workflows
+"""
+
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import threading
+from typing import Dict, Any, Optional
+
+import structlog
+
+from .agent_models import TaskResponse, to_jsonable
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+class StateStore:
+    """
+    Storage interface for workflow checkpoints
+
+    Each completed step is stored as one record keyed by (workflow_id, step),
+    which maps directly onto a Cosmos DB container partitioned by workflow_id.
+    """
+
+    async def save_step(self, workflow_id: str, step: str, response: TaskResponse):
+        """Persist the response of a workflow step, replacing an earlier one"""
+        raise NotImplementedError
+
+    async def load_steps(self, workflow_id: str) -> Dict[str, TaskResponse]:
+        """All persisted step responses of a workflow"""
+        raise NotImplementedError
+
+    async def delete_workflow(self, workflow_id: str):
+        """Remove all checkpoints of a workflow"""
+        raise NotImplementedError
+
+    async def close(self):
+        """Release connections"""
+
+def _encode(response: TaskResponse) -> str:
+    return json.dumps(to_jsonable(response), separators=(",", ":"), default=str)
+
+def _decode(value: str) -> TaskResponse:
+    return TaskResponse.from_dict(json.loads(value))
+
+class InMemoryStateStore(StateStore):
+    """Process-local checkpoints, mainly for tests"""
+
+    def __init__(self):
+        self._steps: Dict[str, Dict[str, str]] = {}
+
+    async def save_step(self, workflow_id: str, step: str, response: TaskResponse):
+        self._steps.setdefault(workflow_id, {})[step] = _encode(response)
+
+    async def load_steps(self, workflow_id: str) -> Dict[str, TaskResponse]:
+        return {step: _decode(value) for step, value in self._steps.get(workflow_id, {}).items()}
+
+    async def delete_workflow(self, workflow_id: str):
+        self._steps.pop(workflow_id, None)
+
+class SQLiteStateStore(StateStore):
+    """Checkpoints in a local SQLite database file, queried in worker threads"""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("WORKFLOW_STATE_PATH", "workflow_state.sqlite3")
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS workflow_steps (
+                workflow_id TEXT NOT NULL,
+                step TEXT NOT NULL,
+                response TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (workflow_id, step)
+            )"""
+        )
+        self._connection.commit()
+
+    def _write(self, sql: str, parameters=()):
+        with self._lock:
+            self._connection.execute(sql, parameters)
+            self._connection.commit()
+
+    def _read(self, sql: str, parameters=()):
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    async def save_step(self, workflow_id: str, step: str, response: TaskResponse):
+        await asyncio.to_thread(
+            self._write,
+            "INSERT OR REPLACE INTO workflow_steps (workflow_id, step, response, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            (workflow_id, step, _encode(response), time.time())
+        )
+
+    async def load_steps(self, workflow_id: str) -> Dict[str, TaskResponse]:
+        rows = await asyncio.to_thread(
+            self._read, "SELECT step, response FROM workflow_steps WHERE workflow_id = ?", (workflow_id,)
+        )
+        return {step: _decode(value) for step, value in rows}
+
+    async def delete_workflow(self, workflow_id: str):
+        await asyncio.to_thread(self._write, "DELETE FROM workflow_steps WHERE workflow_id = ?", (workflow_id,))
+
+    async def close(self):
+        with self._lock:
+            self._connection.close()
+
+class CosmosStateStore(StateStore):
+    """
+    Checkpoints in the Cosmos DB account provisioned by Terraform
+
+    Items are ``{"id": "<workflow_id>:<step>", "workflow_id", "step", "response", "updated_at"}``
+    in a container partitioned by ``/workflow_id``, so loading a workflow is a
+    single-partition query.
+    """
+
+    def __init__(self,
+                 endpoint: str = None,
+                 key: str = None,
+                 database: str = None,
+                 container: str = None,
+                 ttl: Optional[int] = 7 * 24 * 3600):
+        """
+        Initialize Cosmos DB state store
+
+        Args:
+            endpoint: Account endpoint, defaults to COSMOS_DB_ENDPOINT
+            key: Account key, defaults to COSMOS_DB_KEY
+            database: Database name
+            container: Container name
+            ttl: Item time-to-live in seconds, None keeps checkpoints forever
+        """
+        self.endpoint = endpoint or os.getenv("COSMOS_DB_ENDPOINT")
+        self._key = key or os.getenv("COSMOS_DB_KEY")
+        self.database_name = database or os.getenv("COSMOS_DB_DATABASE", "multiagent")
+        self.container_name = container or os.getenv("COSMOS_DB_STATE_CONTAINER", "workflow-state")
+        self.ttl = ttl
+        self._client = None
+        self._container = None
+
+    async def _get_container(self):
+        """Container client, created together with database and container on first use"""
+        if self._container is None:
+            from azure.cosmos import PartitionKey
+            from azure.cosmos.aio import CosmosClient
+
+            self._client = CosmosClient(self.endpoint, credential=self._key)
+            database = await self._client.create_database_if_not_exists(self.database_name)
+            self._container = await database.create_container_if_not_exists(
+                id=self.container_name,
+                partition_key=PartitionKey(path="/workflow_id"),
+                default_ttl=self.ttl if self.ttl is not None else -1
+            )
+        return self._container
+
+    async def save_step(self, workflow_id: str, step: str, response: TaskResponse):
+        container = await self._get_container()
+        await container.upsert_item({
+            "id": f"{workflow_id}:{step}",
+            "workflow_id": workflow_id,
+            "step": step,
+            "response": to_jsonable(response),
+            "updated_at": time.time()
+        })
+
+    async def load_steps(self, workflow_id: str) -> Dict[str, TaskResponse]:
+        container = await self._get_container()
+        items = container.query_items(
+            query="SELECT c.step, c.response FROM c WHERE c.workflow_id = @workflow_id",
+            parameters=[{"name": "@workflow_id", "value": workflow_id}],
+            partition_key=workflow_id
+        )
+        return {item["step"]: TaskResponse.from_dict(item["response"]) async for item in items}
+
+    async def delete_workflow(self, workflow_id: str):
+        container = await self._get_container()
+        steps = await self.load_steps(workflow_id)
+        for step in steps:
+            await container.delete_item(f"{workflow_id}:{step}", partition_key=workflow_id)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._container = None
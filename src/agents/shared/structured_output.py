@@ -0,0 +1,317 @@
+"""
+Structured Output
+JSON output schemas per agent role with a fast, incremental parser
+"""
+
+import re
+import json
+import copy
+from dataclasses import replace
+from typing import Dict, List, Any, Optional
+
+import structlog
+
+from .agent_models import AgentRole, AgentConfig
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+def loads(data: str) -> Any:
+    """Parse JSON with orjson when available"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+ROLE_SCHEMAS: Dict[AgentRole, Dict[str, Any]] = {
+    AgentRole.COORDINATOR: {
+        "type": "object",
+        "properties": {
+            "task_assignments": {"type": "array", "items": {"type": "string",
+                                 "enum": ["analyst", "generator", "validator"]}},
+            "workflow_steps": {"type": "array", "items": {"type": "string"}},
+            "priority_order": {"type": "array", "items": {"type": "integer"}},
+            "dependencies": {"type": "object"},
+            "estimated_completion": {"type": ["string", "null"]}
+        },
+        "required": ["task_assignments", "workflow_steps"]
+    },
+    AgentRole.ANALYST: {
+        "type": "object",
+        "properties": {
+            "insights": {"type": "array", "items": {"type": "string"}},
+            "patterns": {"type": "array", "items": {"type": "string"}},
+            "recommendations": {"type": "array", "items": {"type": "string"}},
+            "confidence_score": {"type": "number"}
+        },
+        "required": ["insights", "confidence_score"]
+    },
+    AgentRole.GENERATOR: {
+        "type": "object",
+        "properties": {
+            "generated_content": {"type": "string"},
+            "content_type": {"type": "string"},
+            "quality_metrics": {"type": "object"},
+            "alternatives": {"type": "array", "items": {"type": "string"}}
+        },
+        "required": ["generated_content"]
+    },
+    AgentRole.VALIDATOR: {
+        "type": "object",
+        "properties": {
+            "validation_status": {"type": "string", "enum": ["passed", "failed", "needs_review"]},
+            "compliance_checks": {"type": "array", "items": {"type": "string"}},
+            "quality_score": {"type": "number"},
+            "issues_found": {"type": "array", "items": {"type": "string"}},
+            "approved": {"type": "boolean"}
+        },
+        "required": ["validation_status", "quality_score", "approved"]
+    }
+}
+
+# Values used for fields the model did not provide (or provided with the wrong type)
+ROLE_DEFAULTS: Dict[AgentRole, Dict[str, Any]] = {
+    AgentRole.COORDINATOR: {
+        "task_assignments": [],
+        "workflow_steps": [],
+        "priority_order": [],
+        "estimated_completion": None
+    },
+    AgentRole.ANALYST: {
+        "insights": [],
+        "patterns": [],
+        "recommendations": [],
+        "confidence_score": 0.0
+    },
+    AgentRole.GENERATOR: {
+        "content_type": "text",
+        "quality_metrics": {},
+        "alternatives": []
+    },
+    AgentRole.VALIDATOR: {
+        "validation_status": "pending",
+        "compliance_checks": [],
+        "quality_score": 0.0,
+        "issues_found": [],
+        "approved": False
+    }
+}
+
+_TYPE_CHECKS = {
+    "string": lambda value: isinstance(value, str),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+    "null": lambda value: value is None
+}
+
+def _matches(value: Any, schema: Dict[str, Any]) -> bool:
+    """Shallow check of a value against a property schema: type, enum and item types"""
+    types = schema.get("type")
+    if types is not None:
+        types = [types] if isinstance(types, str) else types
+        if not any(_TYPE_CHECKS[name](value) for name in types):
+            return False
+    if "enum" in schema and value not in schema["enum"]:
+        return False
+    if "items" in schema and isinstance(value, list):
+        return all(_matches(item, schema["items"]) for item in value)
+    return True
+
+def extract_json_object(content: str) -> Optional[Dict[str, Any]]:
+    """
+    The JSON object in a completion
+
+    Accepts a bare object as well as one wrapped in a code fence or prose.
+    """
+    if not content:
+        return None
+    try:
+        value = loads(content)
+    except ValueError:
+        start, end = content.find("{"), content.rfind("}")
+        if start < 0 or end <= start:
+            return None
+        try:
+            value = loads(content[start:end + 1])
+        except ValueError:
+            return None
+    return value if isinstance(value, dict) else None
+
+def coerce_fields(role: AgentRole, fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Role fields from parsed output, checked against the role's schema
+
+    Returns:
+        Defaults overlaid with every schema property whose value has the
+        right type, plus ``invalid_fields`` naming rejected or missing ones
+    """
+    schema = ROLE_SCHEMAS[role]
+    result = copy.deepcopy(ROLE_DEFAULTS[role])
+    invalid = []
+    for name, property_schema in schema["properties"].items():
+        if name not in fields:
+            if name in schema.get("required", []):
+                invalid.append(name)
+            continue
+        if _matches(fields[name], property_schema):
+            result[name] = fields[name]
+        else:
+            invalid.append(name)
+    if invalid:
+        result["invalid_fields"] = invalid
+    return result
+
+def parse_role_output(role: AgentRole, content: str) -> Dict[str, Any]:
+    """
+    Structured fields of a role's completion
+
+    ``structured`` is True when the completion held a JSON object; otherwise
+    only the role's defaults are returned.
+    """
+    fields = extract_json_object(content)
+    if fields is None:
+        return dict(copy.deepcopy(ROLE_DEFAULTS[role]), structured=False)
+    return dict(coerce_fields(role, fields), structured=True)
+
+# Characters that change the parser state outside and inside strings
+_STRUCTURAL = re.compile(r'["\\{}\[\],]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+class IncrementalJSONParser:
+    """
+    Parses a streamed JSON object member by member
+
+    Each top-level member is decoded as soon as the comma or closing brace
+    after it arrives, so fields such as ``approved`` are usable before the
+    stream ends. Text before the opening brace (prose, code fences) is skipped.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._member_start = 0
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """
+        Add streamed text
+
+        Returns:
+            Top-level members completed by this chunk
+        """
+        completed: Dict[str, Any] = {}
+        if self.complete:
+            return completed
+        self._text += chunk
+
+        if not self._started:
+            start = self._text.find("{")
+            if start < 0:
+                self._text = ""
+                return completed
+            self._text = self._text[start:]
+            self._started = True
+            self._depth = 1
+            self._pos = 1
+            self._member_start = 1
+
+        text = self._text
+        while True:
+            pattern = _STRING_SPECIAL if self._in_string else _STRUCTURAL
+            match = pattern.search(text, self._pos)
+            if match is None:
+                self._pos = len(text)
+                break
+            char = match.group()
+            index = match.start()
+            if char == "\\":
+                # Skip the escaped character; wait for it if it has not arrived
+                if index + 1 >= len(text):
+                    self._pos = index
+                    break
+                self._pos = index + 2
+                continue
+            self._pos = index + 1
+            if char == '"':
+                self._in_string = not self._in_string
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close_member(index, completed)
+                    self.complete = True
+                    break
+            elif char == "," and self._depth == 1:
+                self._close_member(index, completed)
+                self._member_start = index + 1
+        return completed
+
+    def _close_member(self, end: int, completed: Dict[str, Any]):
+        segment = self._text[self._member_start:end].strip()
+        if not segment:
+            return
+        try:
+            member = loads("{" + segment + "}")
+        except ValueError:
+            logger.debug("Skipping malformed streamed JSON member", segment=segment[:80])
+            return
+        self.fields.update(member)
+        completed.update(member)
+
+class StructuredOutput:
+    """
+    Requests JSON output matching each role's schema
+
+    Adds the schema to the system prompt and asks the API for a JSON object
+    response, which the client then parses into typed role fields.
+    """
+
+    def __init__(self, schemas: Optional[Dict[AgentRole, Dict[str, Any]]] = None):
+        """
+        Initialize structured output
+
+        Args:
+            schemas: Output schema per role, the built-in ROLE_SCHEMAS by default
+        """
+        self.schemas = schemas or ROLE_SCHEMAS
+
+    def instructions(self, role: AgentRole) -> str:
+        """System prompt suffix describing the expected JSON object"""
+        schema = json.dumps(self.schemas[role], sort_keys=True, separators=(",", ":"))
+        return ("Respond with a single JSON object and nothing else. "
+                f"It must match this JSON schema: {schema}")
+
+    def apply(self, agent_config: AgentConfig) -> AgentConfig:
+        """Agent configuration with the output instructions in its system prompt"""
+        return replace(agent_config,
+                       system_prompt=f"{agent_config.system_prompt}\n\n{self.instructions(agent_config.role)}")
+
+    def request_options(self) -> Dict[str, Any]:
+        """Extra chat completion arguments for JSON mode"""
+        return {"response_format": {"type": "json_object"}}
+
+def forwarded_result(result: Any) -> Any:
+    """
+    The part of a role result passed to downstream steps
+
+    Structured results are forwarded without the raw completion text.
+    """
+    if isinstance(result, dict) and result.get("structured"):
+        return {key: value for key, value in result.items() if key not in ("content", "structured")}
+    return result
+
+def assigned_steps(plan: Dict[str, Any]) -> Optional[List[str]]:
+    """Specialist steps assigned by a structured coordinator plan, None when unspecified"""
+    if not plan.get("structured") or not plan.get("task_assignments"):
+        return None
+    return list(plan["task_assignments"])
@@ -0,0 +1,287 @@
+"""
+Telemetry
+OpenTelemetry traces and metrics for workflows and agent tasks
+"""
+
+import os
+from contextlib import nullcontext
+from typing import Dict, Any, Optional, IO
+from urllib.parse import urlparse
+
+import structlog
+
+from .agent_models import TaskRequest, TaskResponse, AgentConfig
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+# Names match monitoring/queries once exported to Application Insights:
+# server spans land in AppRequests, client spans in AppDependencies and
+# histograms in AppMetrics. Task and dependency names start with
+# "agent-<role>" so the queries' ``extract(@"agent-(\w+)", 1, Name)`` works.
+# The SDK lowercases instrument names, so metric queries compare with =~.
+WORKFLOW_SPAN = "workflow-orchestration"
+RESPONSE_TIME_METRIC = "ResponseTime"
+TOKENS_METRIC = "TokensUsed"
+QUEUE_WAIT_METRIC = "QueueWaitTime"
+SINGLE_FLIGHT_METRIC = "SingleFlightRequests"
+
+EXPORTERS = ("none", "console", "file", "azure-monitor")
+
+def task_span_name(task_request: TaskRequest) -> str:
+    return f"agent-{task_request.agent_role.value}"
+
+class _NoopSpan:
+    """Stands in for a span when OpenTelemetry is not installed"""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+
+    def set_status(self, status: Any, description: Optional[str] = None):
+        pass
+
+    def record_exception(self, exception: BaseException, **kwargs):
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+    def end(self, end_time: Optional[int] = None):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+def _attributes(**values) -> Dict[str, Any]:
+    """Span attributes without None values, which OpenTelemetry rejects"""
+    return {key: value for key, value in values.items() if value is not None}
+
+class AgentTelemetry:
+    """
+    Spans and histograms for workflows and agent tasks
+
+    Uses the global OpenTelemetry providers unless providers are passed in,
+    so it is a no-op until the application configures an SDK, and fully
+    inert when OpenTelemetry is not installed.
+    """
+
+    def __init__(self, tracer_provider=None, meter_provider=None, output: Optional[IO] = None):
+        """
+        Initialize agent telemetry
+
+        Args:
+            tracer_provider: Tracer provider, the global one by default
+            meter_provider: Meter provider, the global one by default
+            output: File the exporters write to, closed on shutdown
+        """
+        self.tracer_provider = tracer_provider
+        self.meter_provider = meter_provider
+        self.output = output
+        try:
+            from opentelemetry import trace, metrics
+        except ImportError:
+            self.enabled = False
+            return
+
+        self.enabled = True
+        self._trace = trace
+        self.tracer = trace.get_tracer(__name__, tracer_provider=tracer_provider)
+        meter = metrics.get_meter(__name__, meter_provider=meter_provider)
+        self._response_time = meter.create_histogram(
+            RESPONSE_TIME_METRIC, unit="ms", description="Agent task response time"
+        )
+        self._tokens = meter.create_histogram(
+            TOKENS_METRIC, unit="{token}", description="Tokens used per agent task"
+        )
+        self._queue_wait = meter.create_histogram(
+            QUEUE_WAIT_METRIC, unit="ms", description="Time a task waited for rate-limit capacity"
+        )
+        self._single_flight = meter.create_counter(
+            SINGLE_FLIGHT_METRIC, unit="{request}",
+            description="Coalescable requests, by whether they joined an in-flight call"
+        )
+
+    def _current_span(self, name: str, kind: str, attributes: Dict[str, Any]):
+        if not self.enabled:
+            return nullcontext(_NOOP_SPAN)
+        return self.tracer.start_as_current_span(
+            name, kind=getattr(self._trace.SpanKind, kind), attributes=attributes
+        )
+
+    def workflow_span(self, workflow_id: str, tenant_id: Optional[str] = None):
+        """Root span of an orchestrated workflow"""
+        return self._current_span(WORKFLOW_SPAN, "SERVER",
+                                  _attributes(workflow_id=workflow_id, tenant_id=tenant_id))
+
+    def _task_attributes(self, task_request: TaskRequest) -> Dict[str, Any]:
+        return _attributes(
+            agent_id=task_request.agent_role.value,
+            task_id=task_request.task_id,
+            workflow_id=task_request.workflow_id,
+            tenant_id=task_request.tenant_id
+        )
+
+    def task_span(self, task_request: TaskRequest):
+        """Span of one agent task, current for its child spans"""
+        return self._current_span(task_span_name(task_request), "SERVER",
+                                  self._task_attributes(task_request))
+
+    def start_task_span(self, task_request: TaskRequest):
+        """
+        Task span that is not made current
+
+        For async generators, which cannot safely keep a context attached
+        across ``yield``; the caller ends the span.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return self.tracer.start_span(task_span_name(task_request),
+                                      kind=self._trace.SpanKind.SERVER,
+                                      attributes=self._task_attributes(task_request))
+
+    def span(self, name: str, **attributes):
+        """Internal child span, e.g. prompt rendering or response processing"""
+        return self._current_span(name, "INTERNAL", _attributes(**attributes))
+
+    def dependency_span(self, task_request: TaskRequest, agent_config: AgentConfig,
+                        endpoint: Optional[str] = None):
+        """Client span of a chat completion call"""
+        target = urlparse(endpoint).hostname if endpoint else None
+        return self._current_span(
+            f"{task_span_name(task_request)}-completion", "CLIENT",
+            _attributes(
+                agent_id=task_request.agent_role.value,
+                model_used=agent_config.model,
+                **{"server.address": target, "gen_ai.system": "openai",
+                   "gen_ai.request.model": agent_config.model}
+            )
+        )
+
+    def _set_error(self, span, description: Optional[str]):
+        if self.enabled:
+            from opentelemetry.trace import Status, StatusCode
+            span.set_status(Status(StatusCode.ERROR, description))
+
+    def finish_workflow(self, span, workflow_results: Dict[str, Any]):
+        """Annotate a workflow span with the workflow's outcome"""
+        span.set_attribute("status", workflow_results["status"])
+        if workflow_results["status"] == "failed":
+            self._set_error(span, workflow_results.get("error")
+                            or ", ".join(workflow_results.get("failed_steps", [])))
+
+    def finish_task(self, span, response: TaskResponse):
+        """Annotate a task span with its outcome and record the task's metrics"""
+        metadata = response.metadata or {}
+        status = response.status.capitalize()
+        span.set_attributes(_attributes(
+            status=response.status,
+            tokens_used=metadata.get("tokens_used"),
+            model_used=metadata.get("model")
+        ))
+        if response.status == "error":
+            self._set_error(span, response.error)
+
+        if not self.enabled:
+            return
+        labels = {"AgentType": response.agent_role.value, "Status": status}
+        self._response_time.record(response.execution_time * 1000.0, labels)
+        if metadata.get("tokens_used") is not None:
+            self._tokens.record(metadata["tokens_used"], labels)
+        if metadata.get("rate_limit_wait") is not None:
+            self._queue_wait.record(metadata["rate_limit_wait"] * 1000.0, labels)
+        if "single_flight" in metadata:
+            self._single_flight.add(1, {"AgentType": response.agent_role.value,
+                                        "Coalesced": metadata["single_flight"]["coalesced"]})
+
+    def shutdown(self):
+        """Flush and stop providers passed to this instance, then close its output file"""
+        for provider in (self.tracer_provider, self.meter_provider):
+            if provider is not None and hasattr(provider, "shutdown"):
+                provider.shutdown()
+        self.tracer_provider = self.meter_provider = None
+        if self.output is not None:
+            self.output.close()
+            self.output = None
+
+def configure_telemetry(exporter: Optional[str] = None,
+                        path: Optional[str] = None,
+                        service_name: str = "ai-multiagent",
+                        export_interval: float = 60.0,
+                        set_global: bool = False) -> AgentTelemetry:
+    """
+    Create telemetry with an OpenTelemetry SDK pipeline
+
+    Args:
+        exporter: "console", "file" (one JSON document per line, for offline
+            tests), "azure-monitor" or "none"; defaults to AGENT_TELEMETRY_EXPORTER,
+            then to "azure-monitor" when APPLICATIONINSIGHTS_CONNECTION_STRING is set
+        path: Output file of the file exporter, defaults to AGENT_TELEMETRY_PATH
+        service_name: service.name resource attribute (cloud_RoleName in Azure Monitor)
+        export_interval: Seconds between metric exports
+        set_global: Also install the providers as the global ones, which
+            AgentTelemetry instances created without providers use
+
+    Returns:
+        AgentTelemetry bound to the new providers
+    """
+    connection_string = os.getenv("APPLICATIONINSIGHTS_CONNECTION_STRING")
+    exporter = exporter or os.getenv("AGENT_TELEMETRY_EXPORTER") or (
+        "azure-monitor" if connection_string else "none"
+    )
+    if exporter not in EXPORTERS:
+        raise ValueError(f"Unknown telemetry exporter: {exporter}")
+    if exporter == "none":
+        return AgentTelemetry()
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor, BatchSpanProcessor
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
+    resource = Resource.create({"service.name": service_name})
+    output = None
+
+    if exporter == "azure-monitor":
+        from azure.monitor.opentelemetry.exporter import (
+            AzureMonitorTraceExporter, AzureMonitorMetricExporter
+        )
+        span_processor = BatchSpanProcessor(
+            AzureMonitorTraceExporter(connection_string=connection_string)
+        )
+        metric_exporter = AzureMonitorMetricExporter(connection_string=connection_string)
+    else:
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        from opentelemetry.sdk.metrics.export import ConsoleMetricExporter
+
+        if exporter == "file":
+            path = path or os.getenv("AGENT_TELEMETRY_PATH", "telemetry.jsonl")
+            # Spans and metric snapshots are interleaved in one file
+            output = open(path, "a")
+        kwargs = {"out": output} if output is not None else {}
+        span_processor = SimpleSpanProcessor(ConsoleSpanExporter(
+            formatter=lambda span: span.to_json(indent=None) + "\n", **kwargs
+        ))
+        metric_exporter = ConsoleMetricExporter(
+            formatter=lambda data: data.to_json(indent=None) + "\n", **kwargs
+        )
+
+    tracer_provider = TracerProvider(resource=resource)
+    tracer_provider.add_span_processor(span_processor)
+    meter_provider = MeterProvider(
+        resource=resource,
+        metric_readers=[PeriodicExportingMetricReader(
+            metric_exporter, export_interval_millis=export_interval * 1000.0
+        )]
+    )
+
+    if set_global:
+        from opentelemetry import trace, metrics
+
+        trace.set_tracer_provider(tracer_provider)
+        metrics.set_meter_provider(meter_provider)
+
+    logger.info("Telemetry configured", exporter=exporter, service_name=service_name)
+    return AgentTelemetry(tracer_provider=tracer_provider, meter_provider=meter_provider, output=output)
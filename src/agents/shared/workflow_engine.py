@@ -0,0 +1,171 @@
+"""
+Workflow Engine
+Dependency-graph executor for multiagent workflows
+"""
+
+import asyncio
+from typing import Dict, List, Any, Optional, Union, Callable, Awaitable
+from dataclasses import dataclass, field
+
+import structlog
+
+from .agent_models import AgentRole, TaskRequest, TaskResponse
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+TaskExecutor = Callable[[TaskRequest], Awaitable[TaskResponse]]
+CompletionCallback = Callable[[str, TaskResponse], Awaitable[None]]
+ResultForwarder = Callable[[TaskResponse], Any]
+
+# Statuses whose results can be reused when a workflow is resumed
+COMPLETED_STATUSES = ("success", "simulated")
+
+@dataclass
+class WorkflowNode:
+    """A single agent task in a workflow graph"""
+    node_id: str
+    agent_role: AgentRole
+    input_data: Dict[str, Any] = field(default_factory=dict)
+    # Maps an input field to the upstream node(s) whose result fills it.
+    # A single node id injects one result, a list injects a list (fan-out).
+    inputs: Dict[str, Union[str, List[str]]] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)
+    context: Optional[Dict[str, Any]] = None
+    priority: int = 1
+    timeout: int = 300
+
+    def dependencies(self) -> List[str]:
+        """All upstream node ids, explicit and implied by inputs"""
+        deps = list(self.depends_on)
+        for sources in self.inputs.values():
+            for source in ([sources] if isinstance(sources, str) else sources):
+                if source not in deps:
+                    deps.append(source)
+        return deps
+
+class WorkflowEngine:
+    """
+    Runs a DAG of agent tasks, starting every node as soon as its inputs are ready
+    """
+
+    def __init__(self, executor: TaskExecutor, forward: Optional[ResultForwarder] = None):
+        """
+        Initialize workflow engine
+
+        Args:
+            executor: Coroutine function that executes a single TaskRequest
+            forward: Maps an upstream response to the value injected downstream;
+                the response's result by default
+        """
+        self.executor = executor
+        self.forward = forward or (lambda response: response.result)
+
+    @staticmethod
+    def topological_order(nodes: List[WorkflowNode]) -> List[WorkflowNode]:
+        """Validate the graph and return its nodes in dependency order"""
+        by_id: Dict[str, WorkflowNode] = {}
+        for node in nodes:
+            if node.node_id in by_id:
+                raise ValueError(f"Duplicate workflow node: {node.node_id}")
+            by_id[node.node_id] = node
+
+        for node in nodes:
+            for dep in node.dependencies():
+                if dep not in by_id:
+                    raise ValueError(f"Node {node.node_id} depends on unknown node: {dep}")
+
+        ordered: List[WorkflowNode] = []
+        state: Dict[str, str] = {}
+
+        def visit(node: WorkflowNode):
+            if state.get(node.node_id) == "done":
+                return
+            if state.get(node.node_id) == "visiting":
+                raise ValueError(f"Workflow graph has a cycle at node: {node.node_id}")
+            state[node.node_id] = "visiting"
+            for dep in node.dependencies():
+                visit(by_id[dep])
+            state[node.node_id] = "done"
+            ordered.append(node)
+
+        for node in nodes:
+            visit(node)
+        return ordered
+
+    async def run(self,
+                  nodes: List[WorkflowNode],
+                  workflow_id: str = "default",
+                  completed: Optional[Dict[str, TaskResponse]] = None,
+                  on_complete: Optional[CompletionCallback] = None) -> Dict[str, TaskResponse]:
+        """
+        Execute all nodes of a workflow graph
+
+        Args:
+            nodes: Workflow nodes; dependencies must refer to node ids in this list
+            workflow_id: Prefix for generated task ids
+            completed: Responses of a previous run; a node is skipped when it
+                completed before and none of its dependencies had to run again
+            on_complete: Awaited with (node_id, response) after each executed node
+
+        Returns:
+            Mapping of node id to its TaskResponse
+        """
+        ordered = self.topological_order(nodes)
+        completed = completed or {}
+        tasks: Dict[str, asyncio.Task] = {}
+        reused: Dict[str, bool] = {}
+
+        for node in ordered:
+            previous = completed.get(node.node_id)
+            reused[node.node_id] = (
+                previous is not None
+                and previous.status in COMPLETED_STATUSES
+                and all(reused[dep] for dep in node.dependencies())
+            )
+
+        async def run_node(node: WorkflowNode) -> TaskResponse:
+            if reused[node.node_id]:
+                return completed[node.node_id]
+
+            deps = node.dependencies()
+            if deps:
+                await asyncio.gather(*(tasks[dep] for dep in deps))
+
+            input_data = dict(node.input_data)
+            for key, sources in node.inputs.items():
+                if isinstance(sources, str):
+                    input_data[key] = self.forward(tasks[sources].result())
+                else:
+                    input_data[key] = [self.forward(tasks[source].result()) for source in sources]
+
+            task_request = TaskRequest(
+                task_id=f"{workflow_id}_{node.node_id}",
+                agent_role=node.agent_role,
+                input_data=input_data,
+                context=node.context,
+                priority=node.priority,
+                timeout=node.timeout
+            )
+            response = await self.executor(task_request)
+            if on_complete is not None:
+                await on_complete(node.node_id, response)
+            return response
+
+        # Nodes are created in dependency order so upstream tasks always exist
+        for node in ordered:
+            tasks[node.node_id] = asyncio.create_task(run_node(node))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        logger.info("Workflow graph completed",
+                   workflow_id=workflow_id,
+                   nodes=len(ordered),
+                   resumed=sum(reused.values()))
+
+        return {node_id: task.result() for node_id, task in tasks.items()}
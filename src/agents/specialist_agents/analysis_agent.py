@@ -1,8 +1,38 @@
 # Agente de Análise
+"""
+Analysis Agent
+Standalone analyst service: analyzes data in micro-batched agent tasks
 
-def analyze(data):
-    # TODO: Implementar a lógica de análise
-    print(f"Analyzing data: {data}")
-    return {"analysis": "completed"}
+Run ``python -m src.agents.specialist_agents.analysis_agent`` to serve
+``POST /analyze`` and ``POST /analyze/batch`` on its own port.
+"""
 
+import os
+from typing import Dict, Any, Optional
 
+from ..shared.agent_models import AgentRole
+from .service import SpecialistService, create_app
+
+service = SpecialistService(AgentRole.ANALYST)
+app = create_app(service, "analyze")
+
+async def analyze(data: Any, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Analyze data with the analyst agent
+
+    Args:
+        data: Data to analyze
+        context: Optional task context
+
+    Returns:
+        Analyst result: insights, patterns, recommendations and confidence_score
+
+    Raises:
+        SpecialistTaskError: When the agent task fails
+    """
+    return await service.run(service.task_request({"data": data}, context=context))
+
+# Relative imports need the package: run from src/ as python -m agents.specialist_agents.analysis_agent
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8001")))
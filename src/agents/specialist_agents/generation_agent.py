@@ -1,8 +1,38 @@
 # Agente de Geração
+"""
+Generation Agent
+Standalone generator service: generates content in micro-batched agent tasks
 
-def generate(prompt):
-    # TODO: Implementar a lógica de geração
-    print(f"Generating content for prompt: {prompt}")
-    return {"generated_content": "..."}
+Run ``python -m src.agents.specialist_agents.generation_agent`` to serve
+``POST /generate`` and ``POST /generate/batch`` on its own port.
+"""
 
+import os
+from typing import Dict, Any, Optional
 
+from ..shared.agent_models import AgentRole
+from .service import SpecialistService, create_app
+
+service = SpecialistService(AgentRole.GENERATOR)
+app = create_app(service, "generate")
+
+async def generate(prompt: Any, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Generate content for a prompt with the generator agent
+
+    Args:
+        prompt: What to generate
+        context: Optional task context
+
+    Returns:
+        Generator result with generated_content
+
+    Raises:
+        SpecialistTaskError: When the agent task fails
+    """
+    return await service.run(service.task_request({"prompt": prompt}, context=context))
+
+# Relative imports need the package: run from src/ as python -m agents.specialist_agents.generation_agent
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8002")))
@@ -0,0 +1,130 @@
+"""
+Micro Batcher
+Groups concurrent single-item requests into batches by size or wait time
+"""
+
+import asyncio
+from typing import Dict, List, Any, Callable, Awaitable, Optional, Tuple, Set, Union, AsyncIterator
+
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+# Returns results in input order, or yields (index, result) as each item completes
+BatchProcessor = Callable[[List[Any]], Union[Awaitable[List[Any]], AsyncIterator[Tuple[int, Any]]]]
+
+class MicroBatcher:
+    """
+    Collects items for up to ``max_wait_ms`` or ``max_batch_size`` items
+
+    Each caller awaits its own result while the batch is processed as one
+    call. When the processor yields results as they complete, each caller
+    is answered as soon as its own item is done. A failed batch fails every
+    caller still waiting in it.
+    """
+
+    def __init__(self,
+                 process_batch: BatchProcessor,
+                 max_batch_size: int = 16,
+                 max_wait_ms: float = 10.0):
+        """
+        Initialize micro batcher
+
+        Args:
+            process_batch: Coroutine function mapping a list of items to
+                results in the same order, or async generator function
+                yielding (index, result) pairs in completion order
+            max_batch_size: Items that trigger an immediate flush
+            max_wait_ms: Longest time the first item of a batch waits
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.items = 0
+        self.in_flight = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Running batches, referenced until done so they are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """Items waiting for a batch or being processed"""
+        return len(self._pending) + self.in_flight
+
+    async def submit(self, item: Any) -> Any:
+        """Add an item to the next batch and await its result"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures and timers belong to one event loop
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._tasks = set()
+            self.in_flight = 0
+
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        # Callers that gave up before the flush are not processed
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if batch:
+            self.in_flight += len(batch)
+            task = self._loop.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        unanswered = len(batch)
+
+        def resolve(index: int, result: Any):
+            nonlocal unanswered
+            _, future = batch[index]
+            if not future.done():
+                future.set_result(result)
+            unanswered -= 1
+            self.in_flight -= 1
+
+        try:
+            outputs = self.process_batch([item for item, _ in batch])
+            if hasattr(outputs, "__aiter__"):
+                async for index, result in outputs:
+                    resolve(index, result)
+            else:
+                for index, result in enumerate(await outputs):
+                    resolve(index, result)
+        except Exception as e:
+            logger.error("Micro batch failed", size=len(batch), unanswered=unanswered, error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self.in_flight -= unanswered
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counts and average batch size"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "pending": self.pending
+        }
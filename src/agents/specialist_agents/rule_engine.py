@@ -0,0 +1,362 @@
+"""
+Rule Engine
+Deterministic validation checks decided locally before any LLM call
+"""
+
+import os
+import re
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+import structlog
+
+from ..shared.agent_models import AgentRole
+from ..shared.structured_output import coerce_fields
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+PASS = "pass"
+FAIL = "fail"
+ESCALATE = "escalate"
+
+class AhoCorasick:
+    """
+    Finds every occurrence of a set of terms in one pass over the text
+
+    Matching is case-insensitive and limited to whole words. Uses the
+    pyahocorasick extension when it is installed.
+    """
+
+    def __init__(self, terms: List[str]):
+        self.terms = sorted({term.lower() for term in terms if term.strip()})
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                self._automaton.add_word(term, term)
+            if self.terms:
+                self._automaton.make_automaton()
+            return
+
+        self._automaton = None
+        # Trie as parallel lists: transitions, failure link and terms ending at each node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        for term in self.terms:
+            node = 0
+            for char in term:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._output[node].append(term)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _raw_matches(self, text: str):
+        if self._automaton is not None:
+            if self.terms:
+                for end, term in self._automaton.iter(text):
+                    yield end, term
+            return
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for term in self._output[node]:
+                yield index, term
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """(start offset, term) of every whole-word occurrence"""
+        lowered = text.lower()
+        matches = []
+        for end, term in self._raw_matches(lowered):
+            start = end - len(term) + 1
+            if start > 0 and lowered[start - 1].isalnum():
+                continue
+            if end + 1 < len(lowered) and lowered[end + 1].isalnum():
+                continue
+            matches.append((start, term))
+        return matches
+
+    def found(self, text: str) -> List[str]:
+        """Distinct terms present in the text, in order of first occurrence"""
+        return list(dict.fromkeys(term for _, term in self.find_all(text)))
+
+def _digits(value: str) -> List[int]:
+    return [int(char) for char in value if char.isdigit()]
+
+def luhn_valid(value: str) -> bool:
+    digits = _digits(value)
+    if not 13 <= len(digits) <= 19:
+        return False
+    total = 0
+    for index, digit in enumerate(reversed(digits)):
+        if index % 2 == 1:
+            digit = digit * 2 - 9 if digit > 4 else digit * 2
+        total += digit
+    return total % 10 == 0
+
+def cpf_valid(value: str) -> bool:
+    """Brazilian individual taxpayer number with both check digits"""
+    digits = _digits(value)
+    if len(digits) != 11 or len(set(digits)) == 1:
+        return False
+    for length in (9, 10):
+        total = sum(digit * weight for digit, weight in zip(digits[:length], range(length + 1, 1, -1)))
+        if (total * 10) % 11 % 10 != digits[length]:
+            return False
+    return True
+
+def cnpj_valid(value: str) -> bool:
+    """Brazilian company taxpayer number with both check digits"""
+    digits = _digits(value)
+    if len(digits) != 14 or len(set(digits)) == 1:
+        return False
+    weights = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    for length in (12, 13):
+        total = sum(digit * weight for digit, weight in zip(digits[:length], weights[13 - length:]))
+        remainder = total % 11
+        if (0 if remainder < 2 else 11 - remainder) != digits[length]:
+            return False
+    return True
+
+# (name, pattern, verifier). Matches that pass their verifier are definite PII;
+# phone numbers cannot be verified and only make content ambiguous.
+PII_PATTERNS = [
+    ("email", re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}\b"), None),
+    ("cpf", re.compile(r"(?<!\d)\d{3}\.?\d{3}\.?\d{3}-?\d{2}(?!\d)"), cpf_valid),
+    ("cnpj", re.compile(r"(?<!\d)\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2}(?!\d)"), cnpj_valid),
+    ("credit_card", re.compile(r"(?<!\d)(?:\d[ -]?){12,18}\d(?!\d)"), luhn_valid),
+    ("us_ssn", re.compile(r"(?<!\d)(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}(?!\d)"), None),
+    ("phone", re.compile(r"(?<![\w.])\+?\(?\d{2,3}\)?[ .-]?\d{4,5}[ .-]?\d{4}(?![\w.])"), None)
+]
+UNVERIFIABLE_PII = {"phone"}
+
+@dataclass
+class ValidationRules:
+    """Mechanical checks applied to content before LLM validation"""
+    min_length: int = 1
+    max_length: int = 20000
+    # Longer content is escalated even when every rule passes
+    max_local_length: int = 4000
+    required_sections: List[str] = field(default_factory=list)
+    banned_terms: List[str] = field(default_factory=list)
+    # Terms that need judgement, e.g. medical or legal claims
+    review_terms: List[str] = field(default_factory=list)
+    # "fail", "escalate" or "ignore" for verified PII
+    pii_action: str = FAIL
+
+    @property
+    def has_content_rules(self) -> bool:
+        """Whether any rule judges what the content says, not just its shape"""
+        return bool(self.required_sections or self.banned_terms or self.review_terms)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ValidationRules":
+        return cls(**data)
+
+    @classmethod
+    def from_env(cls) -> "ValidationRules":
+        """Rules from the JSON file at VALIDATION_RULES_PATH, defaults otherwise"""
+        path = os.getenv("VALIDATION_RULES_PATH")
+        if not path:
+            return cls()
+        with open(path) as rules_file:
+            return cls.from_dict(json.load(rules_file))
+
+@dataclass
+class RuleDecision:
+    """Outcome of the local checks"""
+    outcome: str
+    decision_path: List[str]
+    issues: List[str]
+    passed_checks: List[str]
+    elapsed_us: float
+
+    def to_result(self) -> Dict[str, Any]:
+        """Validator role fields for a decision made without the LLM"""
+        approved = self.outcome == PASS
+        return {
+            "agent_role": AgentRole.VALIDATOR.value,
+            "content": f"Rule engine {self.outcome}: " + ("; ".join(self.issues) or "all checks passed"),
+            "validation_status": "passed" if approved else "failed",
+            # Mechanical checks say nothing about quality
+            "quality_score": None,
+            "compliance_checks": self.passed_checks,
+            "issues_found": self.issues,
+            "approved": approved,
+            "structured": True,
+            "validated_locally": True,
+            "decision_path": self.decision_path
+        }
+
+class RuleEngine:
+    """
+    Validates content with precompiled patterns in microseconds
+
+    Content that clearly breaks a rule fails, content that clearly meets
+    every rule passes, and anything the rules cannot judge is escalated.
+    Without content rules nothing is approved locally.
+    """
+
+    def __init__(self, rules: Optional[ValidationRules] = None):
+        """
+        Initialize rule engine
+
+        Args:
+            rules: Checks to apply, ValidationRules.from_env() by default
+        """
+        self.rules = rules or ValidationRules.from_env()
+        if self.rules.pii_action not in (FAIL, ESCALATE, "ignore"):
+            raise ValueError(f"Unknown pii_action: {self.rules.pii_action}")
+        self._banned = AhoCorasick(self.rules.banned_terms)
+        self._review = AhoCorasick(self.rules.review_terms)
+        self._sections = AhoCorasick(self.rules.required_sections)
+        self.outcomes = {PASS: 0, FAIL: 0, ESCALATE: 0}
+
+    @staticmethod
+    def _text(content: Any) -> Tuple[Optional[str], Optional[str], str]:
+        """
+        Text to check, a schema issue if any, and the schema check status
+
+        Content the rules cannot read, such as None or a result without
+        ``generated_content``, is escalated rather than failed.
+        """
+        if isinstance(content, str):
+            return content, None, PASS
+        if content is None:
+            return None, "no content to validate", ESCALATE
+        if isinstance(content, dict):
+            if content.get("generated_content") is None:
+                return None, "generated_content is missing", ESCALATE
+            fields = coerce_fields(AgentRole.GENERATOR, content)
+            if "generated_content" in fields.get("invalid_fields", []):
+                return None, "generated_content is not a string", FAIL
+            return content["generated_content"], None, PASS
+        return None, f"unsupported content type {type(content).__name__}", FAIL
+
+    def _pii(self, text: str) -> Tuple[List[str], List[str]]:
+        verified, possible = [], []
+        for name, pattern, verifier in PII_PATTERNS:
+            for match in pattern.finditer(text):
+                if name in UNVERIFIABLE_PII:
+                    possible.append(name)
+                    break
+                if verifier is None or verifier(match.group()):
+                    verified.append(name)
+                    break
+        return verified, possible
+
+    def evaluate(self, content: Any) -> RuleDecision:
+        """Run every check and decide pass, fail or escalate"""
+        start = time.perf_counter()
+        path: List[str] = []
+        issues: List[str] = []
+        passed: List[str] = []
+        escalate = False
+
+        def record(check: str, status: str, issue: Optional[str] = None):
+            nonlocal escalate
+            path.append(f"{check}:{status}")
+            if status == PASS:
+                passed.append(check)
+            elif status == ESCALATE:
+                escalate = True
+            if issue:
+                issues.append(issue)
+
+        text, schema_issue, schema_status = self._text(content)
+        if schema_issue:
+            record("schema", schema_status, f"Schema: {schema_issue}")
+            return self._decide(schema_status, path, issues, passed, start)
+        record("schema", PASS)
+
+        length = len(text.strip())
+        if length < self.rules.min_length:
+            record("length", FAIL, f"Content is shorter than {self.rules.min_length} characters")
+        elif length > self.rules.max_length:
+            record("length", FAIL, f"Content is longer than {self.rules.max_length} characters")
+        elif length > self.rules.max_local_length:
+            record("length", ESCALATE, f"Content is too long to approve locally ({length} characters)")
+        else:
+            record("length", PASS)
+
+        if self.rules.required_sections:
+            missing = sorted(set(self._sections.terms) - set(self._sections.found(text)))
+            if missing:
+                record("required_sections", FAIL, f"Missing sections: {', '.join(missing)}")
+            else:
+                record("required_sections", PASS)
+
+        if self.rules.banned_terms:
+            banned = self._banned.found(text)
+            if banned:
+                record("banned_terms", FAIL, f"Banned terms: {', '.join(banned)}")
+            else:
+                record("banned_terms", PASS)
+
+        if self.rules.pii_action != "ignore":
+            verified, possible = self._pii(text)
+            if verified:
+                record("pii", self.rules.pii_action, f"PII found: {', '.join(verified)}")
+            elif possible:
+                record("pii", ESCALATE, f"Possible PII: {', '.join(possible)}")
+            else:
+                record("pii", PASS)
+
+        if self.rules.review_terms:
+            review = self._review.found(text)
+            if review:
+                record("review_terms", ESCALATE, f"Needs review: {', '.join(review)}")
+            else:
+                record("review_terms", PASS)
+
+        if any(entry.endswith(f":{FAIL}") for entry in path):
+            outcome = FAIL
+        elif escalate or not self.rules.has_content_rules:
+            # Length and PII checks alone are not enough to approve content
+            outcome = ESCALATE
+        else:
+            outcome = PASS
+        return self._decide(outcome, path, issues, passed, start)
+
+    def _decide(self, outcome: str, path: List[str], issues: List[str], passed: List[str],
+                start: float) -> RuleDecision:
+        self.outcomes[outcome] += 1
+        path.append(f"decision:{outcome}")
+        return RuleDecision(
+            outcome=outcome,
+            decision_path=path,
+            issues=issues,
+            passed_checks=passed,
+            elapsed_us=(time.perf_counter() - start) * 1e6
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Decisions by outcome and the share decided without the LLM"""
+        total = sum(self.outcomes.values())
+        return dict(self.outcomes,
+                    evaluated=total,
+                    local_ratio=(self.outcomes[PASS] + self.outcomes[FAIL]) / total if total else 0.0)
@@ -0,0 +1,270 @@
+"""
+Specialist Service
+Standalone, micro-batched service for one specialist agent role
+"""
+
+import os
+import math
+import time
+import uuid
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Callable, Awaitable, AsyncIterator, Tuple
+
+import structlog
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from ..shared.agent_models import AgentRole, TaskRequest, TaskResponse, to_jsonable
+from ..shared.azure_ai_foundry_client import AzureAIFoundryClient
+from ..shared.single_flight import SingleFlight
+from ..shared.telemetry import configure_telemetry
+from .micro_batcher import MicroBatcher
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+TaskExecutor = Callable[[TaskRequest], Awaitable[TaskResponse]]
+# Answers a task locally or passes it (possibly annotated) to the executor
+FastPath = Callable[[TaskRequest, TaskExecutor], Awaitable[TaskResponse]]
+
+class ServiceOverloadedError(Exception):
+    """Raised when a specialist already holds its maximum number of pending tasks"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Specialist is at capacity, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class SpecialistTaskError(Exception):
+    """Raised when a specialist task completes with an error status"""
+
+    def __init__(self, response: TaskResponse):
+        super().__init__(f"{response.agent_role.value} task {response.task_id} failed: {response.error}")
+        self.response = response
+
+class SpecialistService:
+    """
+    One specialist role behind a micro batcher
+
+    Single tasks submitted concurrently are grouped into batches dispatched
+    in priority order, and each caller is answered as soon as its own task
+    completes. At most ``max_concurrency`` completions are in flight across
+    all batches of the service. New tasks are rejected once ``max_pending``
+    are waiting, so each replica sheds load instead of queueing without bound.
+    """
+
+    def __init__(self,
+                 role: AgentRole,
+                 client: Optional[AzureAIFoundryClient] = None,
+                 max_batch_size: int = None,
+                 max_wait_ms: float = None,
+                 max_concurrency: int = None,
+                 max_pending: int = None,
+                 fast_path: Optional[FastPath] = None):
+        """
+        Initialize specialist service
+
+        Args:
+            role: Agent role served
+            client: Shared client, created on first use when omitted
+            max_batch_size: Batch size limit, defaults to SPECIALIST_MAX_BATCH_SIZE
+            max_wait_ms: Batch wait limit, defaults to SPECIALIST_MAX_WAIT_MS
+            max_concurrency: Completions in flight, defaults to SPECIALIST_MAX_CONCURRENCY
+            max_pending: Admitted tasks not yet answered, defaults to SPECIALIST_MAX_PENDING
+            fast_path: Optional local handler in front of the batcher
+        """
+        self.role = role
+        self._client = client
+        self.fast_path = fast_path
+        self.max_concurrency = max_concurrency or int(os.getenv("SPECIALIST_MAX_CONCURRENCY", "8"))
+        self.max_pending = max_pending or int(os.getenv("SPECIALIST_MAX_PENDING", "256"))
+        self.batcher = MicroBatcher(
+            self._process_batch,
+            max_batch_size=max_batch_size or int(os.getenv("SPECIALIST_MAX_BATCH_SIZE", "16")),
+            max_wait_ms=max_wait_ms if max_wait_ms is not None else float(os.getenv("SPECIALIST_MAX_WAIT_MS", "10"))
+        )
+        self._batch_time = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client(self) -> AzureAIFoundryClient:
+        if self._client is None:
+            self._client = AzureAIFoundryClient(single_flight=SingleFlight())
+        return self._client
+
+    def task_request(self,
+                     input_data: Dict[str, Any],
+                     context: Optional[Dict[str, Any]] = None,
+                     priority: int = 1,
+                     workflow_id: Optional[str] = None,
+                     tenant_id: Optional[str] = None) -> TaskRequest:
+        """Task request for this role with a generated task id"""
+        return TaskRequest(
+            task_id=f"{self.role.value}_{uuid.uuid4().hex}",
+            agent_role=self.role,
+            input_data=input_data,
+            context=context,
+            priority=priority,
+            workflow_id=workflow_id,
+            tenant_id=tenant_id
+        )
+
+    def _concurrency_limit(self) -> asyncio.Semaphore:
+        """Service-wide completion limit for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _process_batch(self, task_requests: List[TaskRequest]) -> AsyncIterator[Tuple[int, TaskResponse]]:
+        start_time = time.perf_counter()
+        async for index, response in self.client.execute_agent_tasks_as_completed(
+                task_requests, semaphore=self._concurrency_limit()):
+            yield index, response
+        self._batch_time = time.perf_counter() - start_time
+
+    def retry_after(self) -> int:
+        """Estimated seconds until the pending tasks drain"""
+        batches = self.batcher.pending / self.batcher.max_batch_size
+        return max(1, math.ceil(batches * self._batch_time))
+
+    def _admit(self, count: int):
+        if self.batcher.pending + count > self.max_pending:
+            raise ServiceOverloadedError(self.retry_after())
+
+    async def submit(self, task_request: TaskRequest) -> TaskResponse:
+        """
+        Execute one task in the next micro batch
+
+        Raises:
+            ServiceOverloadedError: When max_pending tasks are already pending
+        """
+        self._admit(1)
+        return await self._execute(task_request)
+
+    async def run(self, task_request: TaskRequest) -> Dict[str, Any]:
+        """
+        Execute one task and return its result
+
+        Raises:
+            ServiceOverloadedError: When max_pending tasks are already pending
+            SpecialistTaskError: When the task completes with status "error"
+        """
+        response = await self.submit(task_request)
+        if response.status == "error":
+            raise SpecialistTaskError(response)
+        return response.result
+
+    async def _execute(self, task_request: TaskRequest) -> TaskResponse:
+        if self.fast_path is not None:
+            return await self.fast_path(task_request, self.batcher.submit)
+        return await self.batcher.submit(task_request)
+
+    async def submit_many(self, task_requests: List[TaskRequest]) -> List[TaskResponse]:
+        """Execute several tasks, admitted together, in input order"""
+        self._admit(len(task_requests))
+        return list(await asyncio.gather(*(self._execute(task_request)
+                                           for task_request in task_requests)))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "agent_role": self.role.value,
+            "max_concurrency": self.max_concurrency,
+            "max_pending": self.max_pending,
+            "batcher": self.batcher.stats()
+        }
+        if hasattr(self.fast_path, "stats"):
+            stats["fast_path"] = self.fast_path.stats()
+        return stats
+
+    async def health(self) -> Dict[str, Any]:
+        """Service load and the client's dependency health"""
+        dependencies = await self.client.health_check()
+        if self.batcher.pending >= self.max_pending:
+            status = "overloaded"
+        elif dependencies["overall_status"] == "unhealthy":
+            status = "unhealthy"
+        else:
+            status = "healthy"
+        return dict(self.stats(), status=status, dependencies=dependencies)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+
+class SpecialistTask(BaseModel):
+    input_data: Dict[str, Any]
+    context: Optional[Dict[str, Any]] = None
+    priority: int = 1
+    workflow_id: Optional[str] = None
+    tenant_id: Optional[str] = None
+
+class SpecialistBatch(BaseModel):
+    items: List[SpecialistTask]
+
+def _overloaded(e: ServiceOverloadedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"status": "Overloaded", "detail": str(e)},
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+def create_app(service: SpecialistService, action: str) -> FastAPI:
+    """
+    FastAPI app serving a specialist
+
+    Routes are ``POST /<action>`` for one task, ``POST /<action>/batch`` for
+    many, ``GET /health``, ``GET /ready`` and ``GET /stats``.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Installed globally, so the client's default telemetry exports through it
+        telemetry = configure_telemetry(service_name=f"{service.role.value}-agent", set_global=True)
+        await service.client.start_health_probes()
+        yield
+        await service.close()
+        telemetry.shutdown()
+
+    app = FastAPI(title=f"{service.role.value} agent", lifespan=lifespan)
+
+    @app.post(f"/{action}")
+    async def run_task(task: SpecialistTask):
+        try:
+            response = await service.submit(service.task_request(**task.model_dump()))
+        except ServiceOverloadedError as e:
+            return _overloaded(e)
+        return to_jsonable(response)
+
+    @app.post(f"/{action}/batch")
+    async def run_batch(batch: SpecialistBatch):
+        if not batch.items:
+            raise HTTPException(status_code=422, detail="Batch has no items")
+        try:
+            responses = await service.submit_many(
+                [service.task_request(**task.model_dump()) for task in batch.items]
+            )
+        except ServiceOverloadedError as e:
+            return _overloaded(e)
+        return {"responses": to_jsonable(responses)}
+
+    @app.get("/health")
+    async def health():
+        return await service.health()
+
+    @app.get("/ready")
+    async def ready():
+        # Not ready while shedding load, so the balancer sends work elsewhere
+        snapshot = await service.health()
+        if snapshot["status"] != "healthy":
+            return JSONResponse(status_code=503, content=snapshot)
+        return snapshot
+
+    @app.get("/stats")
+    async def stats():
+        return service.stats()
+
+    return app
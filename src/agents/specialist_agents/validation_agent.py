@@ -1,8 +1,95 @@
 # Agente de Validação
+"""
+Validation Agent
+Standalone validator service: validates content in micro-batched agent tasks
 
-def validate(content):
-    # TODO: Implementar a lógica de validação
-    print(f"Validating content: {content}")
-    return {"validation_status": "valid"}
+Run ``python -m src.agents.specialist_agents.validation_agent`` to serve
+``POST /validate`` and ``POST /validate/batch`` on its own port. Content is
+checked by the rule engine first; only ambiguous content reaches the LLM.
+"""
 
+import os
+from dataclasses import replace
+from typing import Dict, Any, Optional
 
+import structlog
+
+from ..shared.agent_models import AgentRole, TaskRequest, TaskResponse
+from .rule_engine import RuleEngine, ESCALATE
+from .service import SpecialistService, TaskExecutor, create_app
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+class RuleFastPath:
+    """
+    Decides clear-cut validations locally with the rule engine
+
+    Escalated content goes to the LLM validator together with the rule
+    findings. Every result records its ``decision_path``.
+    """
+
+    def __init__(self, engine: Optional[RuleEngine] = None):
+        """
+        Initialize rule fast path
+
+        Args:
+            engine: Rule engine, configured from VALIDATION_RULES_PATH by default
+        """
+        self.engine = engine or RuleEngine()
+
+    async def __call__(self, task_request: TaskRequest, execute: TaskExecutor) -> TaskResponse:
+        decision = self.engine.evaluate(task_request.input_data.get("content_to_validate"))
+        if decision.outcome != ESCALATE:
+            logger.debug("Validated locally", task_id=task_request.task_id,
+                         outcome=decision.outcome, elapsed_us=decision.elapsed_us)
+            return TaskResponse(
+                task_id=task_request.task_id,
+                agent_role=AgentRole.VALIDATOR,
+                status="success",
+                result=decision.to_result(),
+                metadata={"model": "rule-engine", "tokens_used": 0, "cost": 0.0,
+                          "rule_time_us": decision.elapsed_us},
+                execution_time=decision.elapsed_us / 1e6
+            )
+
+        input_data = dict(task_request.input_data,
+                          rule_findings={"issues": decision.issues, "decision_path": decision.decision_path})
+        response = await execute(replace(task_request, input_data=input_data))
+        if isinstance(response.result, dict):
+            verdict = response.result.get("validation_status", response.status)
+            response.result["decision_path"] = decision.decision_path + [f"llm:{verdict}"]
+            response.result["validated_locally"] = False
+        response.metadata["rule_time_us"] = decision.elapsed_us
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return self.engine.stats()
+
+service = SpecialistService(
+    AgentRole.VALIDATOR,
+    fast_path=RuleFastPath() if os.getenv("VALIDATION_FAST_PATH", "1") != "0" else None
+)
+app = create_app(service, "validate")
+
+async def validate(content: Any, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Validate content with the validator agent
+
+    Args:
+        content: Content to validate
+        context: Optional task context
+
+    Returns:
+        Validator result: validation_status, quality_score, issues_found, approved
+        and the decision_path that led to it
+
+    Raises:
+        SpecialistTaskError: When the agent task fails
+    """
+    return await service.run(service.task_request({"content_to_validate": content}, context=context))
+
+# Relative imports need the package: run from src/ as python -m agents.specialist_agents.validation_agent
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8003")))
@@ -0,0 +1,46 @@
+"""
+Benchmark fixtures
+
+Run the suite and store results as JSON for comparison across commits:
+
+    cd src
+    python -m pytest tests/benchmarks --benchmark-only --benchmark-autosave
+    pytest-benchmark compare
+
+or write a single file with ``--benchmark-json=benchmark-results.json``.
+The network is stubbed out, so results measure the client's own overhead.
+"""
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient
+
+# Token usage reported by every stubbed completion
+STUB_USAGE = SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+
+@pytest.fixture
+def make_stub_client(make_client):
+    """Factory of clients whose OpenAI calls are stubbed, with an optional fixed network latency"""
+    def make(latency: float = 0.0, **kwargs) -> AzureAIFoundryClient:
+        client, _ = make_client(
+            fake={"content": "Stub completion", "delay": latency, "usage": STUB_USAGE},
+            retry_policies={},
+            **kwargs
+        )
+        return client
+    return make
+
+@pytest.fixture
+def loop():
+    """One event loop per benchmark so loop creation is not part of the measurement"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
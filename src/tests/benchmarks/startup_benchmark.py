@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures import time, client construction and time to first call of AzureAIFoundryClient
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Any
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEAVY_MODULES = ["azure.identity", "azure.ai.ml", "azure.ai.textanalytics", "openai"]
+
+# Runs in a fresh interpreter so every sample is a true cold start
+PROBE = """
+import sys, time, json, asyncio
+sys.path.insert(0, {src_dir!r})
+
+start = time.perf_counter()
+from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient
+from agents.shared.agent_models import AgentRole, TaskRequest
+imported = time.perf_counter()
+
+client = AzureAIFoundryClient()
+constructed = time.perf_counter()
+
+response = asyncio.run(client.execute_agent_task(
+    TaskRequest(task_id="startup", agent_role=AgentRole.VALIDATOR, input_data={{"probe": True}})
+))
+first_call = time.perf_counter()
+
+print(json.dumps({{
+    "import_time": imported - start,
+    "construct_time": constructed - imported,
+    "first_call_time": first_call - constructed,
+    "time_to_first_call": first_call - start,
+    "first_call_status": response.status,
+    "heavy_modules_loaded": [name for name in {heavy_modules!r} if name in sys.modules]
+}}))
+"""
+
+def run_probe() -> Dict[str, Any]:
+    """Run one cold-start sample in a subprocess"""
+    code = PROBE.format(src_dir=SRC_DIR, heavy_modules=HEAVY_MODULES)
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median, min and max of every timing across samples"""
+    summary = {}
+    for metric in ("import_time", "construct_time", "first_call_time", "time_to_first_call"):
+        values = [sample[metric] for sample in samples]
+        summary[metric] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values)
+        }
+    summary["first_call_status"] = samples[-1]["first_call_status"]
+    summary["heavy_modules_loaded"] = samples[-1]["heavy_modules_loaded"]
+    return summary
+
+def main() -> int:
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description="Startup benchmark for AzureAIFoundryClient")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold-start samples")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    results = {"runs": args.runs, "summary": summarize(samples), "samples": samples}
+
+    print(json.dumps(results["summary"], indent=2))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from types import SimpleNamespace
+
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.prompt_renderer import PromptRenderer
+
+def large_nested_input(sections: int = 50) -> dict:
+    """Upstream results shaped like analyst and generator output"""
+    return {
+        "task_description": "Produce a quarterly report",
+        "analysis_results": [
+            {
+                "content": f"Section {index} " + "observation " * 40,
+                "insights": [f"insight {index}.{item}" for item in range(10)],
+                "metrics": {"score": index / sections, "confidence": 0.9, "samples": index * 10},
+                "timestamp": 1700000000.0 + index,
+                "agent_role": "analyst"
+            }
+            for index in range(sections)
+        ],
+        "validation_criteria": {"min_quality": 0.8, "checks": ["accuracy", "tone", "compliance"]}
+    }
+
+def test_execute_agent_task_overhead(benchmark, loop, make_stub_client):
+    client = make_stub_client()
+    request = TaskRequest(task_id="bench", agent_role=AgentRole.ANALYST, input_data={"data": "x" * 200})
+
+    response = benchmark(lambda: loop.run_until_complete(client.execute_agent_task(request)))
+
+    assert response.status == "success"
+
+def test_build_messages_large_nested_input(benchmark, make_stub_client):
+    client = make_stub_client()
+    agent_config = client.agent_configs[AgentRole.GENERATOR]
+    request = TaskRequest(task_id="bench", agent_role=AgentRole.GENERATOR,
+                          input_data=large_nested_input(), context={"plan": "step " * 200})
+
+    messages = benchmark(client._build_messages, request, agent_config)
+
+    assert messages[0]["role"] == "system"
+
+def test_render_input_large_nested_input(benchmark):
+    renderer = PromptRenderer()
+    input_data = large_nested_input()
+
+    rendered = benchmark(renderer.render_input, input_data)
+
+    assert rendered.startswith("analysis_results: ")
+
+@pytest.mark.parametrize("agent_role", list(AgentRole), ids=lambda role: role.value)
+def test_process_agent_response(benchmark, agent_role, make_stub_client):
+    client = make_stub_client()
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="Result " * 300))]
+    )
+
+    result = benchmark(client._process_agent_response, response, agent_role)
+
+    assert result["content"]
@@ -0,0 +1,49 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import pytest
+
+# Simulated network latency per completion; workflows make four sequential calls
+STUB_LATENCY = 0.005
+WORKFLOWS_PER_ROUND = 32
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+@pytest.mark.parametrize("concurrency", [1, 8, 32])
+def test_orchestrate_multiagent_workflow_throughput(benchmark, loop, concurrency, make_stub_client):
+    client = make_stub_client(latency=STUB_LATENCY)
+    latencies = []
+    round_times = []
+
+    async def run_workflow(index: int, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            start = loop.time()
+            result = await client.orchestrate_multiagent_workflow(
+                {"workflow_id": f"bench_{index}", "task_description": "benchmark"}
+            )
+            latencies.append(loop.time() - start)
+            return result
+
+    async def run_round():
+        semaphore = asyncio.Semaphore(concurrency)
+        start = loop.time()
+        results = await asyncio.gather(*(run_workflow(index, semaphore) for index in range(WORKFLOWS_PER_ROUND)))
+        round_times.append(loop.time() - start)
+        return results
+
+    results = benchmark.pedantic(lambda: loop.run_until_complete(run_round()), rounds=3, iterations=1)
+
+    assert all(result["status"] == "completed" for result in results)
+    # Timed here as well so the extra info exists with --benchmark-disable
+    round_time = sum(round_times) / len(round_times)
+    benchmark.extra_info.update({
+        "concurrency": concurrency,
+        "workflows_per_round": WORKFLOWS_PER_ROUND,
+        "throughput_per_second": WORKFLOWS_PER_ROUND / round_time,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p99": percentile(latencies, 0.99)
+    })
@@ -0,0 +1,152 @@
+"""
+Test Fixtures
+AzureAIFoundryClient wired to a fake chat completions endpoint
+"""
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional, Callable, Tuple
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient
+
+def completion(content: str, usage: Any) -> SimpleNamespace:
+    """Chat completion response with one choice"""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=usage
+    )
+
+class FakeStream:
+    """
+    Streamed completion: one chunk per delta, then the usage chunk when there is one
+
+    Each chunk waits ``delay`` seconds; ``on_end`` is called after the last one.
+    """
+
+    def __init__(self, deltas: List[str], usage: Any = None, delay: float = 0.0,
+                 on_end: Optional[Callable[[], None]] = None):
+        self.deltas = deltas
+        self.usage = usage
+        self.delay = delay
+        self.on_end = on_end
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for delta in self.deltas:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))],
+                usage=None
+            )
+        if self.usage:
+            # Final chunk sent when stream_options.include_usage is requested
+            yield SimpleNamespace(choices=[], usage=self.usage)
+        if self.on_end:
+            self.on_end()
+
+class FakeRawResponses:
+    """``with_raw_response`` view of FakeCompletions, exposing rate limit headers"""
+
+    def __init__(self, completions: "FakeCompletions"):
+        self.completions = completions
+
+    async def create(self, **kwargs):
+        response = await self.completions.create(**kwargs)
+        return SimpleNamespace(headers=self.completions.headers, parse=lambda: response)
+
+class FakeCompletions:
+    """
+    Chat completions endpoint double
+
+    Every call's arguments are recorded in ``calls``. Each call consumes the
+    next of ``steps``: an exception is raised, a number is a delay in seconds
+    before answering. Without steps left, calls wait ``delay`` and then raise
+    ``error`` when set. ``content`` is a string or a function of the call's
+    arguments and its 1-based number, and may raise to fail the call.
+
+    Streams send ``deltas``, or the content in ``chunk_size`` pieces, waiting
+    ``chunk_delay`` before each. ``events`` records ("start", number) when a
+    call arrives and ("end", number) when its response or stream is complete.
+    """
+
+    def __init__(self,
+                 content: Any = "ok",
+                 usage: Any = None,
+                 steps: List[Any] = (),
+                 delay: float = 0.0,
+                 error: Optional[Exception] = None,
+                 deltas: Optional[List[str]] = None,
+                 stream_usage: Any = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 chunk_size: Optional[int] = None,
+                 chunk_delay: float = 0.0):
+        self.content = content
+        self.usage = usage or SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        self.steps = list(steps)
+        self.delay = delay
+        self.error = error
+        self.deltas = deltas
+        self.stream_usage = stream_usage
+        self.headers = headers or {}
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.calls: List[Dict[str, Any]] = []
+        self.events: List[Tuple[str, int]] = []
+        self.with_raw_response = FakeRawResponses(self)
+
+    @property
+    def models(self) -> List[str]:
+        return [call["model"] for call in self.calls]
+
+    @property
+    def messages(self) -> Optional[List[Dict[str, str]]]:
+        """Messages of the last call"""
+        return self.calls[-1]["messages"] if self.calls else None
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        number = len(self.calls)
+        self.events.append(("start", number))
+        if self.steps:
+            step = self.steps.pop(0)
+            if isinstance(step, Exception):
+                raise step
+            await asyncio.sleep(step)
+        else:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+        content = self.content(kwargs, number) if callable(self.content) else self.content
+        if kwargs.get("stream"):
+            deltas = self.deltas
+            if deltas is None:
+                size = self.chunk_size or len(content) or 1
+                deltas = [content[index:index + size] for index in range(0, len(content), size)] or [content]
+            return FakeStream(deltas, self.stream_usage, self.chunk_delay,
+                              on_end=lambda: self.events.append(("end", number)))
+        self.events.append(("end", number))
+        return completion(content, self.usage)
+
+@pytest.fixture
+def make_client():
+    """
+    Factory of (client, completions) pairs
+
+    ``fake`` holds FakeCompletions options; other keyword arguments go to
+    AzureAIFoundryClient.
+    """
+    def make(fake: Optional[Dict[str, Any]] = None, **kwargs):
+        client = AzureAIFoundryClient(**kwargs)
+        completions = FakeCompletions(**(fake or {}))
+        client.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        return client, completions
+    return make
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI Server
+OpenAI-compatible chat completions stand-in with latency distributions and fault injection
+"""
+
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any, Optional, Iterator
+
+import structlog
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+# z-score of the 99th percentile of a standard normal distribution
+Z_99 = 2.326
+
+FILLER_WORDS = ["analysis", "insight", "pattern", "result", "quality", "content", "data", "summary"]
+
+@dataclass
+class ModelProfile:
+    """Simulated behaviour of one model deployment"""
+    # Time to first token follows a log-normal distribution given by its p50 and p99
+    ttft_p50: float = 0.2
+    ttft_p99: float = 1.0
+    tokens_per_second: float = 50.0
+    completion_tokens: int = 64
+    error_429_rate: float = 0.0
+    error_500_rate: float = 0.0
+    retry_after: float = 1.0
+
+    def sample_ttft(self, rng: random.Random) -> float:
+        """Draw a time to first token in seconds"""
+        if self.ttft_p50 <= 0:
+            return 0.0
+        if self.ttft_p99 <= self.ttft_p50:
+            return self.ttft_p50
+        sigma = math.log(self.ttft_p99 / self.ttft_p50) / Z_99
+        return rng.lognormvariate(math.log(self.ttft_p50), sigma)
+
+    def token_interval(self) -> float:
+        """Seconds between generated tokens"""
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+@dataclass
+class LocalServerConfig:
+    """Model profiles of the local server; unknown models use the default profile"""
+    models: Dict[str, ModelProfile] = field(default_factory=dict)
+    default: ModelProfile = field(default_factory=ModelProfile)
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "LocalServerConfig":
+        return cls(
+            models={name: ModelProfile(**profile) for name, profile in raw.get("models", {}).items()},
+            default=ModelProfile(**raw.get("default", {})),
+            seed=raw.get("seed")
+        )
+
+    def profile(self, model: str) -> ModelProfile:
+        return self.models.get(model, self.default)
+
+@dataclass
+class ServerStats:
+    """Request counters of the local server"""
+    requests: int = 0
+    streamed: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    completion_tokens: int = 0
+
+def _estimate_prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Rough prompt size: 4 characters per token plus per-message overhead"""
+    return sum(len(str(message.get("content") or "")) // 4 + 4 for message in messages)
+
+def _completion_words(messages: List[Dict[str, Any]], count: int) -> List[str]:
+    """Deterministic completion text of ``count`` words"""
+    last = str(messages[-1].get("content") or "") if messages else ""
+    words = ["Simulated", "response:"] + last.split()[:8]
+    while len(words) < count:
+        words.append(FILLER_WORDS[len(words) % len(FILLER_WORDS)])
+    return words[:max(1, count)]
+
+def _error_response(status_code: int, message: str, error_type: str,
+                    headers: Dict[str, str] = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": error_type, "code": str(status_code)}},
+        headers=headers
+    )
+
+def create_app(config: LocalServerConfig = None) -> FastAPI:
+    """
+    Build the local OpenAI-compatible server
+
+    Serves ``/v1/chat/completions`` (OpenAI) and
+    ``/openai/deployments/{deployment}/chat/completions`` (Azure OpenAI),
+    with and without streaming, plus ``/v1/models`` and ``/stats``.
+    """
+    config = config or LocalServerConfig()
+    rng = random.Random(config.seed)
+    stats = ServerStats()
+    app = FastAPI(title="Local OpenAI Server")
+    app.state.config = config
+    app.state.stats = stats
+
+    async def chat_completions(request: Request, model: Optional[str] = None):
+        body = await request.json()
+        model = model or body.get("model", "default")
+        profile = config.profile(model)
+        stats.requests += 1
+
+        # Fault injection happens before any simulated latency, as with a real gateway
+        roll = rng.random()
+        if roll < profile.error_429_rate:
+            stats.rate_limited += 1
+            return _error_response(
+                429, "Rate limit exceeded (simulated)", "rate_limit_error",
+                headers={
+                    "retry-after-ms": str(int(profile.retry_after * 1000)),
+                    "x-ratelimit-remaining-requests": "0",
+                    "x-ratelimit-remaining-tokens": "0"
+                }
+            )
+        if roll < profile.error_429_rate + profile.error_500_rate:
+            stats.server_errors += 1
+            return _error_response(500, "Internal server error (simulated)", "server_error")
+
+        messages = body.get("messages", [])
+        max_tokens = body.get("max_tokens") or profile.completion_tokens
+        words = _completion_words(messages, min(profile.completion_tokens, max_tokens))
+        prompt_tokens = _estimate_prompt_tokens(messages)
+        completion_tokens = len(words)
+        stats.completion_tokens += completion_tokens
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        ttft = profile.sample_ttft(rng)
+        interval = profile.token_interval()
+
+        if not body.get("stream"):
+            await asyncio.sleep(ttft + interval * (completion_tokens - 1))
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": " ".join(words)},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            }
+
+        stats.streamed += 1
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None,
+                  choices: bool = True, **extra) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if choices else []
+            }
+            payload.update(extra)
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events():
+            await asyncio.sleep(ttft)
+            yield chunk({"role": "assistant", "content": ""})
+            for index, word in enumerate(words):
+                if index:
+                    await asyncio.sleep(interval)
+                yield chunk({"content": word if index == len(words) - 1 else f"{word} "})
+            yield chunk({}, finish_reason="stop")
+            if include_usage:
+                yield chunk({}, choices=False, usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat_completions(request: Request):
+        return await chat_completions(request)
+
+    @app.post("/openai/deployments/{deployment}/chat/completions")
+    async def azure_chat_completions(deployment: str, request: Request):
+        return await chat_completions(request, model=deployment)
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {
+            "object": "list",
+            "data": [{"id": name, "object": "model", "owned_by": "local"} for name in config.models]
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return asdict(stats)
+
+    return app
+
+@contextmanager
+def run_local_server(config: LocalServerConfig = None,
+                     host: str = "127.0.0.1",
+                     port: int = 0) -> Iterator[str]:
+    """
+    Run the local server in a background thread
+
+    Args:
+        config: Model profiles
+        host: Interface to bind
+        port: Port to bind, 0 picks a free one
+
+    Yields:
+        Base URL of the server, e.g. ``http://127.0.0.1:54321``
+    """
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("Local OpenAI server failed to start")
+            time.sleep(0.01)
+        bound_port = server.servers[0].sockets[0].getsockname()[1]
+        yield f"http://{host}:{bound_port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+def main() -> int:
+    """Run the local server"""
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible server")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--config", type=str, default=None, help="JSON file with model profiles")
+    parser.add_argument("--ttft-p50", type=float, default=0.2, help="Default median time to first token")
+    parser.add_argument("--ttft-p99", type=float, default=1.0, help="Default p99 time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--error-429-rate", type=float, default=0.0)
+    parser.add_argument("--error-500-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.config:
+        with open(args.config) as config_file:
+            config = LocalServerConfig.from_dict(json.load(config_file))
+    else:
+        config = LocalServerConfig(
+            default=ModelProfile(
+                ttft_p50=args.ttft_p50,
+                ttft_p99=args.ttft_p99,
+                tokens_per_second=args.tokens_per_second,
+                error_429_rate=args.error_429_rate,
+                error_500_rate=args.error_500_rate
+            ),
+            seed=args.seed
+        )
+
+    import uvicorn
+
+    logger.info("Starting local OpenAI server", host=args.host, port=args.port)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
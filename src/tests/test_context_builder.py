@@ -0,0 +1,98 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.context_builder import ContextBuilder, TokenCounter, TRUNCATION_MARKER
+
+def test_compact_drops_bookkeeping_empty_and_duplicate_fields():
+    builder = ContextBuilder()
+    result = {
+        "content": "same text",
+        "generated_content": "same text",
+        "agent_role": "generator",
+        "timestamp": 123.4,
+        "notes": None,
+        "tags": [],
+        "score": 0,
+        "approved": False
+    }
+
+    assert builder.compact(result) == {
+        "generated_content": "same text",
+        "score": 0,
+        "approved": False
+    }
+
+def test_compact_keeps_distinct_fields_with_equal_values():
+    builder = ContextBuilder()
+    result = {"summary": "ok", "status": "ok", "content": "draft", "generated_content": "final"}
+
+    assert builder.compact(result) == result
+
+def test_build_keeps_top_level_input_keys_and_compacts_upstream_results():
+    builder = ContextBuilder()
+    context, input_data = builder.build(
+        AgentRole.VALIDATOR,
+        "system",
+        {"plan": "do it", "timestamp": 1.0},
+        {"agent_role": "validator", "content_to_validate": {"content": "x", "timestamp": 2.0}}
+    )
+
+    assert context == {"plan": "do it"}
+    assert input_data == {"agent_role": "validator", "content_to_validate": {"content": "x"}}
+
+def test_fit_truncates_largest_field_to_budget():
+    builder = ContextBuilder(counter=TokenCounter(), min_field_tokens=8)
+    value = {"summary": "short", "content": "word " * 2000}
+
+    fitted = builder.fit(value, 200)
+
+    assert builder.count(fitted) <= 200
+    assert fitted["summary"] == "short"
+    assert TRUNCATION_MARKER in fitted["content"]
+
+def test_fit_counts_each_field_once():
+    counted = []
+    counter = TokenCounter()
+    count = counter.count
+    counter.count = lambda text: counted.append(text) or count(text)
+    builder = ContextBuilder(counter=counter)
+    value = {"fields": {f"f{index}": "word " * 200 for index in range(20)}}
+
+    fitted = builder.fit(value, 300)
+
+    assert builder.count(fitted) <= 300
+    # Each field is measured once up front, not once per truncation
+    assert sum(text == "word " * 200 for text in counted) == 20
+
+def test_build_gives_input_priority_over_context():
+    builder = ContextBuilder(role_budgets={AgentRole.GENERATOR: 300})
+    context, input_data = builder.build(
+        AgentRole.GENERATOR,
+        "system prompt",
+        {"coordinator_plan": "plan " * 1000},
+        {"request": "write a report"}
+    )
+
+    assert input_data == {"request": "write a report"}
+    assert builder.count(context) + builder.count(input_data) <= 300
+
+def test_chained_prompt_stays_within_role_budget(make_client):
+    builder = ContextBuilder(role_budgets={AgentRole.VALIDATOR: 500})
+    client, completions = make_client(context_builder=builder)
+
+    request = TaskRequest(
+        task_id="t1",
+        agent_role=AgentRole.VALIDATOR,
+        input_data={"content_to_validate": {"content": "paragraph " * 3000, "timestamp": 1.0}},
+        context={"result": "plan " * 3000, "agent_role": "coordinator"}
+    )
+    response = asyncio.run(client.execute_agent_task(request))
+
+    assert response.status == "success"
+    prompt = "".join(message["content"] for message in completions.messages)
+    assert builder.counter.count(prompt) <= 520
+    assert "timestamp" not in prompt
+    assert "agent_role" not in prompt
@@ -1,11 +1,104 @@
+import json
+import time
+import asyncio
 from fastapi.testclient import TestClient
-from src.agents.coordinator.main import app
+from src.agents.coordinator.main import app, get_job_queue, get_work_queue
+from src.agents.coordinator.job_queue import JobQueue
+from src.agents.coordinator.work_queue import InMemoryWorkQueue
 
 client = TestClient(app)
 
 def test_process_task():
     response = client.post("/tasks/", json={"description": "Test task"})
+    assert response.status_code == 202
+    assert response.json()["status"] == "Task received"
+    assert response.json()["status_url"] == f"/tasks/{response.json()['task_id']}"
+
+def test_task_status_and_result_can_be_polled():
+    with TestClient(app) as polling_client:
+        task_id = polling_client.post("/tasks/", json={"description": "Test task"}).json()["task_id"]
+
+        for _ in range(100):
+            status = polling_client.get(f"/tasks/{task_id}").json()["status"]
+            if status in ("completed", "failed"):
+                break
+            time.sleep(0.05)
+
+        result = polling_client.get(f"/tasks/{task_id}/result")
+        assert result.status_code == 200
+        assert result.json()["status"] == "completed"
+        assert result.json()["result"]["workflow_id"] == task_id
+
+def test_unknown_task_returns_404():
+    assert client.get("/tasks/missing").status_code == 404
+
+def test_full_queue_returns_503_with_retry_after():
+    release = asyncio.Event()
+
+    async def blocked_handler(payload):
+        await release.wait()
+
+    queue = JobQueue(blocked_handler, workers=1, max_depth=1)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+    try:
+        with TestClient(app) as burst_client:
+            statuses = [
+                burst_client.post("/tasks/", json={"description": f"Task {i}"}).status_code
+                for i in range(3)
+            ]
+            rejected = burst_client.post("/tasks/", json={"description": "Task 3"})
+            burst_client.portal.call(release.set)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert statuses == [202, 202, 503]
+    assert rejected.status_code == 503
+    assert int(rejected.headers["Retry-After"]) >= 1
+
+def test_tasks_go_to_shared_work_queue_when_configured():
+    queue = InMemoryWorkQueue()
+    app.dependency_overrides[get_work_queue] = lambda: queue
+    try:
+        task_id = client.post("/tasks/", json={"description": "Test task"}).json()["task_id"]
+        status = client.get(f"/tasks/{task_id}").json()["status"]
+        pending = client.get(f"/tasks/{task_id}/result")
+
+        # A worker process would lease and acknowledge the job
+        item = asyncio.run(queue.lease("worker"))
+        asyncio.run(queue.ack(item, {"workflow_id": task_id}))
+        result = client.get(f"/tasks/{task_id}/result").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert status == "queued"
+    assert pending.status_code == 202
+    assert item.kind == "workflow" and item.payload["task_description"] == "Test task"
+    assert result["status"] == "completed"
+    assert result["result"]["workflow_id"] == task_id
+
+def test_stream_task_emits_deltas_then_final_response():
+    response = client.post("/tasks/stream", json={"description": "Test task", "agent_role": "analyst"})
     assert response.status_code == 200
-    assert response.json() == {"status": "Task received"}
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [block for block in response.text.split("\n\n") if block]
+    assert events[0].startswith("event: delta")
+    assert events[-1].startswith("event: done")
+
+    final = json.loads(events[-1].split("data: ", 1)[1])
+    assert final["agent_role"] == "analyst"
+    assert final["metadata"]["streamed"] is True
+    assert final["metadata"]["time_to_first_token"] is not None
+
+def test_stream_task_rejects_unknown_role():
+    response = client.post("/tasks/stream", json={"description": "Test task", "agent_role": "unknown"})
+    assert response.status_code == 422
 
+def test_health_and_ready_serve_probe_snapshot():
+    with TestClient(app) as health_client:
+        health = health_client.get("/health")
+        ready = health_client.get("/ready")
 
+    assert health.status_code == 200
+    assert set(health.json()["services"]) == {"openai", "ml_workspace", "text_analytics"}
+    assert ready.status_code == 200
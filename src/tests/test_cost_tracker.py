@@ -0,0 +1,95 @@
+import sys
+import os
+import json
+import asyncio
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient
+from agents.shared.cost_tracker import (
+    CostTracker, ModelPrice, PriceTable, TokenUsage, WorkflowBudget
+)
+
+USAGE = SimpleNamespace(prompt_tokens=800, completion_tokens=200, total_tokens=1000,
+                        prompt_tokens_details={"cached_tokens": 500})
+
+def test_price_table_bills_cached_prompt_tokens_at_discount():
+    table = PriceTable({"gpt-4": ModelPrice(prompt=0.03, completion=0.06, cached_prompt=0.015)})
+    usage = TokenUsage(prompt_tokens=1000, completion_tokens=500, cached_tokens=400)
+
+    assert table.cost("gpt-4", usage) == pytest.approx((600 * 0.03 + 400 * 0.015 + 500 * 0.06) / 1000)
+    assert table.price("gpt-4-0613") is table.prices["gpt-4"]
+    assert table.cost("unknown-model", usage) == 0.0
+
+def test_price_table_loads_from_json(tmp_path):
+    path = tmp_path / "prices.json"
+    path.write_text(json.dumps({"custom": {"prompt": 1.0, "completion": 2.0}}))
+
+    table = PriceTable.from_file(str(path))
+
+    assert table.cost("custom", TokenUsage(prompt_tokens=1000, completion_tokens=1000)) == 3.0
+
+def test_tracker_rolls_up_per_workflow_and_tenant():
+    tracker = CostTracker(PriceTable({"m": ModelPrice(prompt=1.0, completion=1.0)}), max_workflows=1)
+    tracker.record("m", TokenUsage(1000, 0), workflow_id="w1", tenant_id="acme")
+    tracker.record("m", TokenUsage(0, 1000), workflow_id="w2", tenant_id="acme")
+
+    assert "w1" not in tracker.workflows
+    assert tracker.workflow_summary("w2").cost == 1.0
+    assert tracker.tenant_summary("acme").to_dict()["total_tokens"] == 2000
+    assert tracker.stats()["total"]["cost"] == 2.0
+
+def test_task_metadata_records_prompt_completion_and_cached_tokens(make_client):
+    client, _ = make_client(fake={"usage": USAGE})
+    response = asyncio.run(client.execute_agent_task(TaskRequest(
+        task_id="t1", agent_role=AgentRole.ANALYST, input_data={"x": 1},
+        workflow_id="w1", tenant_id="acme"
+    )))
+
+    assert response.metadata["usage"] == {
+        "prompt_tokens": 800, "completion_tokens": 200, "cached_tokens": 500, "total_tokens": 1000
+    }
+    assert response.metadata["cost"] == pytest.approx((800 * 0.03 + 200 * 0.06) / 1000)
+    assert client.cost_tracker.tenant_summary("acme").tasks == 1
+
+def test_simulated_tasks_record_estimated_usage():
+    client = AzureAIFoundryClient()
+    response = asyncio.run(client.execute_agent_task(TaskRequest(
+        task_id="t1", agent_role=AgentRole.ANALYST, input_data={"x": 1}, workflow_id="w1"
+    )))
+
+    assert response.metadata["usage_estimated"] is True
+    assert response.metadata["usage"]["prompt_tokens"] > 0
+    assert client.cost_tracker.workflow_summary("w1").usage.total_tokens == response.metadata["tokens_used"]
+
+def test_workflow_stops_once_budget_is_spent(make_client):
+    client, completions = make_client(fake={"usage": USAGE})
+    result = asyncio.run(client.orchestrate_multiagent_workflow({
+        "workflow_id": "w1",
+        "tenant_id": "acme",
+        "budget": {"max_tokens": 1500}
+    }))
+
+    assert result["status"] == "budget_exhausted"
+    statuses = {node_id: response.status for node_id, response in result["agent_results"].items()}
+    assert statuses == {"analyst": "success", "generator": "skipped", "validator": "skipped"}
+    assert result["usage"]["total_tokens"] == 2000
+    assert len(completions.models) == 2
+
+def test_workflow_downgrades_model_once_budget_is_spent(make_client):
+    client, completions = make_client(fake={"usage": USAGE})
+    result = asyncio.run(client.orchestrate_multiagent_workflow({
+        "workflow_id": "w1",
+        "budget": {"max_cost": 0.01, "on_exhausted": "downgrade", "downgrade_model": "gpt-35-turbo"}
+    }))
+
+    assert result["status"] == "completed"
+    assert completions.models == ["gpt-4", "gpt-35-turbo", "gpt-35-turbo", "gpt-35-turbo"]
+    assert result["agent_results"]["validator"].metadata["budget_downgraded"] is True
+
+def test_unknown_budget_action_fails_workflow():
+    with pytest.raises(ValueError):
+        WorkflowBudget.from_dict({"on_exhausted": "ignore"})
@@ -0,0 +1,152 @@
+import sys
+import os
+import json
+import asyncio
+import subprocess
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskRequest, TaskResponse
+from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient
+
+DELTAS = ["Hello", " ", "world"]
+
+async def collect(stream):
+    return [item async for item in stream]
+
+def test_execute_agent_task_stream_yields_deltas_and_final_response(make_client):
+    client, completions = make_client(fake={"deltas": DELTAS})
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.GENERATOR, input_data={"x": 1})
+
+    items = asyncio.run(collect(client.execute_agent_task_stream(request)))
+
+    assert items[:-1] == ["Hello", " ", "world"]
+    final = items[-1]
+    assert isinstance(final, TaskResponse)
+    assert final.status == "success"
+    assert final.result["content"] == "Hello world"
+    assert final.metadata["usage_estimated"] is True
+    # Estimated prompt tokens plus one token per content chunk
+    assert final.metadata["tokens_used"] > 3
+    assert final.metadata["time_to_first_token"] <= final.execution_time
+    assert completions.calls[0]["stream"] is True
+    assert completions.calls[0]["extra_body"] == {"stream_options": {"include_usage": True}}
+
+def test_stream_options_are_only_sent_where_azure_accepts_them(monkeypatch):
+    azure = {"openai_endpoint": "https://example.openai.azure.com", "openai_api_key": "key"}
+    assert AzureAIFoundryClient(**azure)._stream_options() == {}
+    monkeypatch.setenv("AZURE_OPENAI_API_VERSION", "2024-10-21")
+    assert AzureAIFoundryClient(**azure)._stream_options() == \
+        {"extra_body": {"stream_options": {"include_usage": True}}}
+
+def test_execute_agent_task_stream_reports_usage_chunk(make_client):
+    client, completions = make_client(fake={
+        "deltas": DELTAS,
+        "stream_usage": SimpleNamespace(prompt_tokens=40, completion_tokens=3, total_tokens=43)
+    })
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.GENERATOR, input_data={"x": 1})
+
+    final = asyncio.run(collect(client.execute_agent_task_stream(request)))[-1]
+
+    assert final.metadata["tokens_used"] == 43
+    assert final.metadata["usage_estimated"] is False
+
+@pytest.fixture
+def make_batch_client(make_client):
+    def make(delay=0.02):
+        client, _ = make_client()
+        state = {"in_flight": 0, "peak": 0, "order": []}
+
+        async def execute_agent_task(task_request):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            state["order"].append(task_request.task_id)
+            await asyncio.sleep(delay)
+            state["in_flight"] -= 1
+            return TaskResponse(
+                task_id=task_request.task_id,
+                agent_role=task_request.agent_role,
+                status="success",
+                result={},
+                metadata={},
+                execution_time=delay
+            )
+
+        client.execute_agent_task = execute_agent_task
+        return client, state
+    return make
+
+def test_execute_agent_tasks_bounds_concurrency_and_keeps_input_order(make_batch_client):
+    client, state = make_batch_client()
+    requests = [
+        TaskRequest(task_id=f"t{i}", agent_role=AgentRole.ANALYST, input_data={}, priority=i % 3)
+        for i in range(10)
+    ]
+
+    batch = asyncio.run(client.execute_agent_tasks(requests, max_concurrency=3))
+
+    assert [r.task_id for r in batch.responses] == [f"t{i}" for i in range(10)]
+    assert state["peak"] == 3
+    assert batch.max_concurrency == 3
+    assert batch.wall_time > 0
+    assert batch.queue_delay_max >= batch.queue_delay_avg > 0
+
+def test_execute_agent_tasks_dispatches_by_priority(make_batch_client):
+    client, state = make_batch_client(delay=0.001)
+    requests = [
+        TaskRequest(task_id="low", agent_role=AgentRole.ANALYST, input_data={}, priority=5),
+        TaskRequest(task_id="high", agent_role=AgentRole.ANALYST, input_data={}, priority=1),
+        TaskRequest(task_id="mid", agent_role=AgentRole.ANALYST, input_data={}, priority=3),
+    ]
+
+    asyncio.run(client.execute_agent_tasks(requests, max_concurrency=1))
+
+    assert state["order"] == ["high", "mid", "low"]
+
+def test_execute_agent_tasks_as_completed_yields_every_response(make_batch_client):
+    client, _ = make_batch_client()
+    requests = [
+        TaskRequest(task_id=f"t{i}", agent_role=AgentRole.ANALYST, input_data={})
+        for i in range(5)
+    ]
+
+    results = asyncio.run(collect(client.execute_agent_tasks_as_completed(requests, max_concurrency=2)))
+
+    assert all(requests[index].task_id == r.task_id for index, r in results)
+    assert sorted(index for index, _ in results) == list(range(5))
+    assert all("queue_delay" in r.metadata for _, r in results)
+
+def test_client_defers_heavy_sdk_imports_until_first_use():
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import sys, json\n"
+        f"sys.path.insert(0, {src_dir!r})\n"
+        "from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient\n"
+        "AzureAIFoundryClient()\n"
+        "print(json.dumps([m for m in ('azure.identity', 'azure.ai.ml', 'azure.ai.textanalytics', 'openai', 'numpy') "
+        "if m in sys.modules]))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert json.loads(output.stdout.strip().splitlines()[-1]) == []
+
+def test_text_analytics_probe_polls_a_missing_job_instead_of_analyzing(monkeypatch):
+    monkeypatch.setenv("AZURE_TEXT_ANALYTICS_ENDPOINT", "https://language.example.com/")
+    requests = []
+
+    def handle(request):
+        requests.append(request)
+        return httpx.Response(404)
+
+    client = AzureAIFoundryClient()
+    client.__dict__["text_analytics_client"] = SimpleNamespace()
+    client.__dict__["credential"] = SimpleNamespace(get_token=lambda scope: SimpleNamespace(token="t"))
+    client.transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+    asyncio.run(client._health_probes()["text_analytics"]())
+
+    assert requests[0].method == "GET"
+    assert requests[0].url.path.startswith("/language/analyze-text/jobs/")
+    assert requests[0].headers["Authorization"] == "Bearer t"
@@ -0,0 +1,93 @@
+import sys
+import os
+import time
+import asyncio
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient
+from agents.shared.health_prober import HealthProber, NotConfigured
+
+class FlakyProbe:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("refused")
+
+def test_dependency_turns_unhealthy_after_consecutive_failures_and_recovers():
+    async def not_configured():
+        raise NotConfigured()
+
+    probe = FlakyProbe(failures=2)
+    prober = HealthProber({"openai": probe, "text_analytics": not_configured}, unhealthy_after=2)
+
+    async def run():
+        statuses = []
+        for _ in range(3):
+            snapshot = await prober.probe_once()
+            statuses.append((snapshot["services"]["openai"], snapshot["overall_status"]))
+        return statuses, snapshot
+
+    statuses, snapshot = asyncio.run(run())
+
+    assert statuses == [("degraded", "degraded"), ("unhealthy", "unhealthy"), ("healthy", "healthy")]
+    assert snapshot["services"]["text_analytics"] == "not_configured"
+    assert abs(snapshot["details"]["openai"]["error_rate"] - 2 / 3) < 1e-9
+    assert snapshot["details"]["openai"]["last_error"] is None
+
+def test_slow_probe_times_out():
+    async def hang():
+        await asyncio.sleep(10)
+
+    prober = HealthProber({"openai": hang}, timeout=0.05, unhealthy_after=1)
+    snapshot = asyncio.run(prober.probe_once())
+
+    assert snapshot["services"]["openai"] == "unhealthy"
+
+def test_background_prober_serves_cached_snapshot():
+    probe = FlakyProbe(failures=0)
+    prober = HealthProber({"openai": probe}, interval=0.02)
+
+    async def run():
+        await prober.start()
+        await asyncio.sleep(0.1)
+        start = time.perf_counter()
+        for _ in range(1000):
+            prober.snapshot()
+        elapsed = time.perf_counter() - start
+        await prober.stop()
+        return elapsed
+
+    elapsed = asyncio.run(run())
+
+    assert probe.calls >= 2
+    assert prober.snapshot()["overall_status"] == "healthy"
+    assert not prober.running
+    assert elapsed < 0.01
+
+def test_client_health_check_lists_models_instead_of_completing():
+    calls = []
+
+    async def list_models():
+        calls.append("models.list")
+        return []
+
+    async def create(**kwargs):
+        calls.append("chat.completions.create")
+
+    client = AzureAIFoundryClient()
+    client.openai_client = SimpleNamespace(
+        models=SimpleNamespace(list=list_models),
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+
+    first = asyncio.run(client.health_check())
+    second = asyncio.run(client.health_check())
+
+    assert calls == ["models.list"]
+    assert first["services"]["openai"] == "healthy"
+    assert second is first
@@ -0,0 +1,71 @@
+import sys
+import os
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient
+from agents.shared.http_transport import SharedHTTPTransport, TransportConfig
+from agents.shared.rate_limiter import RateLimiterRegistry, RateLimitConfig
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+def test_warm_up_opens_connections_that_later_requests_reuse(local_server):
+    transport = SharedHTTPTransport(TransportConfig(max_connections=4, warm_up_connections=3))
+
+    async def run():
+        warmed = await transport.warm_up(local_server)
+        after_warm_up = transport.metrics.new_connections
+        for _ in range(3):
+            await transport.async_client.get(local_server)
+        await transport.aclose()
+        return warmed, after_warm_up
+
+    warmed, after_warm_up = asyncio.run(run())
+
+    assert warmed == 3
+    assert after_warm_up == 3
+    assert transport.metrics.new_connections == 3
+    assert transport.stats()["requests"] == 6
+    assert transport.stats()["pool_wait_max"] >= 0
+
+def test_pool_is_sized_from_rate_limiter_concurrency():
+    registry = RateLimiterRegistry(model_configs={
+        "gpt-4": RateLimitConfig(max_concurrency=10),
+        "gpt-35-turbo": RateLimitConfig(max_concurrency=20)
+    })
+    client = AzureAIFoundryClient(rate_limiter=registry)
+    assert client.transport_metrics()["max_connections"] == 30
+
+    explicit = AzureAIFoundryClient(rate_limiter=registry,
+                                    transport_config=TransportConfig(max_connections=5))
+    assert explicit.transport_metrics()["max_connections"] == 5
+
+def test_openai_client_uses_shared_http_client(monkeypatch):
+    monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    client = AzureAIFoundryClient()
+
+    assert client.openai_client._client is client.transport.async_client
@@ -0,0 +1,84 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskRequest, TaskResponse
+from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient
+from tests.local_openai_server import (
+    LocalServerConfig, ModelProfile, run_local_server
+)
+from agents.shared.retry_policy import RetryPolicy
+
+FAST = ModelProfile(ttft_p50=0.001, ttft_p99=0.005, tokens_per_second=0, completion_tokens=12)
+
+@pytest.fixture
+def local_server():
+    config = LocalServerConfig(default=FAST, models={"flaky": ModelProfile(
+        ttft_p50=0, tokens_per_second=0, error_429_rate=1.0, retry_after=0.01
+    )}, seed=7)
+    with run_local_server(config) as base_url:
+        yield base_url
+
+def make_request(**overrides):
+    return TaskRequest(task_id="t1", agent_role=AgentRole.ANALYST, input_data={"data": "x"}, **overrides)
+
+def test_profile_latency_follows_configured_quantiles():
+    import random
+    profile = ModelProfile(ttft_p50=0.2, ttft_p99=1.0)
+    rng = random.Random(1)
+    samples = sorted(profile.sample_ttft(rng) for _ in range(5000))
+
+    assert samples[2500] == pytest.approx(0.2, rel=0.1)
+    assert samples[4950] == pytest.approx(1.0, rel=0.25)
+
+def test_client_completes_tasks_through_local_server(monkeypatch, local_server):
+    monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    client = AzureAIFoundryClient(openai_base_url=f"{local_server}/v1")
+
+    async def run():
+        response = await client.execute_agent_task(make_request())
+        streamed = [item async for item in client.execute_agent_task_stream(make_request())]
+        await client.close()
+        return response, streamed
+
+    response, streamed = asyncio.run(run())
+
+    assert response.status == "success"
+    assert response.metadata["usage"]["completion_tokens"] == 12
+    assert isinstance(streamed[-1], TaskResponse)
+    assert "".join(streamed[:-1]) == streamed[-1].result["content"]
+    assert len(streamed) == 13
+
+def test_azure_deployment_route(local_server):
+    client = AzureAIFoundryClient(openai_endpoint=local_server, openai_api_key="key")
+
+    async def run():
+        response = await client.execute_agent_task(make_request(model_override="gpt-4"))
+        await client.close()
+        return response
+
+    assert asyncio.run(run()).status == "success"
+    assert httpx.get(f"{local_server}/stats").json()["requests"] == 1
+
+def test_injected_rate_limits_are_retried_by_the_client(monkeypatch, local_server):
+    monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+    client = AzureAIFoundryClient(
+        openai_base_url=f"{local_server}/v1",
+        retry_policies={AgentRole.ANALYST: RetryPolicy(max_attempts={"rate_limit": 3})}
+    )
+
+    async def run():
+        response = await client.execute_agent_task(make_request(model_override="flaky"))
+        await client.close()
+        return response
+
+    response = asyncio.run(run())
+
+    assert response.status == "error"
+    assert response.metadata["attempts"] == 3
+    assert httpx.get(f"{local_server}/stats").json()["rate_limited"] == 3
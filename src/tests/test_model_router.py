@@ -0,0 +1,108 @@
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.model_router import ModelRouter, ModelTier
+from agents.shared.retry_policy import RetryPolicy
+
+TIERS = [
+    ModelTier(name="small", model="small-model", max_prompt_tokens=100),
+    ModelTier(name="medium", model="medium-model", max_prompt_tokens=1000, latency_slo=0.5),
+    ModelTier(name="large", model="large-model")
+]
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self):
+        super().__init__("throttled")
+        self.response = SimpleNamespace(headers={"retry-after-ms": "60000"})
+
+@pytest.fixture
+def make_routed_client(make_client):
+    def make(router, throttled=()):
+        def content(call, number):
+            if call["model"] in throttled:
+                raise RateLimitError()
+            return "ok"
+
+        return make_client(fake={"content": content}, model_router=router,
+                           retry_policies={role: RetryPolicy() for role in AgentRole})
+    return make
+
+def names(tiers):
+    return [tier.name for tier in tiers]
+
+def test_routes_from_role_tier_and_escalates_large_prompts():
+    router = ModelRouter(TIERS, role_tiers={AgentRole.VALIDATOR: "small"})
+
+    assert names(router.route(AgentRole.VALIDATOR, prompt_tokens=50)) == ["small", "medium", "large"]
+    assert names(router.route(AgentRole.VALIDATOR, prompt_tokens=500)) == ["medium", "large"]
+    assert names(router.route(AgentRole.VALIDATOR, prompt_tokens=5000)) == ["large"]
+
+def test_low_quality_moves_role_to_next_tier():
+    router = ModelRouter(TIERS, role_tiers={AgentRole.GENERATOR: "small"}, quality_min_samples=3)
+    for _ in range(3):
+        router.record_quality("small-model", AgentRole.GENERATOR, 0.2)
+
+    assert names(router.route(AgentRole.GENERATOR, prompt_tokens=50)) == ["medium", "large", "small"]
+
+def test_slow_and_throttled_tiers_are_tried_last():
+    router = ModelRouter(TIERS, role_tiers={AgentRole.ANALYST: "medium"}, latency_min_samples=3)
+    for _ in range(3):
+        router.record_success(TIERS[1], 2.0)
+
+    assert names(router.route(AgentRole.ANALYST, prompt_tokens=50)) == ["large", "small", "medium"]
+
+    router.record_failure(TIERS[2], "rate_limit", retry_after=60)
+    assert names(router.route(AgentRole.ANALYST, prompt_tokens=50)) == ["small", "medium", "large"]
+
+def test_client_falls_back_immediately_when_tier_is_throttled(make_routed_client):
+    router = ModelRouter(TIERS, role_tiers={AgentRole.VALIDATOR: "small"})
+    client, completions = make_routed_client(router, throttled={"small-model"})
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.VALIDATOR, input_data={"x": 1})
+
+    response = asyncio.run(client.execute_agent_task(request))
+
+    assert response.status == "success"
+    assert completions.models == ["small-model", "medium-model"]
+    assert response.metadata["model"] == "medium-model"
+    assert response.metadata["tier"] == "medium"
+    assert response.metadata["fallbacks"] == 1
+    assert router.stats()["small"]["throttled"] is True
+
+    # The throttled tier is skipped for the next task
+    asyncio.run(client.execute_agent_task(request))
+    assert completions.models[-1] == "medium-model"
+
+def test_stream_open_falls_back_when_tier_is_throttled(make_routed_client):
+    router = ModelRouter(TIERS, role_tiers={AgentRole.VALIDATOR: "small"})
+    client, completions = make_routed_client(router, throttled={"small-model"})
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.VALIDATOR, input_data={"x": 1})
+
+    async def collect():
+        return [item async for item in client.execute_agent_task_stream(request)]
+
+    items = asyncio.run(collect())
+
+    assert items[0] == "ok"
+    final = items[-1]
+    assert final.status == "success"
+    assert completions.models == ["small-model", "medium-model"]
+    assert final.metadata["model"] == "medium-model"
+    assert final.metadata["fallbacks"] == 1 and final.metadata["attempts"] == 2
+
+def test_model_override_bypasses_router(make_routed_client):
+    router = ModelRouter(TIERS)
+    client, completions = make_routed_client(router)
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.VALIDATOR, input_data={"x": 1},
+                          model_override="pinned")
+
+    asyncio.run(client.execute_agent_task(request))
+
+    assert completions.models == ["pinned"]
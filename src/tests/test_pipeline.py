@@ -0,0 +1,102 @@
+import sys
+import os
+import copy
+import json
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.shared.agent_models import AgentRole, TaskResponse
+from agents.shared.structured_output import StructuredOutput
+from agents.shared.pipeline import StreamingTextField, SectionSplitter, merge_validations
+
+PARAGRAPHS = ["First section " + "a" * 420, "Second section " + "b" * 420, "Closing line"]
+
+ROLE_OUTPUTS = {
+    "Coordinator": {"task_assignments": ["analyst", "generator", "validator"],
+                    "workflow_steps": ["analyze", "generate", "validate"]},
+    "Analysis Agent": {"insights": ["sales up"], "patterns": ["p" * 200], "confidence_score": 0.9},
+    "Generation Agent": {"generated_content": "\n\n".join(PARAGRAPHS)},
+    "Validation Agent": {"validation_status": "passed", "quality_score": 0.8, "approved": True}
+}
+
+def role_of(kwargs):
+    system_prompt = kwargs["messages"][0]["content"]
+    return next(name for name in ROLE_OUTPUTS if name in system_prompt)
+
+def make_pipeline_client(make_client, outputs=None):
+    """Client whose roles answer with their outputs as JSON, streamed in 20 character chunks"""
+    outputs = outputs or ROLE_OUTPUTS
+    return make_client(
+        fake={"content": lambda call, number: json.dumps(outputs[role_of(call)]),
+              "delay": 0.001, "chunk_size": 20, "chunk_delay": 0.001},
+        structured_output=StructuredOutput()
+    )
+
+def role_events(completions):
+    return [(event, role_of(completions.calls[number - 1])) for event, number in completions.events]
+
+def test_streaming_text_field_decodes_escapes_split_across_chunks():
+    text = json.dumps({"content_type": "text", "generated_content": 'a "b"\n\ncé\\d'})
+    field = StreamingTextField("generated_content")
+    decoded = "".join(field.feed(text[index:index + 3]) for index in range(0, len(text), 3))
+    assert decoded == 'a "b"\n\ncé\\d'
+
+    plain = StreamingTextField("generated_content")
+    assert plain.feed("  Plain ") + plain.feed("text") == "  Plain text"
+
+def test_section_splitter_groups_paragraphs_up_to_min_chars():
+    splitter = SectionSplitter(min_chars=10)
+    assert splitter.feed("short\n\n") == []
+    assert splitter.feed("another one\n\ntail") == ["short\n\nanother one"]
+    assert splitter.flush() == ["tail"]
+    assert splitter.flush() == []
+
+def test_merge_validations_requires_every_section_to_pass():
+    responses = [
+        TaskResponse(task_id=f"v{index}", agent_role=AgentRole.VALIDATOR, status="success",
+                     result={"validation_status": status, "approved": approved, "quality_score": score,
+                             "issues_found": issues, "structured": True},
+                     metadata={"tokens_used": 10, "cost": 0.5}, execution_time=0.1)
+        for index, (status, approved, score, issues) in enumerate([
+            ("passed", True, 0.9, []), ("failed", False, 0.5, ["unsupported claim"])
+        ])
+    ]
+    merged = merge_validations("w_validator", responses, 0.2)
+    assert merged.result["approved"] is False
+    assert merged.result["validation_status"] == "failed"
+    assert merged.result["quality_score"] == 0.7
+    assert merged.result["issues_found"] == ["unsupported claim"]
+    assert merged.metadata["tokens_used"] == 20
+
+def test_pipelined_workflow_overlaps_stages(make_client):
+    client, completions = make_pipeline_client(make_client)
+
+    result = asyncio.run(client.orchestrate_multiagent_workflow(
+        {"workflow_id": "w1", "execution_mode": "pipelined"}
+    ))
+
+    events = role_events(completions)
+    assert result["execution_mode"] == "pipelined"
+    assert result["status"] == "completed"
+    # Generation starts on the insights prefix, validation on the first section
+    assert events.index(("start", "Generation Agent")) < events.index(("end", "Analysis Agent"))
+    assert events.index(("start", "Validation Agent")) < events.index(("end", "Generation Agent"))
+
+    validator = result["agent_results"]["validator"]
+    assert validator.result["sections"] == 3
+    assert validator.result["approved"] is True
+    timeline = result["pipeline"]
+    assert timeline["generator_started"] < timeline["analyst_done"]
+    assert timeline["validation_started"] < timeline["generator_done"]
+
+def test_pipelined_mode_falls_back_to_graph_for_other_plans(make_client):
+    outputs = copy.deepcopy(ROLE_OUTPUTS)
+    outputs["Coordinator"]["task_assignments"].remove("generator")
+    client, _ = make_pipeline_client(make_client, outputs)
+
+    result = asyncio.run(client.orchestrate_multiagent_workflow(
+        {"workflow_id": "w2", "execution_mode": "pipelined"}
+    ))
+
+    assert result["execution_mode"] == "graph"
+    assert "pipeline" not in result
@@ -0,0 +1,53 @@
+import sys
+import os
+from dataclasses import replace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.shared.agent_models import AgentRole, AgentConfig, TaskRequest
+from agents.shared.azure_ai_foundry_client import AzureAIFoundryClient
+from agents.shared.prompt_renderer import PromptRenderer, canonical_json
+from agents.shared.response_cache import make_cache_key
+
+CONFIG = AgentConfig(role=AgentRole.ANALYST, system_prompt="You analyze data.", capabilities=["a"])
+
+def test_canonical_json_is_independent_of_key_order():
+    first = {"b": {"y": 1, "x": [1, 2]}, "a": AgentRole.ANALYST}
+    second = {"a": AgentRole.ANALYST, "b": {"x": [1, 2], "y": 1}}
+
+    assert canonical_json(first) == canonical_json(second) == '{"a":"analyst","b":{"x":[1,2],"y":1}}'
+
+def test_render_puts_system_prompt_first_and_context_before_input():
+    renderer = PromptRenderer()
+    messages = renderer.render(CONFIG, {"plan": "p"}, {"zeta": "z", "alpha": {"k": 1}})
+
+    assert messages == [
+        {"role": "system", "content": "You analyze data."},
+        {"role": "user", "content": 'Context: {"plan":"p"}\n\nalpha: {"k":1}\nzeta: z'}
+    ]
+
+def test_equal_requests_render_byte_identical_prompts_and_cache_keys():
+    renderer = PromptRenderer()
+    first = renderer.render(CONFIG, None, {"a": 1, "b": {"c": 2, "d": 3}})
+    second = renderer.render(CONFIG, None, {"b": {"d": 3, "c": 2}, "a": 1})
+
+    assert first == second
+    assert make_cache_key(CONFIG, first) == make_cache_key(CONFIG, second)
+    assert make_cache_key(replace(CONFIG, model="gpt-35-turbo"), first) != make_cache_key(CONFIG, first)
+
+def test_templates_are_rendered_once_per_config():
+    renderer = PromptRenderer()
+
+    assert renderer.template(CONFIG) is renderer.template(replace(CONFIG))
+    assert renderer.template(CONFIG) is not renderer.template(replace(CONFIG, system_prompt="Other"))
+
+def test_client_prompts_share_the_system_prefix_across_tasks():
+    client = AzureAIFoundryClient()
+    config = client.agent_configs[AgentRole.GENERATOR]
+    messages = [
+        client._build_messages(TaskRequest(task_id=str(index), agent_role=AgentRole.GENERATOR,
+                                           input_data={"topic": f"topic {index}"}), config)
+        for index in range(2)
+    ]
+
+    assert messages[0][0] == messages[1][0] == {"role": "system", "content": config.system_prompt}
+    assert len(messages[0]) == 2
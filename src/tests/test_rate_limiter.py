@@ -0,0 +1,88 @@
+import sys
+import os
+import time
+import asyncio
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.rate_limiter import (
+    TokenBucket, AdaptiveConcurrencyLimiter, DeploymentRateLimiter,
+    RateLimitConfig, RateLimiterRegistry
+)
+
+class ThrottledError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after="0"):
+        super().__init__("Too Many Requests")
+        self.response = SimpleNamespace(headers={"retry-after": retry_after})
+
+@pytest.fixture
+def make_limited_client(make_client):
+    def make(registry, failures=0, headers=None):
+        client, _ = make_client(
+            fake={"steps": [ThrottledError()] * failures, "headers": headers,
+                  "usage": SimpleNamespace(total_tokens=50)},
+            rate_limiter=registry,
+            retry_policies={}
+        )
+        return client
+    return make
+
+def test_token_bucket_waits_for_refill():
+    async def run():
+        bucket = TokenBucket(capacity=10, refill_per_second=100)
+        await bucket.acquire(10)
+        start = time.monotonic()
+        await bucket.acquire(5)
+        return time.monotonic() - start
+
+    assert 0.04 <= asyncio.run(run()) < 0.5
+
+def test_concurrency_limiter_is_aimd():
+    limiter = AdaptiveConcurrencyLimiter(initial=8, minimum=1, maximum=10, decrease_cooldown=0)
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    for _ in range(4):
+        limiter.on_success()
+    assert 4.9 < limiter.limit < 5.1
+    for _ in range(10):
+        limiter.on_throttle()
+    assert limiter.limit == 1
+
+def test_remaining_headers_cap_local_buckets():
+    limiter = DeploymentRateLimiter(RateLimitConfig(tokens_per_minute=1000, requests_per_minute=100))
+    limiter.update_from_headers({
+        "x-ratelimit-remaining-tokens": "120",
+        "x-ratelimit-remaining-requests": "3"
+    })
+    assert limiter.tokens.tokens <= 121
+    assert limiter.requests.tokens <= 4
+
+def test_execute_agent_task_charges_limiter_and_reads_headers(make_limited_client):
+    registry = RateLimiterRegistry(default_config=RateLimitConfig(tokens_per_minute=10000))
+    client = make_limited_client(registry, headers={"x-ratelimit-remaining-tokens": "5000"})
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.ANALYST, input_data={"x": 1})
+
+    response = asyncio.run(client.execute_agent_task(request))
+
+    assert response.status == "success"
+    assert "rate_limit_wait" in response.metadata
+    limiter = registry.get(client.openai_endpoint or "openai", "gpt-4")
+    assert limiter.tokens.tokens <= 5001
+    assert limiter.concurrency.limit > limiter.config.initial_concurrency
+
+def test_throttled_request_reduces_concurrency(make_limited_client):
+    registry = RateLimiterRegistry()
+    client = make_limited_client(registry, failures=1)
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.ANALYST, input_data={"x": 1})
+
+    response = asyncio.run(client.execute_agent_task(request))
+
+    assert response.status == "error"
+    limiter = registry.get(client.openai_endpoint or "openai", "gpt-4")
+    assert limiter.throttled_count == 1
+    assert limiter.concurrency.limit == pytest.approx(limiter.config.initial_concurrency / 2)
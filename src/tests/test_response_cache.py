@@ -0,0 +1,74 @@
+import sys
+import os
+import time
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.response_cache import (
+    InMemoryCacheBackend, SQLiteCacheBackend, ResponseCache
+)
+
+def test_in_memory_backend_evicts_least_recently_used_by_size():
+    backend = InMemoryCacheBackend(max_bytes=10)
+    backend.set("a", b"aaaa")
+    backend.set("b", b"bbbb")
+    assert backend.get("a") == b"aaaa"
+    backend.set("c", b"cccc")
+
+    assert backend.get("b") is None
+    assert backend.get("a") == b"aaaa"
+    assert backend.current_bytes <= 10
+
+def test_in_memory_backend_expires_entries():
+    backend = InMemoryCacheBackend()
+    backend.set("a", b"value", ttl=0.01)
+    time.sleep(0.02)
+    assert backend.get("a") is None
+
+def test_sqlite_backend_persists_and_evicts(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SQLiteCacheBackend(path, max_bytes=10)
+    backend.set("a", b"aaaa")
+    backend.set("b", b"bbbb")
+    backend.get("a")
+    backend.set("c", b"cccc")
+    backend.close()
+
+    reopened = SQLiteCacheBackend(path, max_bytes=10)
+    assert reopened.get("a") == b"aaaa"
+    assert reopened.get("b") is None
+    assert reopened.get("c") == b"cccc"
+
+def test_sqlite_backend_reads_do_not_write(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+    backend.set("a", b"aaaa")
+    changes = backend._connection.total_changes
+
+    assert [backend.get("a") for _ in range(3)] == [b"aaaa"] * 3
+    assert backend._connection.total_changes == changes
+    backend.close()
+
+def test_execute_agent_task_uses_cache_for_low_temperature_roles(make_client):
+    client, completions = make_client(response_cache=ResponseCache())
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.VALIDATOR, input_data={"x": 1})
+
+    first = asyncio.run(client.execute_agent_task(request))
+    second = asyncio.run(client.execute_agent_task(request))
+
+    assert len(completions.calls) == 1
+    assert first.metadata["cache"]["hit"] is False
+    assert second.metadata["cache"]["hit"] is True
+    assert second.metadata["cache"]["hits"] == 1
+    assert second.metadata["cache"]["misses"] == 1
+    assert second.result["content"] == "ok"
+
+def test_execute_agent_task_skips_cache_above_temperature_threshold(make_client):
+    client, completions = make_client(response_cache=ResponseCache(max_temperature=0.3))
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.GENERATOR, input_data={"x": 1})
+
+    asyncio.run(client.execute_agent_task(request))
+    response = asyncio.run(client.execute_agent_task(request))
+
+    assert len(completions.calls) == 2
+    assert "cache" not in response.metadata
@@ -0,0 +1,88 @@
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.retry_policy import RetryPolicy, HedgingPolicy, classify_error
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+class APITimeoutError(Exception):
+    pass
+
+@pytest.fixture
+def make_scripted_client(make_client):
+    """Client whose calls follow ``steps``: an exception to raise or a delay before succeeding"""
+    def make(steps, **kwargs):
+        return make_client(fake={"steps": steps, "content": lambda call, number: f"call {number}"}, **kwargs)
+    return make
+
+def make_request():
+    return TaskRequest(task_id="t1", agent_role=AgentRole.ANALYST, input_data={"x": 1})
+
+def test_classify_error():
+    assert classify_error(StatusError(429)) == "rate_limit"
+    assert classify_error(StatusError(503)) == "server"
+    assert classify_error(StatusError(400)) == "client"
+    assert classify_error(APITimeoutError()) == "timeout"
+    assert classify_error(ConnectionResetError()) == "connection"
+    assert classify_error(ValueError()) == "client"
+
+def test_backoff_honours_retry_after_and_grows_exponentially():
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=0.0)
+    assert policy.backoff(1, StatusError(429, {"retry-after": "3"})) == 3.0
+    assert policy.backoff(1, StatusError(500)) == 1.0
+    assert policy.backoff(3, StatusError(500)) == 4.0
+    assert policy.backoff(10, StatusError(500)) == 10.0
+
+def test_transient_errors_are_retried(make_scripted_client):
+    policy = RetryPolicy(base_delay=0.001)
+    client, completions = make_scripted_client(
+        [StatusError(500), StatusError(429, {"retry-after-ms": "1"}), 0],
+        retry_policies={AgentRole.ANALYST: policy}
+    )
+
+    response = asyncio.run(client.execute_agent_task(make_request()))
+
+    assert response.status == "success"
+    assert len(completions.calls) == 3
+    assert response.metadata["retries"] == 2
+    assert response.metadata["attempts"] == 3
+
+def test_client_errors_are_not_retried(make_scripted_client):
+    client, completions = make_scripted_client([StatusError(400)])
+
+    response = asyncio.run(client.execute_agent_task(make_request()))
+
+    assert response.status == "error"
+    assert len(completions.calls) == 1
+    assert response.metadata["retries"] == 0
+
+def test_slow_request_is_hedged_and_fastest_wins(make_scripted_client):
+    client, completions = make_scripted_client(
+        [1.0, 0.0],
+        hedging_policies={AgentRole.ANALYST: HedgingPolicy(min_samples=5, min_delay=0.01)}
+    )
+    for _ in range(5):
+        client.latency_tracker.record(AgentRole.ANALYST.value, 0.02)
+
+    async def run():
+        start = asyncio.get_event_loop().time()
+        response = await client.execute_agent_task(make_request())
+        return response, asyncio.get_event_loop().time() - start
+
+    response, elapsed = asyncio.run(run())
+
+    assert elapsed < 0.5
+    assert len(completions.calls) == 2
+    assert response.metadata["hedged"] is True
+    assert response.metadata["hedge_won"] is True
+    assert response.result["content"] == "call 2"
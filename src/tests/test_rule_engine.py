@@ -0,0 +1,104 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.shared.agent_models import AgentRole, TaskResponse
+from agents.specialist_agents.rule_engine import (
+    AhoCorasick, RuleEngine, ValidationRules, cpf_valid, cnpj_valid, luhn_valid
+)
+from agents.specialist_agents.service import SpecialistService
+from agents.specialist_agents.validation_agent import RuleFastPath
+
+RULES = ValidationRules(
+    required_sections=["Summary"],
+    banned_terms=["guaranteed returns", "risk free"],
+    review_terms=["diagnosis"]
+)
+
+def test_aho_corasick_matches_whole_words_case_insensitively():
+    matcher = AhoCorasick(["he", "she", "hers", "risk free"])
+    assert matcher.find_all("Ushers said SHE is Risk Free") == [(12, "she"), (19, "risk free")]
+    assert matcher.found("her") == []
+
+def test_document_checksums():
+    assert cpf_valid("529.982.247-25") and not cpf_valid("529.982.247-24")
+    assert not cpf_valid("111.111.111-11")
+    assert cnpj_valid("11.222.333/0001-81") and not cnpj_valid("11.222.333/0001-80")
+    assert luhn_valid("4111 1111 1111 1111") and not luhn_valid("4111 1111 1111 1112")
+
+def test_rule_engine_passes_fails_and_escalates():
+    engine = RuleEngine(RULES)
+
+    clear = engine.evaluate("Summary: revenue grew 4% in Q3.")
+    banned = engine.evaluate("Summary: guaranteed returns for everyone.")
+    missing = engine.evaluate("Revenue grew 4% in Q3.")
+    pii = engine.evaluate("Summary: contact joao@example.com, CPF 529.982.247-25")
+    not_a_cpf = engine.evaluate("Summary: order 529.982.247-24 shipped")
+    review = engine.evaluate("Summary: the diagnosis is unclear")
+    phone = engine.evaluate("Summary: call +55 11 98765-4321")
+
+    assert clear.outcome == "pass"
+    assert clear.decision_path == ["schema:pass", "length:pass", "required_sections:pass",
+                                   "banned_terms:pass", "pii:pass", "review_terms:pass", "decision:pass"]
+    assert banned.outcome == "fail" and "banned_terms:fail" in banned.decision_path
+    assert missing.outcome == "fail" and missing.issues == ["Missing sections: summary"]
+    assert pii.outcome == "fail" and pii.issues == ["PII found: email, cpf"]
+    assert not_a_cpf.outcome == "pass"
+    assert review.outcome == "escalate" and phone.outcome == "escalate"
+    assert engine.stats()["local_ratio"] == 5 / 7
+
+def test_rule_engine_checks_generator_output_shape():
+    engine = RuleEngine(ValidationRules(banned_terms=["risk free"]))
+    assert engine.evaluate({"generated_content": "Fine"}).outcome == "pass"
+    malformed = engine.evaluate({"generated_content": 42})
+    assert malformed.outcome == "fail"
+    assert malformed.decision_path == ["schema:fail", "decision:fail"]
+    assert engine.evaluate("x" * 5000).outcome == "escalate"
+
+def test_rule_engine_needs_content_rules_to_pass():
+    engine = RuleEngine(ValidationRules())
+    decision = engine.evaluate("x")
+    assert decision.outcome == "escalate"
+    assert decision.decision_path == ["schema:pass", "length:pass", "pii:pass", "decision:escalate"]
+    assert engine.evaluate("Contact joao@example.com").outcome == "fail"
+
+def test_rule_engine_escalates_content_it_cannot_read():
+    engine = RuleEngine(ValidationRules())
+    missing = engine.evaluate({"content": "Draft without the generator field"})
+    assert missing.outcome == "escalate"
+    assert missing.decision_path == ["schema:escalate", "decision:escalate"]
+    assert missing.issues == ["Schema: generated_content is missing"]
+    empty = engine.evaluate(None)
+    assert empty.outcome == "escalate"
+    assert empty.decision_path == ["schema:escalate", "decision:escalate"]
+
+class CountingClient:
+    def __init__(self):
+        self.requests = []
+
+    async def execute_agent_tasks_as_completed(self, task_requests, max_concurrency=8, semaphore=None):
+        self.requests.extend(task_requests)
+        for index, request in enumerate(task_requests):
+            yield index, TaskResponse(task_id=request.task_id, agent_role=AgentRole.VALIDATOR, status="success",
+                                      result={"validation_status": "needs_review", "approved": False},
+                                      metadata={"tokens_used": 40}, execution_time=0.5)
+
+def test_fast_path_only_sends_ambiguous_content_to_the_llm():
+    client = CountingClient()
+    service = SpecialistService(AgentRole.VALIDATOR, client=client, max_wait_ms=1,
+                                fast_path=RuleFastPath(RuleEngine(RULES)))
+    contents = ["Summary: all good", "Summary: risk free!", "Summary: diagnosis pending"]
+
+    responses = asyncio.run(service.submit_many(
+        [service.task_request({"content_to_validate": content}) for content in contents]
+    ))
+
+    assert [response.result["validation_status"] for response in responses] == \
+        ["passed", "failed", "needs_review"]
+    assert responses[0].metadata["tokens_used"] == 0
+    assert responses[0].result["quality_score"] is None
+    assert len(client.requests) == 1
+    assert client.requests[0].input_data["rule_findings"]["issues"] == ["Needs review: diagnosis"]
+    assert responses[2].result["decision_path"][-2:] == ["decision:escalate", "llm:needs_review"]
+    assert service.stats()["fast_path"]["escalate"] == 1
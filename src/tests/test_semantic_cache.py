@@ -0,0 +1,107 @@
+import sys
+import os
+import time
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.semantic_cache import HashingEmbedder, SemanticCache, VectorIndex
+
+def test_embedder_scores_paraphrases_above_unrelated_text():
+    embedder = HashingEmbedder()
+    base = embedder.embed("Analyze monthly sales data for the northern region")
+    paraphrase = embedder.embed("analyze the monthly sales data for northern region")
+    unrelated = embedder.embed("Write a poem about autumn leaves")
+
+    assert abs(float(np.linalg.norm(base)) - 1.0) < 1e-5
+    assert float(base @ paraphrase) > 0.8
+    assert float(base @ unrelated) < 0.3
+
+def test_index_evicts_least_recently_used_and_expired_entries():
+    embedder = HashingEmbedder(dim=64)
+    index = VectorIndex(dim=64, capacity=2)
+    index.add("s", embedder.embed("first"), {"n": 1})
+    index.add("s", embedder.embed("second"), {"n": 2})
+    index.entries[0].last_access -= 10
+    index.add("s", embedder.embed("third"), {"n": 3})
+
+    assert sorted(entry.payload["n"] for entry in index.entries) == [2, 3]
+
+    expired = index.entries.index(next(entry for entry in index.entries if entry.payload["n"] == 2))
+    index.remove(expired)
+    index.add("s", embedder.embed("second"), {"n": 2}, ttl=-1)
+    slots = [slot for slot, _ in index.search("s", embedder.embed("second"), k=2)]
+    assert expired not in slots
+    assert len(index) == 1
+
+def test_expired_best_match_does_not_hide_a_live_one():
+    embedder = HashingEmbedder(dim=64)
+    cache = SemanticCache(embedder=embedder, index=VectorIndex(dim=64, capacity=4), default_threshold=0.5)
+    cache.store("s", "monthly sales report north", {"n": "live"})
+    cache.ttl = -1
+    cache.store("s", "monthly sales report for north", {"n": "expired"})
+
+    payload, _ = cache.lookup("s", AgentRole.ANALYST, "monthly sales report for north")
+
+    assert payload == {"n": "live"}
+
+def test_store_keeps_a_copy_of_the_payload():
+    cache = SemanticCache(embedder=HashingEmbedder(dim=64), index=VectorIndex(dim=64, capacity=4))
+    payload = {"result": {"insights": ["a"]}}
+    cache.store("s", "text", payload)
+    payload["result"]["insights"].append("mutated later")
+
+    assert cache.lookup("s", AgentRole.ANALYST, "text")[0] == {"result": {"insights": ["a"]}}
+
+def test_index_persists_to_directory(tmp_path):
+    embedder = HashingEmbedder(dim=64)
+    index = VectorIndex(dim=64, capacity=8, directory=str(tmp_path))
+    index.add("scope", embedder.embed("persist me"), {"value": "stored"})
+    index.flush()
+
+    reloaded = VectorIndex(dim=64, capacity=8, directory=str(tmp_path))
+    slot, similarity = reloaded.search("scope", embedder.embed("persist me"))[0]
+
+    assert reloaded.entries[slot].payload == {"value": "stored"}
+    assert similarity > 0.99
+
+def test_index_only_persists_vectors_with_their_entries(tmp_path):
+    embedder = HashingEmbedder(dim=64)
+    index = VectorIndex(dim=64, capacity=1, directory=str(tmp_path))
+    index.add("scope", embedder.embed("old request"), {"value": "old"})
+    index.flush()
+    # Reuses the only slot; the process dies before the next flush
+    index.add("scope", embedder.embed("new request"), {"value": "new"})
+
+    reloaded = VectorIndex(dim=64, capacity=1, directory=str(tmp_path))
+    slot, similarity = reloaded.search("scope", embedder.embed("old request"))[0]
+
+    assert reloaded.entries[slot].payload == {"value": "old"}
+    assert similarity > 0.99
+
+    index.flush()
+    assert sorted(os.listdir(tmp_path)) == ["entries.json", "vectors-2.npy"]
+
+def test_client_serves_paraphrased_requests_from_semantic_cache(make_client):
+    cache = SemanticCache(default_threshold=0.8)
+    client, completions = make_client(fake={"content": "analysis"}, semantic_cache=cache)
+
+    def request(text, role=AgentRole.ANALYST):
+        return TaskRequest(task_id="t", agent_role=role, input_data={"request": text})
+
+    first = asyncio.run(client.execute_agent_task(request("Analyze monthly sales data for the northern region")))
+    second = asyncio.run(client.execute_agent_task(request("analyze the monthly sales data for northern region")))
+    asyncio.run(client.execute_agent_task(request("Write a poem about autumn leaves")))
+
+    assert len(completions.calls) == 2
+    assert second.result == first.result
+    assert second.metadata["semantic_cache"]["hit"] is True
+    assert second.metadata["tokens_used"] == 0
+    assert cache.stats()["hits"] == 1
+
+    # Roles outside the configured set are never served from the semantic cache
+    asyncio.run(client.execute_agent_task(request("Analyze monthly sales data", AgentRole.GENERATOR)))
+    asyncio.run(client.execute_agent_task(request("Analyze monthly sales data", AgentRole.GENERATOR)))
+    assert len(completions.calls) == 4
@@ -0,0 +1,84 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.single_flight import SingleFlight
+
+@pytest.fixture
+def make_slow_client(make_client):
+    def make(fail=False):
+        return make_client(
+            fake={"content": "plan", "delay": 0.05, "error": ValueError("upstream failed") if fail else None},
+            single_flight=SingleFlight()
+        )
+    return make
+
+def request(task_id, role=AgentRole.ANALYST, data="same"):
+    return TaskRequest(task_id=task_id, agent_role=role, input_data={"request": data})
+
+def test_identical_concurrent_tasks_share_one_call(make_slow_client):
+    client, completions = make_slow_client()
+
+    async def run():
+        return await asyncio.gather(*(client.execute_agent_task(request(f"t{i}")) for i in range(5)))
+
+    responses = asyncio.run(run())
+
+    assert len(completions.calls) == 1
+    assert [response.task_id for response in responses] == ["t0", "t1", "t2", "t3", "t4"]
+    assert all(response.result["content"] == "plan" for response in responses)
+    assert sum(response.metadata["tokens_used"] for response in responses) == 15
+    assert [response.metadata["single_flight"]["coalesced"] for response in responses] == [
+        False, True, True, True, True
+    ]
+    assert client.single_flight.stats()["coalescing_ratio"] == 0.8
+    assert client.single_flight.stats()["in_flight"] == 0
+
+def test_different_and_high_temperature_tasks_are_not_coalesced(make_slow_client):
+    client, completions = make_slow_client()
+
+    async def run():
+        await asyncio.gather(
+            client.execute_agent_task(request("a", data="one")),
+            client.execute_agent_task(request("b", data="two")),
+            client.execute_agent_task(request("c", role=AgentRole.GENERATOR)),
+            client.execute_agent_task(request("d", role=AgentRole.GENERATOR))
+        )
+
+    asyncio.run(run())
+
+    assert len(completions.calls) == 4
+
+def test_upstream_error_is_fanned_out_to_every_waiter(make_slow_client):
+    client, completions = make_slow_client(fail=True)
+
+    async def run():
+        return await asyncio.gather(*(client.execute_agent_task(request(f"t{i}")) for i in range(3)))
+
+    responses = asyncio.run(run())
+
+    assert len(completions.calls) == 1
+    assert [response.status for response in responses] == ["error"] * 3
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        leader = asyncio.ensure_future(flight.run("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.run("key", call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == ("result", True)
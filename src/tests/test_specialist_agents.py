@@ -1,21 +1,172 @@
 import sys
 import os
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from agents.shared.agent_models import AgentRole, TaskRequest, TaskResponse
 from agents.specialist_agents.analysis_agent import analyze
 from agents.specialist_agents.generation_agent import generate
 from agents.specialist_agents.validation_agent import validate
+from agents.specialist_agents.micro_batcher import MicroBatcher
+from agents.specialist_agents.service import SpecialistService, SpecialistTaskError, create_app
 
 def test_analysis_agent():
-    result = analyze("Test data")
-    assert result == {"analysis": "completed"}
+    result = asyncio.run(analyze("Test data"))
+    assert result["agent_role"] == "analyst"
+    assert result["insights"]
 
 def test_generation_agent():
-    result = generate("Test prompt")
-    assert result == {"generated_content": "..."}
+    result = asyncio.run(generate("Test prompt"))
+    assert result["agent_role"] == "generator"
+    assert result["generated_content"]
 
 def test_validation_agent():
-    result = validate("Test content")
-    assert result == {"validation_status": "valid"}
+    result = asyncio.run(validate("Test content"))
+    assert result["agent_role"] == "validator"
+    assert result["validated_locally"] is False
+    # Default rules only check length and PII, so the LLM decides
+    assert result["decision_path"][-2] == "decision:escalate"
 
+def test_micro_batcher_flushes_on_size_and_on_timeout():
+    batches = []
 
+    async def double(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(double, max_batch_size=3, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(index) for index in range(4)))
+        return results, batcher.stats()
+
+    results, stats = asyncio.run(run())
+    assert results == [0, 2, 4, 6]
+    # Three items fill a batch at once; the fourth waits for the timer
+    assert batches == [[0, 1, 2], [3]]
+    assert stats["batches"] == 2 and stats["avg_batch_size"] == 2.0
+
+def test_micro_batcher_fails_every_caller_of_a_failed_batch():
+    async def broken(items):
+        raise ValueError("upstream down")
+
+    async def run():
+        batcher = MicroBatcher(broken, max_batch_size=2)
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_micro_batcher_answers_each_item_as_it_completes():
+    answered = []
+
+    async def staggered(items):
+        for index in sorted(range(len(items)), key=lambda index: -items[index]):
+            await asyncio.sleep(items[index] / 100)
+            yield index, items[index]
+
+    async def run():
+        batcher = MicroBatcher(staggered, max_batch_size=2)
+
+        async def call(item):
+            answered.append(await batcher.submit(item))
+
+        await asyncio.gather(call(1), call(5))
+
+    asyncio.run(run())
+    # The quick item is answered without waiting for the slow one
+    assert answered == [5, 1]
+
+class EchoClient:
+    """Records the size of each batch it executes and the peak concurrency"""
+
+    def __init__(self, delay=0.0, status="success"):
+        self.delay = delay
+        self.status = status
+        self.batch_sizes = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute_agent_tasks_as_completed(self, task_requests, max_concurrency=8, semaphore=None):
+        self.batch_sizes.append(len(task_requests))
+        semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+
+        async def run(index, request):
+            async with semaphore:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                await asyncio.sleep(self.delay)
+                self.in_flight -= 1
+            return index, TaskResponse(task_id=request.task_id, agent_role=request.agent_role, status=self.status,
+                                       result={"echo": request.input_data}, metadata={}, execution_time=0.0,
+                                       error="upstream 500" if self.status == "error" else None)
+
+        for response in asyncio.as_completed([run(index, request) for index, request in enumerate(task_requests)]):
+            yield await response
+
+    async def health_check(self):
+        return {"overall_status": "healthy", "services": {}}
+
+    async def start_health_probes(self):
+        pass
+
+    async def close(self):
+        pass
+
+def test_service_endpoints_batch_requests_and_shed_load():
+    client = EchoClient()
+    service = SpecialistService(AgentRole.VALIDATOR, client=client,
+                                max_batch_size=4, max_wait_ms=5, max_pending=4)
+    app = create_app(service, "validate")
+
+    with TestClient(app) as http:
+        single = http.post("/validate", json={"input_data": {"content_to_validate": "a"}})
+        batch = http.post("/validate/batch", json={"items": [
+            {"input_data": {"content_to_validate": str(index)}} for index in range(4)
+        ]})
+        too_many = http.post("/validate/batch", json={"items": [{"input_data": {}}] * 5})
+        health = http.get("/health")
+
+    assert single.status_code == 200
+    assert single.json()["result"] == {"echo": {"content_to_validate": "a"}}
+    assert [item["result"]["echo"]["content_to_validate"] for item in batch.json()["responses"]] == \
+        ["0", "1", "2", "3"]
+    # The four batch items went upstream as one micro batch
+    assert client.batch_sizes == [1, 4]
+    assert too_many.status_code == 503
+    assert int(too_many.headers["Retry-After"]) >= 1
+    assert health.json()["status"] == "healthy"
+    assert health.json()["max_pending"] == 4
+
+def test_service_concurrency_limit_spans_batches():
+    client = EchoClient(delay=0.02)
+    service = SpecialistService(AgentRole.ANALYST, client=client,
+                                max_batch_size=2, max_wait_ms=1, max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(service.submit(service.task_request({"n": index}))
+                                      for index in range(6)))
+
+    responses = asyncio.run(run())
+    assert [response.result["echo"]["n"] for response in responses] == list(range(6))
+    assert client.batch_sizes == [2, 2, 2]
+    assert client.peak == 2
+
+def test_service_answers_every_caller_of_a_shared_task_id():
+    service = SpecialistService(AgentRole.ANALYST, client=EchoClient(), max_batch_size=2, max_wait_ms=50)
+
+    async def run():
+        requests = [TaskRequest(task_id="same", agent_role=AgentRole.ANALYST, input_data={"n": index})
+                    for index in range(2)]
+        return await asyncio.wait_for(asyncio.gather(*(service.submit(request) for request in requests)), 1)
+
+    responses = asyncio.run(run())
+    assert [response.result["echo"]["n"] for response in responses] == [0, 1]
+
+def test_service_run_raises_on_failed_tasks():
+    service = SpecialistService(AgentRole.GENERATOR, client=EchoClient(status="error"), max_wait_ms=1)
+
+    with pytest.raises(SpecialistTaskError, match="upstream 500") as failure:
+        asyncio.run(service.run(service.task_request({"prompt": "p"})))
+    assert failure.value.response.status == "error"
@@ -0,0 +1,102 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.shared.agent_models import AgentRole, TaskResponse
+from agents.shared.state_store import InMemoryStateStore, SQLiteStateStore
+from agents.shared.workflow_engine import WorkflowEngine, WorkflowNode
+
+def make_response(task_id, status="success"):
+    return TaskResponse(
+        task_id=task_id,
+        agent_role=AgentRole.ANALYST,
+        status=status,
+        result={"task_id": task_id},
+        metadata={"tokens_used": 3},
+        execution_time=0.1
+    )
+
+def test_sqlite_store_roundtrips_step_responses(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+
+    async def run():
+        store = SQLiteStateStore(path)
+        await store.save_step("w1", "analyst", make_response("w1_analyst"))
+        await store.save_step("w1", "analyst", make_response("w1_analyst", status="error"))
+        await store.save_step("w2", "analyst", make_response("w2_analyst"))
+        await store.close()
+
+        reopened = SQLiteStateStore(path)
+        steps = await reopened.load_steps("w1")
+        await reopened.delete_workflow("w1")
+        remaining = await reopened.load_steps("w1")
+        await reopened.close()
+        return steps, remaining
+
+    steps, remaining = asyncio.run(run())
+    assert list(steps) == ["analyst"]
+    assert steps["analyst"].status == "error"
+    assert steps["analyst"].agent_role == AgentRole.ANALYST
+    assert steps["analyst"].result == {"task_id": "w1_analyst"}
+    assert remaining == {}
+
+def test_engine_reruns_failed_nodes_and_their_dependents():
+    executed = []
+
+    async def executor(task_request):
+        executed.append(task_request.task_id)
+        return make_response(task_request.task_id)
+
+    nodes = [
+        WorkflowNode(node_id="a", agent_role=AgentRole.ANALYST),
+        WorkflowNode(node_id="b", agent_role=AgentRole.ANALYST),
+        WorkflowNode(node_id="c", agent_role=AgentRole.GENERATOR, inputs={"x": "b"}),
+        WorkflowNode(node_id="d", agent_role=AgentRole.VALIDATOR, inputs={"y": "c"}),
+    ]
+    completed = {
+        "a": make_response("wf_a"),
+        "b": make_response("wf_b", status="error"),
+        "c": make_response("wf_c"),
+    }
+    saved = []
+
+    async def on_complete(node_id, response):
+        saved.append(node_id)
+
+    results = asyncio.run(WorkflowEngine(executor).run(
+        nodes, workflow_id="wf", completed=completed, on_complete=on_complete
+    ))
+
+    assert results["a"] is completed["a"]
+    assert sorted(executed) == ["wf_b", "wf_c", "wf_d"]
+    assert sorted(saved) == ["b", "c", "d"]
+
+def test_workflow_resumes_from_failed_validator(make_client):
+    roles = []
+    validator = {"up": False}
+
+    def answer(call, number):
+        system_prompt = call["messages"][0]["content"].lower()
+        role = "validator" if "validat" in system_prompt else "other"
+        roles.append(role)
+        if role == "validator" and not validator["up"]:
+            raise ValueError("validator unavailable")
+        return "done"
+
+    client, _ = make_client(fake={"content": answer}, state_store=InMemoryStateStore())
+
+    first = asyncio.run(client.orchestrate_multiagent_workflow({"workflow_id": "w1"}))
+
+    assert first["status"] == "failed"
+    assert first["failed_steps"] == ["validator"]
+    assert first["resumed_steps"] == []
+    calls_before_resume = len(roles)
+
+    validator["up"] = True
+    second = asyncio.run(client.orchestrate_multiagent_workflow({"workflow_id": "w1"}))
+
+    assert second["status"] == "completed"
+    assert roles[calls_before_resume:] == ["validator"]
+    assert sorted(second["resumed_steps"]) == ["analyst", "coordinator", "generator"]
+    assert second["agent_results"]["generator"].result == first["agent_results"]["generator"].result
@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.structured_output import (
+    IncrementalJSONParser, StructuredOutput, parse_role_output
+)
+
+ROLE_OUTPUTS = {
+    "Coordinator": {"task_assignments": ["analyst", "validator"], "workflow_steps": ["analyze", "validate"]},
+    "Analysis": {"insights": ["sales up"], "confidence_score": 0.9},
+    "Content Generation": {"generated_content": "report"},
+    "Validation": {"validation_status": "failed", "quality_score": 0.4, "approved": False,
+                   "issues_found": ["missing sources"]}
+}
+
+def role_output(call, number):
+    system_prompt = call["messages"][0]["content"]
+    return json.dumps(next(value for name, value in ROLE_OUTPUTS.items() if name in system_prompt))
+
+@pytest.fixture
+def make_structured_client(make_client):
+    def make():
+        return make_client(fake={"content": role_output}, structured_output=StructuredOutput())
+    return make
+
+def test_incremental_parser_emits_members_as_they_complete():
+    text = 'Here you go:\n```json\n{"approved": true, "issues_found": ["a \\"quoted\\", item", "b}"], "quality_score": 0.75}\n```'
+    parser = IncrementalJSONParser()
+    seen = []
+    for index in range(0, len(text), 3):
+        completed = parser.feed(text[index:index + 3])
+        seen.extend(completed)
+
+    assert seen == ["approved", "issues_found", "quality_score"]
+    assert parser.complete
+    assert parser.fields == {"approved": True, "issues_found": ['a "quoted", item', "b}"],
+                             "quality_score": 0.75}
+
+def test_parse_role_output_checks_types_and_falls_back_to_defaults():
+    parsed = parse_role_output(AgentRole.VALIDATOR, '{"approved": "yes", "quality_score": 0.8, "validation_status": "passed"}')
+    assert parsed["structured"] is True
+    assert parsed["quality_score"] == 0.8
+    assert parsed["approved"] is False
+    assert parsed["invalid_fields"] == ["approved"]
+
+    prose = parse_role_output(AgentRole.ANALYST, "Sales grew in every region.")
+    assert prose["structured"] is False
+    assert prose["insights"] == []
+
+def test_client_requests_json_and_parses_role_fields(make_structured_client):
+    client, completions = make_structured_client()
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.ANALYST, input_data={"x": 1})
+
+    response = asyncio.run(client.execute_agent_task(request))
+
+    assert completions.calls[0]["response_format"] == {"type": "json_object"}
+    assert "JSON schema" in completions.calls[0]["messages"][0]["content"]
+    assert response.result["insights"] == ["sales up"]
+    assert response.result["confidence_score"] == 0.9
+
+def test_workflow_branches_on_plan_and_approval(make_structured_client):
+    client, completions = make_structured_client()
+
+    result = asyncio.run(client.orchestrate_multiagent_workflow({"workflow_id": "w1"}))
+
+    # The plan assigned no generator, and the validator rejected the output
+    assert set(result["agent_results"]) == {"analyst", "validator"}
+    assert result["status"] == "rejected"
+    assert result["issues_found"] == ["missing sources"]
+    assert len(completions.calls) == 3
+
+    # Downstream steps receive compact typed fields instead of the raw text
+    analyst_context = completions.calls[1]["messages"][1]["content"]
+    assert "task_assignments" in analyst_context
+    assert '\\"task_assignments\\"' not in analyst_context
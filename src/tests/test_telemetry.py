@@ -0,0 +1,108 @@
+import sys
+import os
+import json
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from agents.shared.agent_models import AgentRole, TaskRequest
+from agents.shared.telemetry import AgentTelemetry, configure_telemetry
+
+@pytest.fixture
+def make_traced_client(make_client):
+    def make(fail=False):
+        exporter = InMemorySpanExporter()
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+        reader = InMemoryMetricReader()
+        telemetry = AgentTelemetry(tracer_provider=tracer_provider,
+                                   meter_provider=MeterProvider(metric_readers=[reader]))
+        client, _ = make_client(fake={"error": ValueError("bad request") if fail else None},
+                                telemetry=telemetry)
+        return client, exporter, reader
+    return make
+
+def metric_points(reader):
+    points = {}
+    for resource_metrics in reader.get_metrics_data().resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                points[metric.name.lower()] = list(metric.data.data_points)
+    return points
+
+def test_task_span_has_render_dependency_and_process_children(make_traced_client):
+    client, exporter, reader = make_traced_client()
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.ANALYST, input_data={"x": 1},
+                          workflow_id="w1")
+
+    asyncio.run(client.execute_agent_task(request))
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert set(spans) == {"agent-analyst", "prompt-render", "agent-analyst-completion", "response-process"}
+    task = spans["agent-analyst"]
+    assert task.attributes["workflow_id"] == "w1"
+    assert task.attributes["tokens_used"] == 15
+    for child in ("prompt-render", "agent-analyst-completion", "response-process"):
+        assert spans[child].parent.span_id == task.context.span_id
+    assert spans["agent-analyst-completion"].attributes["model_used"] == "gpt-4"
+
+    points = metric_points(reader)
+    assert points["responsetime"][0].attributes == {"AgentType": "analyst", "Status": "Success"}
+    assert points["tokensused"][0].sum == 15
+
+def test_failed_task_marks_span_as_error(make_traced_client):
+    client, exporter, _ = make_traced_client(fail=True)
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.VALIDATOR, input_data={"x": 1})
+
+    response = asyncio.run(client.execute_agent_task(request))
+
+    task = next(span for span in exporter.get_finished_spans() if span.name == "agent-validator")
+    assert response.status == "error"
+    assert not task.status.is_ok
+    assert task.attributes["status"] == "error"
+
+def test_workflow_span_parents_every_task_span(make_traced_client):
+    client, exporter, _ = make_traced_client()
+
+    result = asyncio.run(client.orchestrate_multiagent_workflow({"workflow_id": "w1"}))
+
+    spans = exporter.get_finished_spans()
+    workflow = next(span for span in spans if span.name == "workflow-orchestration")
+    tasks = [span for span in spans if span.name.startswith("agent-") and not span.name.endswith("-completion")]
+    assert result["status"] == "completed"
+    assert workflow.attributes["status"] == "completed"
+    assert sorted(span.name for span in tasks) == [
+        "agent-analyst", "agent-coordinator", "agent-generator", "agent-validator"
+    ]
+    assert all(span.parent.span_id == workflow.context.span_id for span in tasks)
+
+def test_file_exporter_writes_one_json_span_per_line(tmp_path):
+    path = str(tmp_path / "telemetry.jsonl")
+    telemetry = configure_telemetry(exporter="file", path=path)
+    request = TaskRequest(task_id="t1", agent_role=AgentRole.GENERATOR, input_data={})
+
+    output = telemetry.output
+    with telemetry.task_span(request):
+        with telemetry.span("prompt-render"):
+            pass
+    telemetry.shutdown()
+    telemetry.shutdown()
+
+    assert output.closed
+
+    with open(path) as telemetry_file:
+        names = [json.loads(line).get("name") for line in telemetry_file if line.strip()]
+    assert names[:2] == ["prompt-render", "agent-generator"]
+
+def test_unknown_exporter_is_rejected():
+    with pytest.raises(ValueError):
+        configure_telemetry(exporter="zipkin")
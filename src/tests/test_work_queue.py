@@ -0,0 +1,247 @@
+import sys
+import os
+import time
+import asyncio
+import sqlite3
+import multiprocessing
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.shared.agent_models import AgentRole, TaskResponse
+from agents.coordinator.work_queue import (
+    InMemoryWorkQueue, SQLiteWorkQueue, RedisWorkQueue, Worker, QueueFullError
+)
+from agents.coordinator.worker import create_handlers
+
+def redis_queue(**kwargs):
+    redis = pytest.importorskip("redis")
+    url = os.getenv("REDIS_URL", "redis://localhost:6379/15")
+    try:
+        redis.Redis.from_url(url).ping()
+    except redis.ConnectionError:
+        pytest.skip(f"No Redis server at {url}")
+    return RedisWorkQueue(url=url, prefix=f"test:{time.time()}:", **kwargs)
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def make_queue(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "memory":
+            return InMemoryWorkQueue(**kwargs)
+        if request.param == "sqlite":
+            return SQLiteWorkQueue(str(tmp_path / "queue.sqlite3"), **kwargs)
+        return redis_queue(**kwargs)
+    return make
+
+def test_lease_ack_completes_job_once(make_queue):
+    async def run():
+        queue = make_queue()
+        await queue.enqueue("workflow", {"n": 1}, job_id="a")
+        await queue.enqueue("workflow", {"n": 2}, job_id="b")
+
+        first = await queue.lease("w1")
+        second = await queue.lease("w2")
+        assert (first.job_id, second.job_id) == ("a", "b")
+        assert first.payload == {"n": 1} and first.attempts == 1
+        assert await queue.lease("w3") is None
+
+        assert await queue.ack(first, {"ok": True})
+        stored = await queue.get("a")
+        await queue.close()
+        return stored
+
+    stored = asyncio.run(run())
+    assert stored.status == "completed"
+    assert stored.result == {"ok": True}
+    assert stored.done
+
+def test_expired_lease_is_retried_then_dead_lettered(make_queue):
+    async def run():
+        queue = make_queue(max_attempts=2)
+        await queue.enqueue("task", {}, job_id="slow")
+
+        stale = await queue.lease("w1", visibility_timeout=0.05)
+        await asyncio.sleep(0.1)
+        retried = await queue.lease("w2", visibility_timeout=0.05)
+        # The first worker lost its lease and cannot settle the job
+        lost_ack = await queue.ack(stale, "late")
+        await asyncio.sleep(0.1)
+        exhausted = await queue.lease("w3")
+        dead = await queue.dead_letters()
+        await queue.close()
+        return retried, lost_ack, exhausted, dead
+
+    retried, lost_ack, exhausted, dead = asyncio.run(run())
+    assert retried.job_id == "slow" and retried.attempts == 2
+    assert lost_ack is False
+    assert exhausted is None
+    assert [item.job_id for item in dead] == ["slow"]
+    assert "Lease expired" in dead[0].error
+
+def test_nack_requeues_until_attempts_are_used_up(make_queue):
+    async def run():
+        queue = make_queue(max_attempts=2)
+        await queue.enqueue("task", {}, job_id="flaky")
+        await queue.nack(await queue.lease("w1"), "boom")
+        requeued = await queue.get("flaky")
+        await queue.nack(await queue.lease("w1"), "boom again")
+        dead = await queue.get("flaky")
+        await queue.close()
+        return requeued, dead
+
+    requeued, dead = asyncio.run(run())
+    assert requeued.status == "queued" and requeued.error == "boom"
+    assert dead.status == "dead_letter" and dead.error == "boom again"
+
+def test_enqueue_rejects_beyond_max_depth(make_queue):
+    async def run():
+        queue = make_queue(max_depth=1)
+        await queue.enqueue("task", {})
+        try:
+            with pytest.raises(QueueFullError):
+                await queue.enqueue("task", {})
+        finally:
+            await queue.close()
+
+    asyncio.run(run())
+
+def test_worker_extends_leases_of_long_jobs_and_retries_failures():
+    calls = []
+
+    async def slow(payload):
+        await asyncio.sleep(0.3)
+        return payload["n"]
+
+    async def flaky(payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise ValueError("transient")
+        return "recovered"
+
+    async def run():
+        queue = InMemoryWorkQueue()
+        await queue.enqueue("slow", {"n": 7}, job_id="slow")
+        await queue.enqueue("flaky", {}, job_id="flaky")
+        await queue.enqueue("unknown", {}, job_id="unknown")
+        worker = Worker(queue, {"slow": slow, "flaky": flaky},
+                        concurrency=2, visibility_timeout=0.15, poll_interval=0.01)
+        await worker.start()
+        # Past the visibility timeout, the slow job must still be held by its worker
+        await asyncio.sleep(0.2)
+        stolen = await queue.lease("other", visibility_timeout=0.15)
+        await asyncio.sleep(0.3)
+        await worker.stop()
+        return stolen, {job_id: await queue.get(job_id) for job_id in ("slow", "flaky", "unknown")}
+
+    stolen, items = asyncio.run(run())
+    assert stolen is None
+    assert items["slow"].status == "completed" and items["slow"].result == 7
+    assert items["flaky"].status == "completed" and items["flaky"].attempts == 2
+    assert items["unknown"].status == "dead_letter"
+
+def test_in_memory_queue_retains_only_recent_finished_jobs():
+    async def run():
+        queue = InMemoryWorkQueue(max_retained=2)
+        for index in range(5):
+            await queue.enqueue("task", {}, job_id=f"job_{index}")
+        for _ in range(5):
+            await queue.ack(await queue.lease("w1"), "done")
+        return [await queue.get(f"job_{index}") for index in range(5)], await queue.stats()
+
+    items, stats = asyncio.run(run())
+    assert [item is not None for item in items] == [False, False, False, True, True]
+    assert stats["jobs"] == {"queued": 0, "running": 0, "completed": 2}
+
+class FailingClient:
+    def __init__(self):
+        self.workflow_calls = 0
+
+    async def orchestrate_multiagent_workflow(self, payload):
+        self.workflow_calls += 1
+        return {"workflow_id": payload["workflow_id"], "status": "failed", "failed_steps": ["validator"]}
+
+    async def execute_agent_task(self, task_request):
+        return TaskResponse(task_id=task_request.task_id, agent_role=task_request.agent_role,
+                            status="error", result={}, metadata={}, execution_time=0.0,
+                            error="upstream 500")
+
+def test_failed_workflows_and_tasks_are_retried_then_dead_lettered():
+    client = FailingClient()
+
+    async def run():
+        queue = InMemoryWorkQueue(max_attempts=2)
+        await queue.enqueue("workflow", {"workflow_id": "w1"}, job_id="w1")
+        await queue.enqueue("task", {"task_id": "t1", "agent_role": AgentRole.ANALYST.value,
+                                     "input_data": {}}, job_id="t1")
+        worker = Worker(queue, create_handlers(client), poll_interval=0.01)
+        while await worker.run_once():
+            pass
+        return await queue.get("w1"), await queue.get("t1")
+
+    workflow, task = asyncio.run(run())
+    assert client.workflow_calls == 2
+    assert workflow.status == "dead_letter" and workflow.attempts == 2
+    assert workflow.error == "Workflow steps failed: validator"
+    assert task.status == "dead_letter" and task.error == "upstream 500"
+
+async def record_pid(payload):
+    await asyncio.sleep(0.01)
+    return os.getpid()
+
+def drain(path):
+    async def run():
+        queue = SQLiteWorkQueue(path)
+        worker = Worker(queue, {"job": record_pid}, concurrency=2, poll_interval=0.01)
+        while await worker.run_once() or await queue.depth():
+            pass
+        await queue.close()
+    asyncio.run(run())
+
+def test_sqlite_queue_is_shared_by_worker_processes(tmp_path):
+    path = str(tmp_path / "queue.sqlite3")
+
+    async def enqueue():
+        queue = SQLiteWorkQueue(path)
+        for index in range(30):
+            await queue.enqueue("job", {"n": index}, job_id=f"job_{index}")
+        await queue.close()
+
+    asyncio.run(enqueue())
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=drain, args=(path,)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+
+    async def collect():
+        queue = SQLiteWorkQueue(path)
+        items = [await queue.get(f"job_{index}") for index in range(30)]
+        await queue.close()
+        return items
+
+    items = asyncio.run(collect())
+    assert all(item.status == "completed" and item.attempts == 1 for item in items)
+    assert {item.result for item in items} <= {process.pid for process in processes}
+
+def test_sqlite_lease_waits_for_a_locked_database_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "queue.sqlite3")
+
+    async def run():
+        queue = SQLiteWorkQueue(path)
+        await queue.enqueue("job", {"n": 1}, job_id="a")
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        lease = asyncio.create_task(queue.lease("w1"))
+        ticks = 0
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert not lease.done()
+        other.execute("COMMIT")
+        other.close()
+        item = await lease
+        await queue.close()
+        return ticks, item
+
+    ticks, item = asyncio.run(run())
+    assert ticks == 5 and item.job_id == "a"
@@ -0,0 +1,69 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from agents.shared.agent_models import AgentRole, TaskResponse
+from agents.shared.workflow_engine import WorkflowEngine, WorkflowNode
+
+def make_executor(delay=0.1, log=None):
+    async def executor(task_request):
+        if log is not None:
+            log.append(("start", task_request.task_id))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", task_request.task_id))
+        return TaskResponse(
+            task_id=task_request.task_id,
+            agent_role=task_request.agent_role,
+            status="success",
+            result={"task_id": task_request.task_id, "input": task_request.input_data},
+            metadata={},
+            execution_time=delay
+        )
+    return executor
+
+def test_independent_nodes_run_concurrently():
+    nodes = [
+        WorkflowNode(node_id=f"analyst_{i}", agent_role=AgentRole.ANALYST)
+        for i in range(3)
+    ]
+    engine = WorkflowEngine(make_executor(delay=0.1))
+
+    async def run():
+        start = asyncio.get_event_loop().time()
+        results = await engine.run(nodes, workflow_id="wf")
+        return results, asyncio.get_event_loop().time() - start
+
+    results, elapsed = asyncio.run(run())
+    assert set(results) == {"analyst_0", "analyst_1", "analyst_2"}
+    assert elapsed < 0.25
+
+def test_fan_out_feeds_downstream_node():
+    log = []
+    nodes = [
+        WorkflowNode(node_id="analyst_0", agent_role=AgentRole.ANALYST),
+        WorkflowNode(node_id="analyst_1", agent_role=AgentRole.ANALYST),
+        WorkflowNode(node_id="generator", agent_role=AgentRole.GENERATOR,
+                     inputs={"analysis_results": ["analyst_0", "analyst_1"]}),
+    ]
+    results = asyncio.run(WorkflowEngine(make_executor(0.01, log)).run(nodes, workflow_id="wf"))
+
+    generator_input = results["generator"].result["input"]
+    assert [r["task_id"] for r in generator_input["analysis_results"]] == ["wf_analyst_0", "wf_analyst_1"]
+    assert log.index(("start", "wf_generator")) > log.index(("end", "wf_analyst_0"))
+    assert log.index(("start", "wf_generator")) > log.index(("end", "wf_analyst_1"))
+
+def test_cycle_and_unknown_dependency_are_rejected():
+    cycle = [
+        WorkflowNode(node_id="a", agent_role=AgentRole.ANALYST, depends_on=["b"]),
+        WorkflowNode(node_id="b", agent_role=AgentRole.GENERATOR, depends_on=["a"]),
+    ]
+    with pytest.raises(ValueError):
+        WorkflowEngine.topological_order(cycle)
+
+    unknown = [WorkflowNode(node_id="a", agent_role=AgentRole.ANALYST, depends_on=["missing"])]
+    with pytest.raises(ValueError):
+        WorkflowEngine.topological_order(unknown)